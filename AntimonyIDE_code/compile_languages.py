@@ -0,0 +1,13 @@
+"""Compile the language JSON files into binary catalogs for faster startup.
+
+Usage: python compile_languages.py [language_dir]
+Run it before packaging; LanguageManager uses a catalog unless its JSON was
+edited since (the catalog records the size and hash of the JSON it came from).
+"""
+import sys
+
+from core.translation_catalog import compile_language_dir
+
+if __name__ == "__main__":
+    for catalog_file in compile_language_dir(sys.argv[1] if len(sys.argv) > 1 else "language"):
+        print(f"Compiled {catalog_file}")
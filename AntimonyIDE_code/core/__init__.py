@@ -4,6 +4,11 @@ Core module for Antimony IDE containing base classes and parsers.
 
 from .code_block import CodeBlock
 from .parser import PythonFileParser
+from .importer import BlockGraphBuilder
+from .gui_extractor import GuiExtractor
+from .template import CompiledTemplate
 from .language_manager import LanguageManager
+from .translation_catalog import TranslationCatalog
 
-__all__ = ['CodeBlock', 'PythonFileParser', 'LanguageManager']
\ No newline at end of file
+__all__ = ['CodeBlock', 'PythonFileParser', 'BlockGraphBuilder', 'GuiExtractor', 'CompiledTemplate',
+           'LanguageManager', 'TranslationCatalog']
\ No newline at end of file
@@ -1,3 +1,6 @@
+from .template import compile_template
+
+
 class CodeBlock:
     def __init__(self, block_id, block_type, x, y, width=120, height=60, text="", content=""):
         self.id = block_id
@@ -15,6 +18,8 @@ class CodeBlock:
         self.prev_connections = []  # List of block IDs that connect to this block
         self.next_block = None  # Direct next block in sequence
         self.canvas_ids = (None, None)  # Store canvas IDs for rectangle and text
+        self.template = None  # CompiledTemplate of content; None for literal code such as imported files
+        self.values = {}  # Placeholder name -> value filled in by the user
         
     def get_default_color(self):
         """Return default color based on block type"""
@@ -59,6 +64,31 @@ class CodeBlock:
         # Function calls (type "function") do NOT need indentation
         return self.type in ["control", "loop", "defining", "class", "method"]
     
+    def use_template(self, template=None):
+        """Treat content as a template with placeholders (compiled from content if not given)"""
+        self.template = template or compile_template(self.content)
+    
+    def set_content(self, content):
+        """Replace the content, recompiling the template if the block has one"""
+        if content != self.content:
+            self.content = content
+            if self.template is not None:
+                self.use_template()
+                names = {name for name, _ in self.template.fields}
+                self.values = {name: value for name, value in self.values.items() if name in names}
+    
+    def missing_values(self):
+        """Return the placeholder names that still need a value"""
+        if self.template is None:
+            return []
+        return self.template.missing(self.values)
+    
+    def get_code(self):
+        """Return the block's code with placeholder values substituted"""
+        if self.template is None:
+            return self.content
+        return self.template.render(self.values)
+    
     def move(self, dx, dy):
         """Move the block by dx, dy"""
         self.x += dx
@@ -76,10 +106,12 @@ class CodeBlock:
             "text": self.text,
             "content": self.content,
             "color": self.color,
-            "connections": self.connections,
+            "connections": list(self.connections),
             "end_connection": self.end_connection,
             "continue_connection": self.continue_connection,
-            "prev_connections": self.prev_connections
+            "prev_connections": list(self.prev_connections),
+            "templated": self.template is not None,
+            "values": dict(self.values)
         }
     
     @classmethod
@@ -100,4 +132,8 @@ class CodeBlock:
         block.end_connection = data.get("end_connection")
         block.continue_connection = data.get("continue_connection")
         block.prev_connections = data.get("prev_connections", [])
+        # Projects saved before templates existed hold literal code
+        if data.get("templated"):
+            block.use_template()
+            block.values = data.get("values", {})
         return block
\ No newline at end of file
@@ -0,0 +1,185 @@
+import ast
+from collections import namedtuple
+
+LAYOUT_METHODS = ("grid", "pack", "place")
+
+# Capitalized tkinter names that are not widgets (Tk and Tcl create the root, not a widget)
+NON_WIDGET_CLASSES = {"StringVar", "IntVar", "DoubleVar", "BooleanVar", "Variable",
+                      "PhotoImage", "BitmapImage", "Event", "Style", "Font", "Tk", "Tcl"}
+
+LITERAL = "literal"
+SOURCE = "source"
+
+
+class ArgumentValue(namedtuple("ArgumentValue", ("kind", "value"))):
+    """An extracted argument: a literal's Python value, or the source text of any other expression.
+
+    The kind keeps ``'tk.LEFT'`` (a string literal) apart from ``tk.LEFT``
+    (an expression), which share the same text.
+    """
+
+    __slots__ = ()
+
+    @property
+    def source(self):
+        """Python source that recreates the argument"""
+        return repr(self.value) if self.kind == LITERAL else self.value
+
+
+def literal_or_source(node):
+    """Return an ArgumentValue holding a literal's value, or the expression's source text"""
+    try:
+        return ArgumentValue(LITERAL, ast.literal_eval(node))
+    except (ValueError, TypeError, SyntaxError, MemoryError, RecursionError):
+        return ArgumentValue(SOURCE, ast.unparse(node))
+
+
+def literal_value(argument, default=None):
+    """Return the value of a literal ArgumentValue, default if it is missing, None if it is source"""
+    if argument is None:
+        return default
+    return argument.value if argument.kind == LITERAL else None
+
+
+class GuiExtractor(ast.NodeVisitor):
+    """Collect Tkinter widget constructions and geometry-manager calls in one pass.
+
+    Widgets are recorded for ``target = tk.Widget(...)`` assignments (and for
+    widgets laid out inline, as in ``tk.Label(root).pack()``), layouts for
+    every ``.grid``/``.pack``/``.place`` call. Arguments are kept as
+    ArgumentValues: literal values where possible and source text otherwise.
+    ``Tk()`` roots are not widgets; the first one is recorded in ``setup``
+    together with the tkinter imports, so the program can be rebuilt.
+    """
+
+    def __init__(self):
+        self.widgets = []
+        self.layouts = []
+        self.setup = {'imports': [], 'root': None}  # tkinter import sources, root window assignment
+        self.modules = {"tk", "ttk", "tkinter"}  # Names that refer to tkinter modules
+        self.classes = {}  # Widget classes imported by name -> class name
+        self.root_classes = set()  # Names Tk was imported as
+        self._targets = {}  # Target expression -> index into widgets
+
+    def extract(self, tree):
+        self.visit(tree)
+        return self.widgets, self.layouts, self.setup
+
+    # ===== Helpers =====
+
+    def _widget_class(self, call):
+        """Return (module, class) if call constructs a Tkinter widget"""
+        func = call.func
+        if isinstance(func, ast.Attribute) and isinstance(func.value, ast.Name):
+            if (func.value.id in self.modules and func.attr[:1].isupper()
+                    and func.attr not in NON_WIDGET_CLASSES):
+                return func.value.id, func.attr
+        elif isinstance(func, ast.Name) and func.id in self.classes:
+            return None, self.classes[func.id]
+        return None
+
+    def _add_widget(self, call, widget_class, target, source):
+        module, widget_type = widget_class
+        if isinstance(target, ast.Attribute):
+            var_name = target.attr
+        elif isinstance(target, ast.Name):
+            var_name = target.id
+        else:
+            var_name = None
+        self.widgets.append({
+            'var_name': var_name,
+            'target': ast.unparse(target) if target is not None else None,
+            'widget_type': widget_type,
+            'module': module,
+            'parent': ast.unparse(call.args[0]) if call.args else None,
+            'args': [literal_or_source(arg) for arg in call.args[1:]],
+            'kwargs': {kw.arg: literal_or_source(kw.value) for kw in call.keywords if kw.arg},
+            'source': source,
+            'lineno': call.lineno,
+            'type': 'gui_widget',
+        })
+        index = len(self.widgets) - 1
+        if target is not None:
+            self._targets[self.widgets[index]['target']] = index
+        return index
+
+    def _is_root(self, call):
+        """True if call creates the Tk root window"""
+        func = call.func
+        if isinstance(func, ast.Attribute) and isinstance(func.value, ast.Name):
+            return func.value.id in self.modules and func.attr == "Tk"
+        return isinstance(func, ast.Name) and func.id in self.root_classes
+
+    # ===== Visitors =====
+
+    def visit_Import(self, node):
+        for alias in node.names:
+            if alias.name in ("tkinter", "tkinter.ttk"):
+                self.modules.add(alias.asname or alias.name.split(".")[-1])
+                self.setup['imports'].append(ast.unparse(node))
+
+    def visit_ImportFrom(self, node):
+        if node.module in ("tkinter", "tkinter.ttk"):
+            self.setup['imports'].append(ast.unparse(node))
+        if node.module == "tkinter":
+            for alias in node.names:
+                if alias.name == "Tk":
+                    self.root_classes.add(alias.asname or "Tk")
+                elif alias.name == "ttk":
+                    self.modules.add(alias.asname or "ttk")
+                elif alias.name[:1].isupper() and alias.name not in NON_WIDGET_CLASSES:
+                    self.classes[alias.asname or alias.name] = alias.name
+        elif node.module == "tkinter.ttk":
+            for alias in node.names:
+                if alias.name[:1].isupper() and alias.name not in NON_WIDGET_CLASSES:
+                    self.classes[alias.asname or alias.name] = alias.name
+
+    def visit_Assign(self, node):
+        value = node.value
+        if isinstance(value, ast.Call) and len(node.targets) == 1:
+            if self._is_root(value):
+                if self.setup['root'] is None:
+                    self.setup['root'] = {'target': ast.unparse(node.targets[0]), 'source': ast.unparse(node)}
+                return
+            widget_class = self._widget_class(value)
+            if widget_class:
+                self._add_widget(value, widget_class, node.targets[0], ast.unparse(node))
+                # Arguments may still contain nested calls worth visiting
+                for child in value.args + [kw.value for kw in value.keywords]:
+                    self.visit(child)
+                return
+        self.generic_visit(node)
+
+    def visit_Call(self, node):
+        func = node.func
+        if isinstance(func, ast.Attribute) and func.attr in LAYOUT_METHODS:
+            owner = func.value
+            widget_class = self._widget_class(owner) if isinstance(owner, ast.Call) else None
+            if widget_class:
+                # Inline widget, e.g. tk.Label(root, text="Hi").pack()
+                index = self._add_widget(owner, widget_class, None, ast.unparse(node))
+                var_name = None
+                for child in owner.args + [kw.value for kw in owner.keywords]:
+                    self.visit(child)
+            else:
+                target = ast.unparse(owner)
+                index = self._targets.get(target)
+                var_name = owner.attr if isinstance(owner, ast.Attribute) else target
+                self.visit(owner)
+            self.layouts.append({
+                'var_name': var_name,
+                'widget': index,
+                'method': func.attr,
+                'params': {kw.arg: literal_or_source(kw.value) for kw in node.keywords if kw.arg},
+                'source': ast.unparse(node),
+                'lineno': node.lineno,
+            })
+            for arg in node.args + [kw.value for kw in node.keywords]:
+                self.visit(arg)
+            return
+        self.generic_visit(node)
+
+
+def extract_gui(tree):
+    """Return (widgets, layouts, setup) for a parsed module"""
+    return GuiExtractor().extract(tree)
@@ -0,0 +1,325 @@
+import ast
+import copy
+
+from .code_block import CodeBlock
+from .gui_extractor import literal_value
+
+
+class BlockGraphBuilder(ast.NodeVisitor):
+    """Turn a Python module into a block graph in a single AST pass.
+
+    Every statement becomes one CodeBlock. Statements in the same body are
+    linked with sequence connections, compound statements (if/for/while/
+    def/class/with/try) get an end connection to the block that follows
+    their body, and one-line bodies such as ``if x: return y`` are attached
+    with a continue connection so they are exported on the same line.
+    """
+
+    # Labels used when a statement is too long to show on the block itself
+    SIMPLE_LABELS = {
+        ast.Assign: "Assign",
+        ast.AugAssign: "Assign",
+        ast.AnnAssign: "Assign",
+        ast.Return: "Return",
+        ast.Pass: "Pass",
+        ast.Break: "Break",
+        ast.Continue: "Continue",
+        ast.Raise: "Raise",
+        ast.Assert: "Assert",
+        ast.Delete: "Delete",
+        ast.Global: "Global",
+        ast.Nonlocal: "Nonlocal",
+    }
+
+    def __init__(self, x=100, y=100, spacing=80):
+        self.x = x
+        self.y = y
+        self.spacing = spacing
+        self.blocks = []
+        self.sequence_lines = []
+        self.end_lines = []
+        self.continue_lines = []
+        self.imports = []
+        self.class_info = None
+        self._first_class = None
+        self._scopes = []  # Enclosing def/class nodes, innermost last
+
+    # ===== Public API =====
+
+    def build(self, tree):
+        """Build the graph for a parsed module and return it as a dict"""
+        self.visit(tree)
+        return {
+            "blocks": [block.to_dict() for block in self.blocks],
+            "sequence_lines": self.sequence_lines,
+            "end_lines": self.end_lines,
+            "continue_lines": self.continue_lines,
+        }
+
+    # ===== Graph helpers =====
+
+    def _new_block(self, block_type, label, content):
+        """Create a block in source order and return its ID"""
+        block_id = f"block_{len(self.blocks)}"
+        # Show short single-line statements directly, like the block editor does
+        if "\n" not in content and len(content) < 30 and content:
+            text = content
+        else:
+            text = label
+        block = CodeBlock(block_id, block_type,
+                          self.x, self.y + len(self.blocks) * self.spacing,
+                          text=text, content=content)
+        self.blocks.append(block)
+        return block_id
+
+    def _block(self, block_id):
+        return self.blocks[int(block_id[6:])]
+
+    def _connect(self, kind, start_id, end_id):
+        """Record a connection on both the blocks and the line lists"""
+        start = self._block(start_id)
+        if kind == "sequence":
+            start.connections.append(end_id)
+            self.sequence_lines.append((start_id, end_id))
+        elif kind == "end":
+            start.end_connection = end_id
+            self.end_lines.append((start_id, end_id))
+        else:
+            start.continue_connection = end_id
+            self.continue_lines.append((start_id, end_id))
+        self._block(end_id).prev_connections.append(start_id)
+
+    def _resolve(self, pending, target_id):
+        """Point every dangling exit at the block that follows it"""
+        for start_id, kind in pending:
+            self._connect(kind, start_id, target_id)
+
+    def _visit_body(self, stmts):
+        """Chain a list of statements and return (first_id, dangling exits)"""
+        first_id = None
+        pending = []
+        for stmt in stmts:
+            entry_id, exits = self.visit(stmt)
+            if first_id is None:
+                first_id = entry_id
+            self._resolve(pending, entry_id)
+            pending = exits
+        return first_id, pending
+
+    def _header(self, node, **cleared):
+        """Unparse a compound statement without its nested bodies"""
+        stripped = copy.copy(node)
+        stripped.body = []
+        for field, value in cleared.items():
+            setattr(stripped, field, value)
+        return ast.unparse(stripped)
+
+    def _compound(self, node, block_type, label, header, clauses=()):
+        """Emit a compound statement whose clauses are (block_type, label, header, body)"""
+        head_id = self._new_block(block_type, label, header)
+        body = node.body
+
+        # "if x: return y" keeps its single statement on the header line
+        if not clauses and len(body) == 1 and body[0].lineno == node.lineno:
+            entry_id, _ = self.visit(body[0])
+            self._connect("continue", head_id, entry_id)
+            return head_id, [(head_id, "sequence")]
+
+        first_id, exits = self._visit_body(body)
+        self._connect("sequence", head_id, first_id)
+        owner_id = head_id
+        for clause_type, clause_label, clause_header, clause_body in clauses:
+            clause_id = self._new_block(clause_type, clause_label, clause_header)
+            self._resolve(exits + [(owner_id, "end")], clause_id)
+            first_id, exits = self._visit_body(clause_body)
+            self._connect("sequence", clause_id, first_id)
+            owner_id = clause_id
+        return head_id, exits + [(owner_id, "end")]
+
+    def _simple(self, node, block_type="statement", label="Statement"):
+        block_id = self._new_block(block_type, label, ast.unparse(node))
+        return block_id, [(block_id, "sequence")]
+
+    # ===== Visitors =====
+
+    def visit_Module(self, node):
+        first_id, pending = self._visit_body(node.body)
+        # Structures that close at the end of the file need a block to end on
+        if any(kind == "end" for _, kind in pending):
+            end_id = self._new_block("statement", "End", "")
+            self._resolve(pending, end_id)
+        return first_id, []
+
+    def generic_visit(self, node):
+        # Anything without a dedicated visitor (match, ...) is kept verbatim
+        return self._simple(node, label=self.SIMPLE_LABELS.get(type(node), "Statement"))
+
+    def visit_Expr(self, node):
+        if isinstance(node.value, ast.Call):
+            return self._simple(node, "function", "Call Function")
+        return self._simple(node)
+
+    def visit_Import(self, node):
+        for alias in node.names:
+            self.imports.append(f"import {alias.name}")
+        return self._simple(node, "import", "Import")
+
+    def visit_ImportFrom(self, node):
+        module = node.module or ""
+        for alias in node.names:
+            self.imports.append(f"from {module} import {alias.name}")
+        return self._simple(node, "import", "From Import")
+
+    def visit_If(self, node):
+        clauses = []
+        orelse = node.orelse
+        # Flatten else-if chains into elif clauses
+        while len(orelse) == 1 and isinstance(orelse[0], ast.If):
+            branch = orelse[0]
+            clauses.append(("control", "Elif", f"elif {ast.unparse(branch.test)}:", branch.body))
+            orelse = branch.orelse
+        if orelse:
+            clauses.append(("control", "Else", "else:", orelse))
+        return self._compound(node, "control", "If", f"if {ast.unparse(node.test)}:", clauses)
+
+    def _visit_loop(self, node, label):
+        clauses = [("control", "Else", "else:", node.orelse)] if node.orelse else []
+        return self._compound(node, "loop", label, self._header(node, orelse=[]), clauses)
+
+    def visit_For(self, node):
+        return self._visit_loop(node, "For Loop")
+
+    visit_AsyncFor = visit_For
+
+    def visit_While(self, node):
+        return self._visit_loop(node, "While Loop")
+
+    def visit_With(self, node):
+        return self._compound(node, "control", "With", self._header(node))
+
+    visit_AsyncWith = visit_With
+
+    def visit_Try(self, node):
+        keyword = "except*" if type(node).__name__ == "TryStar" else "except"
+        clauses = []
+        for handler in node.handlers:
+            header = keyword
+            if handler.type is not None:
+                header += f" {ast.unparse(handler.type)}"
+            if handler.name:
+                header += f" as {handler.name}"
+            clauses.append(("control", "Except", header + ":", handler.body))
+        if node.orelse:
+            clauses.append(("control", "Else", "else:", node.orelse))
+        if node.finalbody:
+            clauses.append(("control", "Finally", "finally:", node.finalbody))
+        return self._compound(node, "control", "Try", "try:", clauses)
+
+    visit_TryStar = visit_Try
+
+    def visit_FunctionDef(self, node):
+        parent = self._scopes[-1] if self._scopes else None
+        if isinstance(parent, ast.ClassDef):
+            block_type, label = "method", "Define Method"
+            if parent is self._first_class:
+                self.class_info["methods"].append(node.name)
+        else:
+            block_type, label = "defining", "Define Function"
+        self._scopes.append(node)
+        try:
+            return self._compound(node, block_type, label, self._header(node))
+        finally:
+            self._scopes.pop()
+
+    visit_AsyncFunctionDef = visit_FunctionDef
+
+    def visit_ClassDef(self, node):
+        if self._first_class is None:
+            self._first_class = node
+            self.class_info = {"name": node.name, "methods": []}
+        self._scopes.append(node)
+        try:
+            return self._compound(node, "class", "Define Class", self._header(node))
+        finally:
+            self._scopes.pop()
+
+
+def build_block_graph(tree):
+    """Convert a parsed module into a block graph plus the imports and first class found"""
+    builder = BlockGraphBuilder()
+    graph = builder.build(tree)
+    return graph, builder.imports, builder.class_info
+
+
+def build_gui_graph(widgets, layouts, setup=None, x=100, y=100, cell_width=140, cell_height=80):
+    """Build a graph of gui blocks from extracted widgets and their layout calls.
+
+    The graph is a runnable program: the file's tkinter imports and root
+    window (from setup, see GuiExtractor; ``import tkinter as tk`` and
+    ``root = tk.Tk()`` if it had none) come first, then one block per
+    widget holding its construction and layout code in source order, then
+    the root's mainloop. Widgets placed with ``grid`` are positioned at
+    their row and column; the rest are stacked in a column to the right.
+    """
+    setup = setup or {'imports': [], 'root': None}
+    imports = setup['imports'] or ["import tkinter as tk"]
+    root = setup['root'] or {'target': "root", 'source': "root = tk.Tk()"}
+    layout_of = {}
+    for layout in layouts:
+        if layout['widget'] is not None:
+            layout_of.setdefault(layout['widget'], []).append(layout)
+
+    cells = {}
+    for index in range(len(widgets)):
+        for layout in layout_of.get(index, []):
+            params = layout['params']
+            row, column = literal_value(params.get('row'), 0), literal_value(params.get('column'), 0)
+            if layout['method'] == 'grid' and isinstance(row, int) and isinstance(column, int):
+                cells[index] = (row, column)
+    max_column = max((column for _, column in cells.values()), default=-1)
+
+    blocks = []
+    sequence_lines = []
+
+    def add_block(block_type, label, content, bx, by):
+        block = CodeBlock(f"block_{len(blocks)}", block_type, bx, by, text=label, content=content)
+        if blocks:
+            previous = blocks[-1]
+            previous.connections.append(block.id)
+            block.prev_connections.append(previous.id)
+            sequence_lines.append((previous.id, block.id))
+        blocks.append(block)
+
+    # Imports and the root window sit in a row above the widget grid
+    add_block("import", "Import", "\n".join(imports), x, y)
+    add_block("gui", "Tkinter Window", root['source'], x + cell_width, y)
+    y += cell_height
+
+    taken = set()
+    stacked = 0
+    for index, widget in enumerate(widgets):
+        lines = [widget['source']]
+        if widget['target'] is not None:
+            # Inline widgets already carry their layout call in the source
+            lines.extend(layout['source'] for layout in layout_of.get(index, []))
+        label = widget['widget_type'] if widget['var_name'] is None else f"{widget['widget_type']}: {widget['var_name']}"
+
+        cell = cells.get(index)
+        if cell is not None and cell not in taken:
+            taken.add(cell)
+            bx, by = x + cell[1] * cell_width, y + cell[0] * cell_height
+        else:
+            bx, by = x + (max_column + 1) * cell_width, y + stacked * cell_height
+            stacked += 1
+
+        add_block("gui", label, "\n".join(lines), bx, by)
+
+    bottom = max([cell[0] + 1 for cell in taken] + [stacked])
+    add_block("function", "Main Loop", f"{root['target']}.mainloop()", x, y + bottom * cell_height)
+
+    return {
+        "blocks": [block.to_dict() for block in blocks],
+        "sequence_lines": sequence_lines,
+        "end_lines": [],
+        "continue_lines": [],
+    }
@@ -1,11 +1,20 @@
 import json
 import os
 import sys
+from collections import OrderedDict
+
+from .translation_catalog import CATALOG_SUFFIX, TranslationCatalog
+
+# Number of parsed language catalogs kept in memory
+LANGUAGE_CACHE_SIZE = 4
 
 class LanguageManager:
     def __init__(self, default_lang='en'):
-        self.languages = {}
+        self.languages = OrderedDict()  # Parsed catalogs, least recently used first
+        self.language_files = {}  # Language code -> JSON file, not parsed until used
+        self.catalog_files = {}  # Language code -> compiled catalog, see translation_catalog
         self.current_lang = default_lang
+        self.translations = {}  # Catalog of the current language
         
         # 获取应用运行路径（处理打包后路径）
         if getattr(sys, 'frozen', False):
@@ -16,42 +25,86 @@ class LanguageManager:
             self.base_path = os.path.dirname(os.path.abspath(__file__))
             
         self.load_languages()
+        self.translations = self.load_language(default_lang) or {}
     
     def load_languages(self):
-        """加载所有语言文件"""
+        """查找语言文件；只有当前语言会在启动时解析"""
         # 首先尝试从当前目录查找
         lang_dirs = [
             os.path.join(self.base_path, "language"),  # 打包后的路径
-            os.path.join(os.getcwd(), "language"),     # 当前工作目录
-            "language",                                # 相对路径
+            os.path.join(os.getcwd(), "language"),     # 当前工作目录（相对路径同此）
         ]
         
-        lang_dir = None
+        # One listing per candidate; a missing directory raises instead of being probed first
+        files = None
         for dir_path in lang_dirs:
-            if os.path.exists(dir_path) and os.path.isdir(dir_path):
-                lang_dir = dir_path
-                break
+            try:
+                files = os.listdir(dir_path)
+            except OSError:
+                continue
+            lang_dir = dir_path
+            break
         
-        if not lang_dir:
-            # 创建语言目录
-            lang_dir = "language"
-            if not os.path.exists(lang_dir):
-                os.makedirs(lang_dir)
-            # 创建示例语言文件
-            self.create_example_languages()
-            lang_dir = "language"
+        if files is None:
+            # No language folder: use the built-in catalogs without writing files
+            return
         
-        for file in os.listdir(lang_dir):
-            if file.endswith('.json'):
-                lang_code = file.replace('.json', '')
+        for file in sorted(files):
+            lang_code, extension = os.path.splitext(file)
+            if extension == '.json':
+                self.language_files[lang_code] = os.path.join(lang_dir, file)
+            elif extension == CATALOG_SUFFIX:
+                self.catalog_files[lang_code] = os.path.join(lang_dir, file)
+    
+    def load_language(self, lang_code):
+        """Return the catalog for a language, parsing it on first use"""
+        if lang_code in self.languages:
+            self.languages.move_to_end(lang_code)
+            return self.languages[lang_code]
+        
+        if self.language_files or self.catalog_files:
+            catalog = self.open_catalog(lang_code)
+            if catalog is None:
+                if lang_code not in self.language_files:
+                    return None
                 try:
-                    with open(os.path.join(lang_dir, file), 'r', encoding='utf-8') as f:
-                        self.languages[lang_code] = json.load(f)
+                    with open(self.language_files[lang_code], 'r', encoding='utf-8') as f:
+                        catalog = json.load(f)
                 except Exception as e:
                     print(f"Error loading language {lang_code}: {e}")
+                    return None
+        else:
+            catalog = self.example_languages().get(lang_code)
+            if catalog is None:
+                return None
+        
+        self.languages[lang_code] = catalog
+        while len(self.languages) > LANGUAGE_CACHE_SIZE:
+            oldest = next(iter(self.languages))
+            if oldest == self.current_lang:
+                self.languages.move_to_end(oldest)
+                continue
+            del self.languages[oldest]
+        return catalog
     
-    def create_example_languages(self):
-        """Create example English and Chinese language files"""
+    def open_catalog(self, lang_code):
+        """Open the compiled catalog of a language if it was compiled from its current JSON"""
+        catalog_file = self.catalog_files.get(lang_code)
+        if catalog_file is None:
+            return None
+        try:
+            catalog = TranslationCatalog(catalog_file)
+            json_file = self.language_files.get(lang_code)
+            if json_file is not None and not catalog.matches_source(json_file):
+                catalog.close()
+                return None  # Stale: the JSON was edited after compiling
+            return catalog
+        except Exception as e:
+            print(f"Ignoring compiled catalog for {lang_code}: {e}")
+            return None
+    
+    def example_languages(self):
+        """Return the built-in English and Chinese catalogs"""
         en_translations = {
             "app_title": "Antimony IDE",
             "project": "Project",
@@ -65,11 +118,13 @@ class LanguageManager:
             "code_blocks": "Code Blocks",
             "category": "Category:",
             "import_package": "Import Package",
+            "generate_package": "Generate Package",
             "drag_to_canvas": "Double-click or drag to canvas",
             "workspace": "Workspace",
             "block_editor": "Block Editor",
             "select_block": "Select a block to edit",
             "content": "Content:",
+            "placeholders": "Placeholders",
             "update": "Update",
             "color": "Color:",
             "choose": "Choose",
@@ -104,7 +159,12 @@ class LanguageManager:
             "blocks_operators": "Operators",
             "blocks_imports": "Imports",
             "blocks_gui": "GUI Components",
-            "untitled_project": "Untitled Project"
+            "untitled_project": "Untitled Project",
+            "load_python_folder": "Load Python Folder",
+            "load_python_gui": "Load Python GUI",
+            "auto_arrange": "Auto-arrange",
+            "quick_add": "Quick Add Block",
+            "quick_add_no_match": "No matching blocks"
         }
         
         zh_translations = {
@@ -120,11 +180,13 @@ class LanguageManager:
             "code_blocks": "代码块",
             "category": "类别：",
             "import_package": "导入包",
+            "generate_package": "生成包",
             "drag_to_canvas": "双击或拖动到画布",
             "workspace": "工作区",
             "block_editor": "块编辑器",
             "select_block": "选择一个块进行编辑",
             "content": "内容：",
+            "placeholders": "占位符",
             "update": "更新",
             "color": "颜色：",
             "choose": "选择",
@@ -159,29 +221,37 @@ class LanguageManager:
             "blocks_operators": "运算符",
             "blocks_imports": "导入",
             "blocks_gui": "GUI组件",
-            "untitled_project": "未命名项目"
+            "untitled_project": "未命名项目",
+            "load_python_folder": "加载Python文件夹",
+            "load_python_gui": "加载Python界面",
+            "auto_arrange": "自动排列",
+            "quick_add": "快速添加代码块",
+            "quick_add_no_match": "没有匹配的代码块"
         }
         
-        # Save language files
+        return {"en": en_translations, "zh": zh_translations}
+    
+    def create_example_languages(self):
+        """Create example English and Chinese language files"""
         lang_dir = "language"
-        with open(os.path.join(lang_dir, 'en.json'), 'w', encoding='utf-8') as f:
-            json.dump(en_translations, f, ensure_ascii=False, indent=2)
-        with open(os.path.join(lang_dir, 'zh.json'), 'w', encoding='utf-8') as f:
-            json.dump(zh_translations, f, ensure_ascii=False, indent=2)
+        os.makedirs(lang_dir, exist_ok=True)
+        for lang_code, translations in self.example_languages().items():
+            with open(os.path.join(lang_dir, f'{lang_code}.json'), 'w', encoding='utf-8') as f:
+                json.dump(translations, f, ensure_ascii=False, indent=2)
     
     def set_language(self, lang_code):
-        """Change current language"""
-        if lang_code in self.languages:
-            self.current_lang = lang_code
-            return True
-        return False
+        """Change current language, loading its catalog if needed"""
+        catalog = self.load_language(lang_code)
+        if catalog is None:
+            return False
+        self.current_lang = lang_code
+        self.translations = catalog
+        return True
     
     def get(self, key, default=None):
         """Get translation for key"""
-        if self.current_lang in self.languages:
-            return self.languages[self.current_lang].get(key, default or key)
-        return default or key
+        return self.translations.get(key, default or key)
     
     def get_all_languages(self):
         """Return list of available language codes"""
-        return list(self.languages.keys())
+        return sorted(set(self.language_files) | set(self.catalog_files)) or list(self.example_languages())
@@ -0,0 +1,250 @@
+"""
+Layered auto-layout for block graphs.
+
+Blocks are ranked top to bottom along their sequence and end connections,
+indented one column per level of nesting (the same nesting the exporter
+uses), and blocks sharing a row are ordered with barycenter sweeps to cut
+down edge crossings. Continue connections keep blocks on the same row,
+left to right. NumPy is used for the sweeps when it is installed.
+"""
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional
+    np = None
+
+GRID = 20
+INDENT = 40         # Horizontal offset per nesting level
+ROW_HEIGHT = 80     # Vertical distance between layers
+BLOCK_GAP = 20      # Gap between blocks on the same row
+GROUP_GAP = 80      # Gap between unconnected groups of blocks
+SWEEPS = 4          # Down/up barycenter passes
+
+
+def _snap(value):
+    return int(value) // GRID * GRID
+
+
+def compute_layout(blocks, sequence_lines, end_lines, continue_lines,
+                   origin_x=100, origin_y=100):
+    """Compute positions for a block graph.
+
+    ``blocks`` maps block ID to a CodeBlock (its ``width``, ``height`` and
+    ``requires_indentation()`` are used).
+    Returns ``(positions, (max_x, max_y))`` where positions maps block ID
+    to an ``(x, y)`` tuple snapped to the canvas grid.
+    """
+    ids = list(blocks)
+    if not ids:
+        return {}, (origin_x, origin_y)
+    index = {block_id: i for i, block_id in enumerate(ids)}
+    n = len(ids)
+
+    # Blocks joined by continue lines are laid out as one unit
+    chain_next = {}
+    continued = set()
+    for start_id, end_id in continue_lines:
+        if start_id in index and end_id in index and index[end_id] not in continued:
+            chain_next[index[start_id]] = index[end_id]
+            continued.add(index[end_id])
+    rep = list(range(n))
+    chains = {}
+    for head in range(n):
+        if head in continued:
+            continue
+        chain = [head]
+        node = head
+        while node in chain_next and chain_next[node] != head and rep[chain_next[node]] == chain_next[node]:
+            node = chain_next[node]
+            rep[node] = head
+            chain.append(node)
+        chains[head] = chain
+    for i in range(n):
+        # Blocks caught in a continue cycle fall back to their own unit
+        if rep[i] == i and i not in chains:
+            chains[i] = [i]
+
+    # Edges between units, with their nesting effect
+    end_of = {}
+    for control_id, end_id in end_lines:
+        if control_id in index and end_id in index:
+            end_of[rep[index[control_id]]] = rep[index[end_id]]
+    succ = [[] for _ in range(n)]
+    for start_id, end_id in sequence_lines:
+        if start_id in index and end_id in index:
+            a, b = rep[index[start_id]], rep[index[end_id]]
+            if a != b:
+                succ[a].append((b, False))
+    for a, b in end_of.items():
+        if a != b:
+            succ[a].append((b, True))
+
+    units = list(chains)
+    order, back_edges = _topological_order(units, succ)
+    ranks, depths = _rank_and_depth(order, succ, back_edges, end_of, blocks, ids)
+
+    # Connected groups are placed side by side
+    component = _components(units, succ)
+    edges = [(a, b) for a in units for b, _ in succ[a] if (a, b) not in back_edges]
+    max_rank = max(ranks[u] for u in units) + 1
+    layer = {u: component[u] * max_rank + ranks[u] for u in units}
+    slot = _order_layers(units, layer, edges)
+
+    # Width of each unit includes the blocks continued on its row
+    unit_width = {}
+    for u in units:
+        unit_width[u] = sum(blocks[ids[i]].width for i in chains[u]) + BLOCK_GAP * (len(chains[u]) - 1)
+
+    groups = {}
+    for u in units:
+        groups.setdefault(component[u], []).append(u)
+
+    positions = {}
+    max_x, max_y = origin_x, origin_y
+    group_x = origin_x
+    for comp in sorted(groups):
+        members = groups[comp]
+        max_depth = max(depths[u] for u in members)
+        slot_width = max(unit_width[u] for u in members) + max_depth * INDENT + BLOCK_GAP
+        group_right = group_x
+        for u in members:
+            x = group_x + slot[u] * slot_width + depths[u] * INDENT
+            y = origin_y + ranks[u] * ROW_HEIGHT
+            for i in chains[u]:
+                block = blocks[ids[i]]
+                positions[ids[i]] = (_snap(x), _snap(y))
+                x += block.width + BLOCK_GAP
+                group_right = max(group_right, x)
+                max_y = max(max_y, y + block.height)
+        max_x = max(max_x, group_right)
+        group_x = _snap(group_right + GROUP_GAP)
+    return positions, (max_x, max_y)
+
+
+def _topological_order(units, succ):
+    """Return units in topological order and the back edges that were ignored"""
+    state = dict.fromkeys(units, 0)  # 0 = new, 1 = on stack, 2 = done
+    back_edges = set()
+    postorder = []
+    for root in units:
+        if state[root]:
+            continue
+        state[root] = 1
+        stack = [(root, iter(succ[root]))]
+        while stack:
+            node, children = stack[-1]
+            for child, _ in children:
+                if state[child] == 0:
+                    state[child] = 1
+                    stack.append((child, iter(succ[child])))
+                    break
+                if state[child] == 1:
+                    back_edges.add((node, child))
+            else:
+                state[node] = 2
+                postorder.append(node)
+                stack.pop()
+    postorder.reverse()
+    return postorder, back_edges
+
+
+def _rank_and_depth(order, succ, back_edges, end_of, blocks, ids):
+    """Longest-path ranks and nesting depth, following the exporter's rules"""
+    ranks = dict.fromkeys(order, 0)
+    depths = {}
+    end_depths = {}
+    for node in order:
+        depth = end_depths.get(node, depths.get(node, 0))
+        depths[node] = depth
+        indents = node in end_of and blocks[ids[node]].requires_indentation()
+        for child, is_end in succ[node]:
+            if (node, child) in back_edges:
+                continue
+            if ranks[child] < ranks[node] + 1:
+                ranks[child] = ranks[node] + 1
+            if is_end:
+                # The end block closes the structure at the control's level
+                end_depths[child] = min(end_depths.get(child, depth), depth)
+            else:
+                child_depth = depth + 1 if indents and end_of[node] != child else depth
+                depths[child] = min(depths.get(child, child_depth), child_depth)
+    return ranks, depths
+
+
+def _components(units, succ):
+    """Label weakly connected components, numbered by first appearance"""
+    parent = {u: u for u in units}
+
+    def find(u):
+        while parent[u] != u:
+            parent[u] = parent[parent[u]]
+            u = parent[u]
+        return u
+
+    for a in units:
+        for b, _ in succ[a]:
+            ra, rb = find(a), find(b)
+            if ra != rb:
+                parent[max(ra, rb)] = min(ra, rb)
+    labels = {}
+    component = {}
+    for u in units:
+        component[u] = labels.setdefault(find(u), len(labels))
+    return component
+
+
+def _order_layers(units, layer, edges):
+    """Order units within each layer by barycenter sweeps; returns slot indices"""
+    if np is not None:
+        return _order_layers_numpy(units, layer, edges)
+
+    slot = {}
+    counts = {}
+    for u in units:
+        slot[u] = counts.get(layer[u], 0)
+        counts[layer[u]] = slot[u] + 1
+    if len(counts) == len(units):
+        return slot  # One unit per layer, nothing to reorder
+
+    for _ in range(SWEEPS):
+        for direction in (0, 1):
+            sums, hits = {}, {}
+            for edge in edges:
+                src, dst = edge[direction], edge[1 - direction]
+                sums[dst] = sums.get(dst, 0.0) + slot[src]
+                hits[dst] = hits.get(dst, 0) + 1
+            ranked = sorted(units, key=lambda u: (layer[u],
+                                                  sums[u] / hits[u] if u in hits else slot[u],
+                                                  slot[u]))
+            previous, position = None, 0
+            for u in ranked:
+                position = position + 1 if layer[u] == previous else 0
+                previous = layer[u]
+                slot[u] = position
+    return slot
+
+
+def _order_layers_numpy(units, layer, edges):
+    """Vectorized barycenter sweeps over all layers at once"""
+    local = {u: i for i, u in enumerate(units)}
+    n = len(units)
+    layers = np.array([layer[u] for u in units], dtype=np.int64)
+
+    def positions_within_layers(order):
+        sorted_layers = layers[order]
+        starts = np.searchsorted(sorted_layers, sorted_layers, side="left")
+        pos = np.empty(n, dtype=np.float64)
+        pos[order] = np.arange(n) - starts
+        return pos
+
+    pos = positions_within_layers(np.lexsort((np.arange(n), layers)))
+    if edges and np.unique(layers).size < n:
+        src = np.array([local[a] for a, _ in edges], dtype=np.int64)
+        dst = np.array([local[b] for _, b in edges], dtype=np.int64)
+        for _ in range(SWEEPS):
+            for a, b in ((src, dst), (dst, src)):
+                sums = np.bincount(b, weights=pos[a], minlength=n)
+                hits = np.bincount(b, minlength=n)
+                bary = np.where(hits > 0, sums / np.maximum(hits, 1), pos)
+                pos = positions_within_layers(np.lexsort((pos, bary, layers)))
+    return {u: int(pos[local[u]]) for u in units}
@@ -1,74 +1,100 @@
 import ast
+import copy
+import functools
+import importlib.util
 import re
 
+from .gui_extractor import extract_gui
+from .importer import build_block_graph
+
+# Header comments written into generated GUI files
+METADATA_PATTERN = re.compile(r'^# (Frame|Window Title|Window Size):(.*)$', re.MULTILINE)
+METADATA_KEYS = {
+    'Frame': 'frame_name',
+    'Window Title': 'window_title',
+    'Window Size': 'window_size',
+}
+
+
 class PythonFileParser:
+    # Bump whenever the shape of parse results changes, so cached results are not reused
+    VERSION = 1
+
     @staticmethod
-    def parse_gui_python_file(filepath):
+    def parse_gui_python_file(filepath, cache=None):
+        """Parse a Python file, reusing a cached result when cache (a ParseCache) has one"""
         try:
-            with open(filepath, 'r') as f:
-                content = f.read()
-            
-            metadata = {}
-            lines = content.split('\n')
-            for line in lines:
-                if line.startswith('# Frame:'):
-                    metadata['frame_name'] = line.replace('# Frame:', '').strip()
-                elif line.startswith('# Window Title:'):
-                    metadata['window_title'] = line.replace('# Window Title:', '').strip()
-                elif line.startswith('# Window Size:'):
-                    metadata['window_size'] = line.replace('# Window Size:', '').strip()
-            
-            tree = ast.parse(content)
-            imports = []
-            
-            for node in ast.walk(tree):
-                if isinstance(node, ast.Import):
-                    for alias in node.names:
-                        imports.append(f"import {alias.name}")
-                elif isinstance(node, ast.ImportFrom):
-                    module = node.module or ""
-                    for alias in node.names:
-                        imports.append(f"from {module} import {alias.name}")
+            with open(filepath, 'rb') as f:
+                data = f.read()
+            content = importlib.util.decode_source(data)
             
-            class_info = None
-            for node in ast.walk(tree):
-                if isinstance(node, ast.ClassDef):
-                    class_info = {'name': node.name, 'methods': []}
-                    break
+            key = None
+            if cache is not None:
+                key = cache.make_key(data, PythonFileParser.VERSION)
+                result = cache.get(key)
+                if result is not None:
+                    result['raw_content'] = content
+                    return result
             
-            return {
-                'metadata': metadata,
-                'imports': imports,
-                'class_info': class_info,
-                'raw_content': content
-            }
+            result = PythonFileParser.parse_python_source(content)
+            if cache is not None:
+                # The source is already on disk, so it is not stored twice
+                cache.put(key, {k: v for k, v in result.items() if k != 'raw_content'})
+            return result
         except Exception as e:
             return {'error': str(e)}
-    
+
     @staticmethod
-    def extract_widgets_from_code(content):
-        widgets = []
-        widget_pattern = r'self\.(\w+)\s*=\s*(?:tk|ttk)\.(\w+)\([^)]*\)'
+    def parse_python_source(content):
+        """Parse source code into metadata, imports, class info and a block graph"""
+        metadata = {}
+        for match in METADATA_PATTERN.finditer(content):
+            metadata[METADATA_KEYS[match.group(1)]] = match.group(2).strip()
         
-        for match in re.finditer(widget_pattern, content):
-            var_name = match.group(1)
-            widget_type = match.group(2)
-            widgets.append({'var_name': var_name, 'widget_type': widget_type, 'type': 'gui_widget'})
+        tree = ast.parse(content)
+        graph, imports, class_info = build_block_graph(tree)
         
-        return widgets
+        return {
+            'metadata': metadata,
+            'imports': imports,
+            'class_info': class_info,
+            'graph': graph,
+            'raw_content': content
+        }
+    
+    @staticmethod
+    def parse_gui_layout_file(filepath):
+        """Read a Tkinter file and return its widgets and layout calls"""
+        try:
+            with open(filepath, 'rb') as f:
+                content = importlib.util.decode_source(f.read())
+            widgets, layouts, setup = PythonFileParser.extract_gui(content)
+            return {'widgets': widgets, 'layouts': layouts, 'setup': setup}
+        except Exception as e:
+            return {'error': str(e)}
+    
+    @staticmethod
+    def extract_gui(content):
+        """Extract widget constructions and layout calls in one AST pass.
+
+        Returns (widgets, layouts, setup), see GuiExtractor. Results for the
+        most recent sources are reused, so asking for widgets and then
+        layouts parses only once; every caller gets its own copy.
+        """
+        widgets, layouts, setup = copy.deepcopy(_extract_gui_cached(content))
+        return list(widgets), list(layouts), setup
+    
+    @staticmethod
+    def extract_widgets_from_code(content):
+        return PythonFileParser.extract_gui(content)[0]
     
     @staticmethod
     def extract_grid_layout(content):
-        layouts = []
-        grid_pattern = r'self\.(\w+)\.grid\(([^)]*)\)'
-        
-        for match in re.finditer(grid_pattern, content):
-            var_name = match.group(1)
-            params_str = match.group(2)
-            params = {}
-            param_pairs = re.findall(r'(\w+)\s*=\s*([^,]+)', params_str)
-            for key, value in param_pairs:
-                params[key] = value.strip()
-            layouts.append({'var_name': var_name, 'method': 'grid', 'params': params})
-        
-        return layouts
\ No newline at end of file
+        return [layout for layout in PythonFileParser.extract_gui(content)[1]
+                if layout['method'] == 'grid']
+
+
+@functools.lru_cache(maxsize=4)
+def _extract_gui_cached(content):
+    widgets, layouts, setup = extract_gui(ast.parse(content))
+    return tuple(widgets), tuple(layouts), setup
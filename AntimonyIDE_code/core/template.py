@@ -0,0 +1,151 @@
+import functools
+import keyword
+import re
+import textwrap
+
+# {name} or {name:kind}; braces that hold anything else (dict literals, {}) are code
+PLACEHOLDER_PATTERN = re.compile(r"\{([A-Za-z_][A-Za-z0-9_]*)(?::([a-z]+))?\}")
+
+# A comment, or the start of a string literal with its prefix
+STRING_OR_COMMENT = re.compile(r"(?P<comment>#[^\n]*)"
+                               r"|(?<![A-Za-z0-9_])(?P<prefix>[rRbBuUfF]{0,2})"
+                               r"(?P<quote>'''|\"\"\"|'|\")")
+
+FIELD_KINDS = ("name", "parameters", "arguments", "expression", "statements", "text")
+
+# Placeholder names whose kind is known without an explicit :kind
+NAME_KINDS = {
+    "name": "name", "var": "name", "var_name": "name", "variable": "name",
+    "item": "name", "item1": "name", "item2": "name", "function": "name",
+    "method_name": "name", "ClassName": "name", "class_name": "name", "module": "name",
+    "params": "parameters", "args": "arguments", "body": "statements",
+}
+
+
+def fstring_spans(source):
+    """Return (start, end) ranges of the f-string literals in source.
+
+    Their braces are f-string fields, not placeholders. Comments are
+    skipped so an apostrophe in one does not start a string.
+    """
+    spans = []
+    position = 0
+    while True:
+        match = STRING_OR_COMMENT.search(source, position)
+        if match is None:
+            return spans
+        if match.group("comment") is not None:
+            position = match.end()
+            continue
+        prefix, quote = match.group("prefix").lower(), match.group("quote")
+        index = match.end()
+        while index < len(source) and not source.startswith(quote, index):
+            if source[index] == "\\" and "r" not in prefix:
+                index += 1
+            elif source[index] == "\n" and len(quote) == 1:
+                break  # Unterminated single-quoted string
+            index += 1
+        position = min(index + len(quote), len(source))
+        if "f" in prefix:
+            spans.append((match.start(), position))
+
+
+def infer_kind(source, match):
+    """Guess the kind of a placeholder without an explicit :kind from where it stands"""
+    name = match.group(1)
+    line_start = source.rfind("\n", 0, match.start()) + 1
+    line_end = source.find("\n", match.end())
+    line = source[line_start:line_end if line_end != -1 else len(source)]
+    before = source[match.start() - 1:match.start()]
+    after = source[match.end():match.end() + 1]
+    if before and before == after and before in "'\"":
+        return "text"  # Inside quotes, as in "{title}"
+    if line.strip() == match.group(0):
+        return "statements"  # Alone on its line, e.g. a function body
+    if (before.isalnum() or before == "_") or (after.isalnum() or after == "_"):
+        return "text"  # Glued to code, e.g. self{params} needs ", a, b"
+    return NAME_KINDS.get(name, "expression")
+
+
+def validate_field(kind, value):
+    """Return an error message if value is not valid for a field kind, else None"""
+    try:
+        if kind == "name":
+            if not all(part.isidentifier() and not keyword.iskeyword(part)
+                       for part in value.split(".")):
+                return "must be a name, e.g. total or os.path"
+        elif kind == "parameters":
+            compile(f"def _({value}): pass", "<field>", "exec")
+        elif kind == "arguments":
+            compile(f"_({value})", "<field>", "eval")
+        elif kind == "expression":
+            compile(value, "<field>", "eval")
+        elif kind == "statements":
+            # Inside a function and a loop, so return/break/continue are allowed
+            body = textwrap.indent(textwrap.dedent(value), "        ")
+            compile(f"def _():\n    while True:\n{body}\n", "<field>", "exec")
+    except SyntaxError:
+        return f"must be valid Python {kind}"
+    return None
+
+
+class CompiledTemplate:
+    """Block content split once into literal text and placeholder fields.
+
+    ``parts`` alternates literal strings with indexes into ``fields``, a list
+    of (name, kind) pairs in first-use order, so rendering is a single join.
+    A placeholder's kind is inferred from where it stands (see infer_kind)
+    unless written as ``{name:kind}``; braces inside f-strings are left alone.
+    """
+
+    def __init__(self, source):
+        self.source = source
+        self.parts = []
+        self.fields = []
+        indexes = {}
+        position = 0
+        fstrings = fstring_spans(source) if "{" in source else []
+        for match in PLACEHOLDER_PATTERN.finditer(source):
+            if any(start <= match.start() < end for start, end in fstrings):
+                continue
+            name, kind = match.group(1), match.group(2)
+            if kind not in FIELD_KINDS:
+                kind = infer_kind(source, match)
+            if name not in indexes:
+                indexes[name] = len(self.fields)
+                self.fields.append((name, kind))
+            self.parts.append(source[position:match.start()])
+            self.parts.append(indexes[name])
+            position = match.end()
+        self.parts.append(source[position:])
+
+    def render(self, values):
+        """Substitute values; unfilled placeholders are left as {name}.
+
+        Extra lines of a statements value are indented like the placeholder.
+        """
+        rendered = []
+        for part in self.parts:
+            if isinstance(part, int):
+                name, kind = self.fields[part]
+                value = values.get(name)
+                if not value:
+                    part = f"{{{name}}}"
+                elif kind == "statements" and "\n" in value:
+                    indent = rendered[-1][rendered[-1].rfind("\n") + 1:] if rendered else ""
+                    lines = textwrap.dedent(value).splitlines()
+                    part = ("\n" + indent).join(lines)
+                else:
+                    part = value
+            rendered.append(part)
+        return "".join(rendered)
+
+    def missing(self, values):
+        """Return the names of fields that have no value"""
+        return [name for name, _ in self.fields if not values.get(name)]
+
+
+@functools.lru_cache(maxsize=1024)
+def compile_template(source):
+    """Return the compiled template for a content string, shared between blocks"""
+    return CompiledTemplate(source)
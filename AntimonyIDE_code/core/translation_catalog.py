@@ -0,0 +1,149 @@
+"""Compiled translation catalogs.
+
+The language JSON files stay the source; ``python compile_languages.py
+[language_dir]`` compiles each ``<code>.json`` into ``<code>.catalog``, which
+LanguageManager opens with mmap instead of parsing JSON (useful for frozen
+builds, where the catalogs are bundled next to the JSON).
+
+Layout, little-endian: the magic, the entry count, the size and crc32 of the
+source JSON, then one (crc32 of key, key offset, key length, value offset,
+value length) entry per key sorted by hash, then the UTF-8 strings the
+offsets point into. The source size and hash tell whether the catalog is
+current; file times are not reliable for that, since a PyInstaller onefile
+build extracts files in arbitrary order.
+"""
+import json
+import mmap
+import os
+import struct
+import tempfile
+import zlib
+
+MAGIC = b"AIDECAT2"
+HEADER = struct.Struct("<8sIQI")
+ENTRY = struct.Struct("<IIIII")
+
+CATALOG_SUFFIX = ".catalog"
+
+
+def key_hash(key_bytes):
+    return zlib.crc32(key_bytes)
+
+
+def compile_catalog(translations, catalog_file, source=b""):
+    """Write a translations dict as a binary catalog, atomically.
+
+    source is the JSON the translations were parsed from; its size and hash
+    are stored so a later edit of the JSON can be detected.
+    """
+    items = []
+    for key, value in translations.items():
+        if not isinstance(value, str):
+            raise ValueError(f"Translation for '{key}' is not a string")
+        key_bytes = key.encode('utf-8')
+        items.append((key_hash(key_bytes), key_bytes, value.encode('utf-8')))
+    items.sort()
+    
+    entries = []
+    strings = bytearray()
+    data_start = HEADER.size + ENTRY.size * len(items)
+    for hash_value, key_bytes, value_bytes in items:
+        key_offset = data_start + len(strings)
+        strings += key_bytes
+        value_offset = data_start + len(strings)
+        strings += value_bytes
+        entries.append(ENTRY.pack(hash_value, key_offset, len(key_bytes),
+                                  value_offset, len(value_bytes)))
+    
+    directory = os.path.dirname(catalog_file) or "."
+    fd, tmp_file = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, len(items), len(source), zlib.crc32(source)))
+            f.write(b"".join(entries))
+            f.write(strings)
+        os.replace(tmp_file, catalog_file)
+    except BaseException:
+        os.unlink(tmp_file)
+        raise
+
+
+def compile_language_dir(lang_dir):
+    """Compile every language JSON file in a directory; returns the catalogs written"""
+    written = []
+    for file in sorted(os.listdir(lang_dir)):
+        if file.endswith('.json'):
+            with open(os.path.join(lang_dir, file), 'rb') as f:
+                source = f.read()
+            catalog_file = os.path.join(lang_dir, file[:-len('.json')] + CATALOG_SUFFIX)
+            compile_catalog(json.loads(source.decode('utf-8')), catalog_file, source)
+            written.append(catalog_file)
+    return written
+
+
+class TranslationCatalog:
+    """Read-only view of a compiled catalog, queried through mmap.
+
+    Offers the ``get`` of a dict; a lookup binary-searches the sorted hash
+    table and only decodes the value it returns, which is then remembered.
+    """
+
+    def __init__(self, catalog_file):
+        with open(catalog_file, 'rb') as f:
+            self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self.data) < HEADER.size:
+            self.data.close()
+            raise ValueError(f"Not a translation catalog: {catalog_file}")
+        magic, self.count, self.source_size, self.source_hash = HEADER.unpack_from(self.data, 0)
+        if magic != MAGIC or HEADER.size + ENTRY.size * self.count > len(self.data):
+            self.data.close()
+            raise ValueError(f"Not a translation catalog: {catalog_file}")
+        self._values = {}  # Keys looked up so far
+
+    def __len__(self):
+        return self.count
+
+    def matches_source(self, source_file):
+        """True if the catalog was compiled from the current contents of source_file"""
+        if os.path.getsize(source_file) != self.source_size:
+            return False
+        with open(source_file, 'rb') as f:
+            return zlib.crc32(f.read()) == self.source_hash
+
+    def __contains__(self, key):
+        return self._find(key) is not None
+
+    def get(self, key, default=None):
+        value = self._values.get(key)
+        if value is None:
+            entry = self._find(key)
+            if entry is None:
+                return default
+            value_offset, value_length = entry
+            value = self._values[key] = self.data[value_offset:value_offset + value_length].decode('utf-8')
+        return value
+
+    def _find(self, key):
+        key_bytes = key.encode('utf-8')
+        hash_value = key_hash(key_bytes)
+        data = self.data
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            if struct.unpack_from("<I", data, HEADER.size + ENTRY.size * middle)[0] < hash_value:
+                low = middle + 1
+            else:
+                high = middle
+        # Entries sharing the hash are adjacent; compare their keys
+        for index in range(low, self.count):
+            entry_hash, key_offset, key_length, value_offset, value_length = ENTRY.unpack_from(
+                data, HEADER.size + ENTRY.size * index)
+            if entry_hash != hash_value:
+                break
+            if data[key_offset:key_offset + key_length] == key_bytes:
+                return value_offset, value_length
+        return None
+
+    def close(self):
+        self.data.close()
+
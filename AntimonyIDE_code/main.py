@@ -1,3 +1,4 @@
+import multiprocessing
 import tkinter as tk
 from ui import ScratchPythonBuilder
 
@@ -7,4 +8,6 @@ def main():
     root.mainloop()
 
 if __name__ == "__main__":
+    # Needed for the folder import process pool in frozen builds
+    multiprocessing.freeze_support()
     main()
\ No newline at end of file
@@ -0,0 +1,62 @@
+import json
+
+import pytest
+
+from utils.block_loader import BlockLoader
+
+
+def write_package(path, blocks):
+    path.write_text(json.dumps({"Demo": blocks}), encoding="utf-8")
+
+
+@pytest.fixture
+def packages_dir(tmp_path, monkeypatch):
+    # The loader keeps its manifest and caches relative to the working directory
+    monkeypatch.chdir(tmp_path)
+    directory = tmp_path / "packages"
+    directory.mkdir()
+    return directory
+
+
+def test_malformed_edit_keeps_lazily_loaded_package(packages_dir):
+    package = packages_dir / "Demo.json"
+    write_package(package, [
+        {"type": "function", "text": "one", "content": "one()"},
+        {"type": "function", "text": "two", "content": "two()"},
+    ])
+    loader = BlockLoader(lazy=True, packages_dir=str(packages_dir), use_catalog_cache=False)
+    assert not loader.is_loaded("Demo")
+    assert [block["text"] for block in loader.get_blocks("Demo")] == ["one", "two"]
+
+    package.write_text('{"Demo": [{"text": "one",', encoding="utf-8")
+    diffs, errors = loader.reload_packages([str(package)])
+
+    assert list(errors) == [str(package)]
+    assert diffs == {}
+    assert [block["text"] for block in loader.get_blocks("Demo")] == ["one", "two"]
+    # A later rebuild of the category still sees the last good contents
+    loader._rebuild_category("Demo")
+    assert [block["text"] for block in loader.get_blocks("Demo")] == ["one", "two"]
+
+
+def test_reload_applies_valid_edit(packages_dir):
+    package = packages_dir / "Demo.json"
+    write_package(package, [{"type": "function", "text": "one", "content": "one()"}])
+    loader = BlockLoader(lazy=True, packages_dir=str(packages_dir), use_catalog_cache=False)
+    loader.get_blocks("Demo")
+
+    write_package(package, [{"type": "function", "text": "three", "content": "three()"}])
+    diffs, errors = loader.reload_packages([str(package)])
+
+    assert errors == {}
+    assert [block["text"] for block in loader.get_blocks("Demo")] == ["three"]
+    assert len(diffs["Demo"].inserted) == 1 and len(diffs["Demo"].deleted) == 1
+
+
+def test_first_access_is_logged_in_category_loads(packages_dir):
+    write_package(packages_dir / "Demo.json", [{"type": "function", "text": "one", "content": "one()"}])
+    loader = BlockLoader(lazy=True, packages_dir=str(packages_dir), use_catalog_cache=False)
+    assert loader.category_loads == []
+    loader.get_blocks("Demo")
+    loader.get_blocks("Demo")
+    assert loader.category_loads == ["Demo"]
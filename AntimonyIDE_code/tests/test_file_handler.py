@@ -0,0 +1,33 @@
+import json
+import os
+import stat
+
+import pytest
+
+from utils import file_handler
+from utils.file_handler import write_project_file
+
+
+def test_new_project_file_follows_the_umask(tmp_path, monkeypatch):
+    monkeypatch.setattr(file_handler, "UMASK", 0o077)
+    project = tmp_path / "new.aide"
+    write_project_file(str(project), {"blocks": []})
+    assert stat.S_IMODE(os.stat(project).st_mode) == 0o600
+    assert json.loads(project.read_text()) == {"blocks": []}
+
+
+def test_overwrite_keeps_the_existing_mode(tmp_path):
+    project = tmp_path / "shared.aide"
+    project.write_text("{}")
+    os.chmod(project, 0o664)
+    write_project_file(str(project), {"blocks": [1]})
+    assert stat.S_IMODE(os.stat(project).st_mode) == 0o664
+
+
+def test_failed_save_leaves_the_previous_file_intact(tmp_path):
+    project = tmp_path / "project.aide"
+    write_project_file(str(project), {"blocks": ["saved"]})
+    with pytest.raises(TypeError):
+        write_project_file(str(project), {"blocks": [object()]})  # Not JSON serializable
+    assert json.loads(project.read_text()) == {"blocks": ["saved"]}
+    assert os.listdir(tmp_path) == ["project.aide"]  # No temp file left behind
@@ -0,0 +1,44 @@
+from utils.folder_importer import FolderImporter, find_python_files
+from utils.parse_cache import ParseCache
+
+
+def make_project(root):
+    (root / "pkg").mkdir()
+    (root / "pkg" / "a.py").write_text("x = 1\nprint(x)\n")
+    (root / "main.py").write_text("def main():\n    return 0\n")
+    (root / "broken.py").write_text("def broken(:\n")
+    (root / "notes.txt").write_text("not python")
+    for skipped in (".git", "__pycache__", "venv"):
+        (root / skipped).mkdir()
+        (root / skipped / "skipped.py").write_text("skipped = True\n")
+
+
+def drain(importer):
+    results = {}
+    while True:
+        path, result = importer.results.get(timeout=60)
+        if path is None:
+            return results
+        results[path] = result
+
+
+def test_find_python_files_skips_hidden_and_tool_directories(tmp_path):
+    make_project(tmp_path)
+    assert find_python_files(str(tmp_path)) == [
+        str(tmp_path / "broken.py"), str(tmp_path / "main.py"), str(tmp_path / "pkg" / "a.py")]
+
+
+def test_folder_is_parsed_on_worker_processes_and_cached(tmp_path):
+    make_project(tmp_path)
+    cache = ParseCache(str(tmp_path / "cache"))
+    importer = FolderImporter(str(tmp_path), cache=cache, max_workers=2)
+    importer.start()
+    results = drain(importer)
+
+    assert sorted(results) == importer.paths
+    assert "error" in results[str(tmp_path / "broken.py")]
+    module = results[str(tmp_path / "main.py")]
+    assert "raw_content" not in module
+    assert [block["content"] for block in module["graph"]["blocks"]] == ["def main():", "return 0", ""]
+    # The worker processes wrote their results to the shared on-disk cache
+    assert len(list((tmp_path / "cache").glob("*.pickle"))) == 2
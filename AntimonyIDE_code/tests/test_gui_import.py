@@ -0,0 +1,49 @@
+import ast
+
+from core.importer import build_gui_graph
+from core.parser import PythonFileParser
+
+SOURCE = '''import tkinter as tk
+window = tk.Tk()
+greeting = tk.Label(window, text="Hi", anchor=tk.W)
+greeting.grid(row=0, column=0)
+tk.Button(window, text="Quit", command=window.destroy).pack(side="left")
+window.mainloop()
+'''
+
+
+def program(graph):
+    """Code of a chain of blocks, following their sequence connections"""
+    blocks = {block["id"]: block for block in graph["blocks"]}
+    followers = {end for _, end in graph["sequence_lines"]}
+    block_id = next(block_id for block_id in blocks if block_id not in followers)
+    lines = []
+    while block_id is not None:
+        lines.append(blocks[block_id]["content"])
+        block_id = (blocks[block_id]["connections"] or [None])[0]
+    return "\n".join(lines)
+
+
+def test_rebuilt_gui_program_defines_what_it_uses():
+    widgets, layouts, setup = PythonFileParser.extract_gui(SOURCE)
+    assert [widget["widget_type"] for widget in widgets] == ["Label", "Button"]
+    code = program(build_gui_graph(widgets, layouts, setup))
+    assert code.splitlines()[:2] == ["import tkinter as tk", "window = tk.Tk()"]
+    assert code.splitlines()[-1] == "window.mainloop()"
+    ast.parse(code)
+
+
+def test_program_without_root_gets_a_default_one():
+    widgets, layouts, setup = PythonFileParser.extract_gui('tk.Label(root, text="Hi").pack()\n')
+    code = program(build_gui_graph(widgets, layouts, setup))
+    assert code.splitlines() == ["import tkinter as tk", "root = tk.Tk()",
+                                 "tk.Label(root, text='Hi').pack()", "root.mainloop()"]
+
+
+def test_cached_extraction_is_not_shared_between_callers():
+    widgets, layouts, _ = PythonFileParser.extract_gui(SOURCE)
+    widgets[0]["source"] = "edited"
+    layouts.clear()
+    widgets, layouts, _ = PythonFileParser.extract_gui(SOURCE)
+    assert widgets[0]["source"].startswith("greeting = tk.Label")
+    assert len(layouts) == 2
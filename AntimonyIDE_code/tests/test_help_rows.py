@@ -0,0 +1,83 @@
+import json
+
+import pytest
+
+from ui.help_window import diff_rows, listed_item_ids, plan_sorted_inserts, row_key
+from utils.block_loader import BlockLoader
+
+
+def write_package(path, blocks):
+    path.write_text(json.dumps({path.stem: blocks}), encoding="utf-8")
+
+
+def block(text, content=None):
+    return {"type": "function", "text": text, "content": content or f"{text}()"}
+
+
+@pytest.fixture
+def loader(tmp_path, monkeypatch):
+    # The loader keeps its manifest and caches relative to the working directory
+    monkeypatch.chdir(tmp_path)
+    packages = tmp_path / "packages"
+    packages.mkdir()
+    write_package(packages / "Demo.json", [block("beta"), block("delta"), block("alpha")])
+    write_package(packages / "Extra.json", [block("one")])
+    return BlockLoader(lazy=True, packages_dir=str(packages), use_catalog_cache=False)
+
+
+def relist(loader, selected_category="All"):
+    """Rows of a full listing, as the help window's load_blocks builds it"""
+    return sorted(listed_item_ids(loader, selected_category),
+                  key=lambda item_id: row_key(loader.get_descriptor(item_id)))
+
+
+def insert_sorted(loader, listed, changed):
+    """Insert or replace rows the way the help window's insert_sorted does"""
+    listed = [item_id for item_id in listed if item_id not in changed]
+    keys = [row_key(loader.get_descriptor(item_id)) for item_id in listed]
+    rows = [(row_key(loader.get_descriptor(item_id)), item_id) for item_id in dict.fromkeys(changed)]
+    for index, item_id in plan_sorted_inserts(keys, rows):
+        listed.insert(index, item_id)
+    return listed
+
+
+def apply_diffs(loader, listed, diffs, selected_category="All"):
+    """Patch a listing the way the help window patches its tree"""
+    deleted, changed = diff_rows(diffs, selected_category)
+    return insert_sorted(loader, [item_id for item_id in listed if item_id not in deleted], changed)
+
+
+@pytest.mark.parametrize("selected_category", ["All", "Demo", "Extra"])
+def test_reload_diff_patches_the_listing_like_a_relist(loader, tmp_path, selected_category):
+    listed = relist(loader, selected_category)
+    packages = tmp_path / "packages"
+    write_package(packages / "Demo.json", [block("beta", "beta(1)"), block("gamma"), block("alpha")])
+    (packages / "Extra.json").unlink()
+    write_package(packages / "Added.json", [block("zeta")])
+
+    diffs, errors = loader.reload_packages(
+        [str(packages / name) for name in ("Demo.json", "Extra.json", "Added.json")])
+    assert not errors
+    assert apply_diffs(loader, listed, diffs, selected_category) == relist(loader, selected_category)
+
+
+def test_plan_sorted_inserts_keeps_keys_in_step():
+    keys = [("A", "a"), ("A", "c"), ("B", "a")]
+    inserts = plan_sorted_inserts(keys, [(("A", "b"), "ab"), (("C", "a"), "ca"), (("A", "a0"), "aa0")])
+    assert inserts == [(1, "ab"), (4, "ca"), (1, "aa0")]
+    assert keys == sorted(keys)
+
+
+@pytest.mark.parametrize("selected_category", ["All", "Demo"])
+def test_lazily_loaded_categories_are_inserted_like_a_relist(loader, selected_category):
+    # The window was listed while Demo and Extra were still pending
+    loaded_before = [category for category in loader.categories() if loader.is_loaded(category)]
+    listed = sorted(listed_item_ids(loader, selected_category, loaded_before),
+                    key=lambda item_id: row_key(loader.get_descriptor(item_id)))
+    position = len(loader.category_loads)
+    loader.get_blocks("Demo")  # e.g. opened in the palette
+    loader.get_blocks("Extra")
+    loaded = loader.category_loads[position:]
+    assert loaded == ["Demo", "Extra"]
+    listed = insert_sorted(loader, listed, listed_item_ids(loader, selected_category, set(loaded)))
+    assert listed == relist(loader, selected_category)
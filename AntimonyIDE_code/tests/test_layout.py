@@ -0,0 +1,69 @@
+import ast
+import textwrap
+import pytest
+
+from core import layout
+from core.code_block import CodeBlock
+from core.importer import build_block_graph
+from core.layout import INDENT, compute_layout
+
+SOURCE = textwrap.dedent("""
+    def check(items):
+        for item in items:
+            if not item: continue
+            print(item)
+        return items
+    x = check([1, 2])
+    """)
+
+
+def layout_of(source):
+    graph, _, _ = build_block_graph(ast.parse(source))
+    blocks = {block["id"]: CodeBlock.from_dict(block) for block in graph["blocks"]}
+    positions, size = compute_layout(blocks, graph["sequence_lines"], graph["end_lines"], graph["continue_lines"])
+    by_content = {blocks[block_id].content: position for block_id, position in positions.items()}
+    return graph, blocks, positions, size, by_content
+
+
+@pytest.fixture(params=["numpy", "pure python"])
+def sweeps(request, monkeypatch):
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(layout, "np", None)
+    return request.param
+
+
+def test_blocks_flow_down_and_nest_by_indentation(sweeps):
+    graph, blocks, positions, (max_x, max_y), at = layout_of(SOURCE)
+    assert len(positions) == len(blocks)
+    for start_id, end_id in graph["sequence_lines"]:
+        assert positions[end_id][1] > positions[start_id][1]
+    # Bodies are indented one level per enclosing block, ends line up with their header
+    assert at["for item in items:"][0] == at["def check(items):"][0] + INDENT
+    assert at["if not item:"][0] == at["for item in items:"][0] + INDENT
+    assert at["print(item)"][0] == at["if not item:"][0]
+    assert at["return items"][0] == at["for item in items:"][0]
+    assert at["x = check([1, 2])"][0] == at["def check(items):"][0]
+    for block_id, (x, y) in positions.items():
+        assert x + blocks[block_id].width <= max_x and y + blocks[block_id].height <= max_y
+
+
+def test_continued_blocks_share_a_row_left_to_right(sweeps):
+    graph, blocks, positions, _, _ = layout_of(SOURCE)
+    assert graph["continue_lines"]
+    for start_id, end_id in graph["continue_lines"]:
+        assert positions[end_id][1] == positions[start_id][1]
+        assert positions[end_id][0] >= positions[start_id][0] + blocks[start_id].width
+
+
+def test_unconnected_groups_do_not_overlap(sweeps):
+    blocks = {name: CodeBlock(name, "statement", 0, 0, width=100, height=40) for name in ("a", "b", "c", "d")}
+    positions, _ = compute_layout(blocks, [("a", "b"), ("c", "d")], [], [])
+    assert positions["b"][0] == positions["a"][0] and positions["b"][1] > positions["a"][1]
+    left, right = sorted([("a", "b"), ("c", "d")], key=lambda group: positions[group[0]][0])
+    assert positions[right[0]][0] >= positions[left[0]][0] + 100
+
+
+def test_empty_graph():
+    assert compute_layout({}, [], [], []) == ({}, (100, 100))
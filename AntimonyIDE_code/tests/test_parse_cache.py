@@ -0,0 +1,26 @@
+import os
+
+from utils import parse_cache
+from utils.parse_cache import ParseCache
+
+
+def test_writes_keep_a_running_total_and_scan_only_to_evict(tmp_path, monkeypatch):
+    scans = []
+    scandir = os.scandir
+    monkeypatch.setattr(parse_cache.os, "scandir", lambda path: scans.append(path) or scandir(path))
+    cache = ParseCache(str(tmp_path), max_bytes=10_000)
+
+    for i in range(20):
+        cache.put(f"key{i}", {"blocks": [i]})
+    assert len(scans) == 1  # The first write only
+    assert cache.entry_count == 20
+    assert cache.total_bytes == sum(entry.stat().st_size for entry in scandir(tmp_path))
+
+    cache.put("key0", {"blocks": ["replaced"]})
+    assert cache.entry_count == 20
+
+    for i in range(500):
+        cache.put(f"big{i}", {"blocks": ["x" * 100]})
+    assert cache.total_bytes <= 10_000
+    assert cache.total_bytes == sum(entry.stat().st_size for entry in scandir(tmp_path))
+    assert len(scans) < 50
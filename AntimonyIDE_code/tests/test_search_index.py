@@ -0,0 +1,32 @@
+import pytest
+
+from utils.block_descriptor import describe_block
+from utils.search_index import BlockSearchIndex
+
+
+@pytest.fixture
+def index():
+    index = BlockSearchIndex()
+    for i in range(500):
+        block = {"type": "function", "text": f"func_{i:03d}", "content": f"mod.func_{i:03d}({{x}})"}
+        index.add(f"gen:{i}", describe_block("Generated", block))
+    index.add("json:dumps", describe_block("Json", {
+        "type": "function", "text": "json.dumps", "content": "json.dumps({obj})"}))
+    index.add("math:sqrt", describe_block("Math", {
+        "type": "function", "text": "math.sqrt", "content": "math.sqrt({x})"}))
+    return index
+
+
+def test_limit_keeps_the_best_ranked_matches(index):
+    assert index.search("func_", limit=10) == index.search("func_")[:10]
+    assert index.search("json", limit=0) == []
+
+
+def test_shared_prefix_is_not_a_fuzzy_match(index):
+    assert index.search("func_ab") == []
+
+
+def test_typo_and_subsequence_match_fuzzily(index):
+    assert index.search("json.dunps") == ["json:dumps"]
+    assert index.search("sqrtt") == ["math:sqrt"]
+    assert index.search("jsdump", limit=5) == ["json:dumps"]
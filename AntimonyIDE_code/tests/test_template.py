@@ -0,0 +1,60 @@
+import textwrap
+
+import pytest
+
+from core.template import compile_template, validate_field
+from utils.block_loader import BlockLoader
+
+# A valid value for each field kind
+SAMPLE_VALUES = {
+    "name": "x",
+    "parameters": "a, b",
+    "arguments": "x, y",
+    "expression": "x",
+    "statements": "pass",
+    "text": "x",
+}
+
+
+def default_contents():
+    blocks = BlockLoader.load_default_blocks(None)
+    return [block["content"] for category in blocks.values() for block in category]
+
+
+def compiles_as_block(code):
+    """Compile rendered block code in a context where any single block is valid"""
+    if code.startswith(("elif", "else")):
+        code = "if x:\n    pass\n" + code
+    if code.rstrip().endswith(":"):
+        code += "\n    pass"
+    compile("def _():\n    while True:\n" + textwrap.indent(code, "        "), "<block>", "exec")
+
+
+@pytest.mark.parametrize("content", default_contents())
+def test_builtin_template_renders_valid_code_with_valid_values(content):
+    template = compile_template(content)
+    values = {name: SAMPLE_VALUES[kind] for name, kind in template.fields}
+    for name, kind in template.fields:
+        assert validate_field(kind, values[name]) is None
+    assert template.missing(values) == []
+    compiles_as_block(template.render(values))
+
+
+def test_define_method_fields():
+    template = compile_template("def {method_name}(self{params}):\n    {body}")
+    assert template.fields == [("method_name", "name"), ("params", "text"), ("body", "statements")]
+    assert validate_field("statements", "return x") is None
+    assert validate_field("statements", "x = 1") is None
+    rendered = template.render({"method_name": "m", "params": ", a, b", "body": "x = a\nreturn x"})
+    assert rendered == "def m(self, a, b):\n    x = a\n    return x"
+
+
+def test_fstring_braces_are_not_placeholders():
+    assert compile_template('print(f"{x}")').fields == []
+    template = compile_template('print(f"{x}: " + {value})')
+    assert template.fields == [("value", "expression")]
+    assert template.missing({"value": "1"}) == []
+
+
+def test_quoted_placeholder_is_text():
+    assert compile_template('root.title("{title}")').fields == [("title", "text")]
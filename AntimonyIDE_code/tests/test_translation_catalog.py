@@ -0,0 +1,33 @@
+import json
+import os
+
+from core.language_manager import LanguageManager
+from core.translation_catalog import compile_language_dir
+
+
+def make_language_dir(tmp_path, monkeypatch, translations):
+    # LanguageManager falls back to the language folder of the working directory
+    monkeypatch.chdir(tmp_path)
+    lang_dir = tmp_path / "language"
+    lang_dir.mkdir()
+    (lang_dir / "en.json").write_text(json.dumps(translations), encoding="utf-8")
+    compile_language_dir(str(lang_dir))
+    return lang_dir
+
+
+def test_catalog_is_used_when_compiled_from_current_json(tmp_path, monkeypatch):
+    make_language_dir(tmp_path, monkeypatch, {"title": "Antimony", "save": "Save"})
+    manager = LanguageManager()
+    assert not isinstance(manager.translations, dict)
+    assert manager.get("save") == "Save"
+
+
+def test_edited_json_wins_even_if_catalog_is_newer(tmp_path, monkeypatch):
+    lang_dir = make_language_dir(tmp_path, monkeypatch, {"title": "Antimony", "save": "Save"})
+    json_file = lang_dir / "en.json"
+    json_file.write_text(json.dumps({"title": "Antimony", "save": "Keep"}), encoding="utf-8")
+    # As after a onefile extraction: the catalog looks newer than its JSON
+    catalog_time = os.path.getmtime(lang_dir / "en.catalog")
+    os.utime(json_file, (catalog_time - 10, catalog_time - 10))
+    manager = LanguageManager()
+    assert manager.translations == {"title": "Antimony", "save": "Keep"}
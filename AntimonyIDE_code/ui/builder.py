@@ -9,23 +9,39 @@ import time
 import importlib
 import inspect
 import threading  # 添加threading用于后台运行脚本
+import queue
 
 # Import from our packages
 from core.code_block import CodeBlock
 from core.parser import PythonFileParser
+from core.importer import build_gui_graph
 from core.language_manager import LanguageManager
+from core.layout import compute_layout, GROUP_GAP
+from core.template import validate_field
 from ui.components import create_top_section, create_left_section, create_middle_section, create_right_section
+from ui.translation_bindings import TranslationBindings
 from utils.block_loader import BlockLoader
 from utils.file_handler import FileHandler
+from utils.parse_cache import ParseCache
+from utils.folder_importer import FolderImporter
+from utils.module_introspector import ModuleIntrospector
+from utils.package_watcher import PackageWatcher
+
+# How often package files are checked for changes
+PACKAGE_POLL_MS = 2000
+
+# Blocks inserted into the blocks list per Tk idle tick
+PALETTE_CHUNK = 200
 
 
 class ScratchPythonBuilder:
     def __init__(self, root):
         self.root = root
         self.lang = LanguageManager()  # Initialize language manager
+        self.translations = TranslationBindings(self.lang)  # Widgets updated on language change
         
         # Set app title with translation
-        self.root.title(self.lang.get("app_title"))
+        self.translations.bind_title(self.root, "app_title")
         self.root.geometry("1400x800")
         
         self.project_name = self.lang.get("untitled_project")
@@ -46,6 +62,7 @@ class ScratchPythonBuilder:
         
         # UI state variables
         self.dragging_from_list = False
+        self.drag_block_key = None
         self.drag_block_type = None
         self.drag_block_text = None
         self.drag_start_x = 0
@@ -61,13 +78,22 @@ class ScratchPythonBuilder:
         
         # Initialize components
         self.parser = PythonFileParser()
+        self.parse_cache = ParseCache()
         self.block_loader = BlockLoader()
+        self.module_introspector = ModuleIntrospector()
         self.file_handler = FileHandler(self)
+        self.package_watcher = PackageWatcher(self.block_loader)
+        self.catalog_listeners = []  # Called with {category: CategoryDiff} after packages reload
+        self.palette_categories = {}  # Category -> its node in the blocks list
+        self.help_window = None  # Built on first show, then hidden and reused
         
         # Setup UI
         self.setup_ui()
         self.setup_keybindings()
         self.setup_menu()
+        
+        # Pick up edits to package files while running
+        self.root.after(PACKAGE_POLL_MS, self.watch_packages)
     
     def setup_menu(self):
         """Setup menu bar with language selection"""
@@ -75,29 +101,36 @@ class ScratchPythonBuilder:
         
         # File menu
         file_menu = tk.Menu(menubar, tearoff=0)
-        file_menu.add_command(label=self.lang.get("new_project"), command=self.new_project)
-        file_menu.add_command(label=self.lang.get("import_project"), command=self.import_project)
-        file_menu.add_command(label=self.lang.get("save_project"), command=self.save_project)
+        add_entry = self.translations.add_menu_entry
+        add_entry(file_menu, "command", "new_project", command=self.new_project)
+        add_entry(file_menu, "command", "import_project", command=self.import_project)
+        add_entry(file_menu, "command", "save_project", command=self.save_project)
         file_menu.add_separator()
-        file_menu.add_command(label=self.lang.get("export_python"), command=self.export_python)
-        file_menu.add_command(label=self.lang.get("load_python"), command=self.load_python_file)
-        menubar.add_cascade(label=self.lang.get("project"), menu=file_menu)
+        add_entry(file_menu, "command", "export_python", command=self.export_python)
+        add_entry(file_menu, "command", "load_python", command=self.load_python_file)
+        add_entry(file_menu, "command", "load_python_folder", command=self.load_python_folder)
+        add_entry(file_menu, "command", "load_python_gui", command=self.load_python_gui)
+        file_menu.add_separator()
+        add_entry(file_menu, "command", "auto_arrange", command=self.auto_arrange)
+        add_entry(file_menu, "command", "quick_add", command=self.show_quick_add)
+        add_entry(menubar, "cascade", "project", menu=file_menu)
         
         # Language menu
         lang_menu = tk.Menu(menubar, tearoff=0)
         for lang_code in self.lang.get_all_languages():
-            lang_name = self.lang.get("english") if lang_code == 'en' else self.lang.get("chinese")
-            lang_menu.add_command(label=lang_name, 
-                                command=lambda lc=lang_code: self.change_language(lc))
-        menubar.add_cascade(label=self.lang.get("select_language"), menu=lang_menu)
+            lang_key = "english" if lang_code == 'en' else "chinese"
+            add_entry(lang_menu, "command", lang_key,
+                      command=lambda lc=lang_code: self.change_language(lc))
+        add_entry(menubar, "cascade", "select_language", menu=lang_menu)
         
         self.root.config(menu=menubar)
     
     def change_language(self, lang_code):
-        """Change application language"""
+        """Change application language, updating translated widgets in place"""
+        old_all = self.lang.get("blocks_all")
         if self.lang.set_language(lang_code):
-            # Update window title
-            self.root.title(self.lang.get("app_title"))
+            # Update window title, menus and every registered label
+            self.translations.apply()
             
             # Update project name label if it's still default
             if self.project_name in ["Untitled Project", "未命名项目"]:
@@ -105,23 +138,14 @@ class ScratchPythonBuilder:
                 if hasattr(self, 'project_name_label'):
                     self.project_name_label.config(text=self.project_name)
             
-            # Rebuild the UI to update all text
-            self.rebuild_ui()
-    
-    def rebuild_ui(self):
-        """Rebuild UI with new language"""
-        # Destroy all children except menu
-        for child in self.root.winfo_children():
-            if not isinstance(child, tk.Menu):
-                child.destroy()
-        
-        # Rebuild UI
-        self.setup_ui()
-        
-        # Redraw blocks if any exist
-        if self.blocks:
-            self.draw_all_blocks()
-            self.highlight_selected_block()
+            # The "All" category entry is translated too
+            if hasattr(self, 'category_var') and self.category_var.get() == old_all:
+                self.category_var.set(self.lang.get("blocks_all"))
+            self.update_category_dropdown()
+            
+            # The editor panel mixes translations with block data; redraw just it
+            if self.selected_block_id in self.blocks:
+                self.show_block_properties()
     
     def setup_ui(self):
         """Setup the user interface"""
@@ -146,6 +170,8 @@ class ScratchPythonBuilder:
             "<Control-o>": lambda e: self.import_project(),
             "<Control-l>": lambda e: self.load_python_file(),
             "<Control-h>": lambda e: self.show_help(),
+            "<Control-r>": lambda e: self.auto_arrange(),
+            "<Control-k>": lambda e: self.show_quick_add(),
             "<Control-a>": lambda e: self.start_connection(),
             "<Control-x>": lambda e: self.start_end_connection(),
             "<Control-w>": lambda e: self.start_continue_connection(),
@@ -200,6 +226,7 @@ class ScratchPythonBuilder:
             block.x, block.y, 
             block.x + block.width, block.y + block.height,
             fill=block.color, outline="black", width=2,
+            dash=(4, 2) if block.missing_values() else "",  # Unfilled placeholders
             tags=("block", "block_rect", block.id)
         )
         
@@ -279,6 +306,33 @@ class ScratchPythonBuilder:
         
         return line_id
     
+    def update_scrollregion(self, max_x=0, max_y=0):
+        """Grow the canvas scroll region so every block can be reached"""
+        if not hasattr(self, 'canvas'):
+            return
+        for block in self.blocks.values():
+            max_x = max(max_x, block.x + block.width)
+            max_y = max(max_y, block.y + block.height)
+        self.canvas.configure(scrollregion=(0, 0, max(2000, max_x + 200), max(2000, max_y + 200)))
+    
+    def auto_arrange(self):
+        """Lay out all blocks in layers following their connections"""
+        if not self.blocks:
+            return
+        
+        positions, (max_x, max_y) = compute_layout(
+            self.blocks, self.sequence_lines, self.end_lines, self.continue_lines
+        )
+        for block_id, (x, y) in positions.items():
+            block = self.blocks[block_id]
+            block.x, block.y = x, y
+        
+        if hasattr(self, 'canvas'):
+            self.update_scrollregion(max_x, max_y)
+            self.draw_grid()
+            self.draw_all_blocks()
+            self.highlight_selected_block()
+    
     # ===== Canvas Event Handlers =====
 
     def canvas_click(self, event):
@@ -432,8 +486,8 @@ class ScratchPythonBuilder:
             for widget in self.editor_frame.winfo_children():
                 widget.destroy()
             
-            tk.Label(self.editor_frame, text=self.lang.get("select_block"), 
-                    fg="gray").pack(expand=True)
+            self.translations.bind(tk.Label(self.editor_frame, fg="gray"),
+                                   "select_block").pack(expand=True)
     
     def highlight_selected_block(self):
         """Highlight the selected block"""
@@ -468,28 +522,74 @@ class ScratchPythonBuilder:
         # Clear treeview
         for item in self.blocks_tree.get_children():
             self.blocks_tree.delete(item)
+        self.palette_categories = {}
 
         category = self.category_var.get()
 
         # Update category dropdown values if needed
-        if hasattr(self, 'category_dropdown'):
-            categories = [self.lang.get("blocks_all")]
-            for cat in self.block_loader.available_blocks.keys():
-                categories.append(cat)
-            self.category_dropdown['values'] = categories
+        self.update_category_dropdown()
 
         if category == self.lang.get("blocks_all") or category == "All":
-            # Add all blocks by category
-            for cat_name, blocks in self.block_loader.available_blocks.items():
-                parent = self.blocks_tree.insert("", "end", text=cat_name, open=True)
-                for block in blocks:
-                    self.blocks_tree.insert(parent, "end", text=block["text"], values=(block["type"],))
+            # Add all categories collapsed; blocks are inserted when one is opened
+            for cat_name in self.block_loader.categories():
+                self.insert_palette_category(cat_name)
         else:
             # Add blocks from specific category
             if category in self.block_loader.available_blocks:
-                parent = self.blocks_tree.insert("", "end", text=category, open=True)
-                for block in self.block_loader.available_blocks.get(category, []):
-                    self.blocks_tree.insert(parent, "end", text=block["text"], values=(block["type"],))
+                self.insert_palette_category(category, open=True)
+    
+    def update_category_dropdown(self):
+        """Refresh the category dropdown values"""
+        if hasattr(self, 'category_dropdown'):
+            categories = [self.lang.get("blocks_all")]
+            for cat in self.block_loader.categories():
+                categories.append(cat)
+            self.category_dropdown['values'] = categories
+    
+    def insert_palette_category(self, category, open=False):
+        """Add a category node to the blocks list, filling it only if it starts open"""
+        parent = self.blocks_tree.insert("", "end", text=category, open=open)
+        self.palette_categories[category] = parent
+        if open:
+            self.insert_palette_blocks(parent, category)
+        elif self.block_loader.block_count(category):
+            # Placeholder so the node can be expanded; replaced on <<TreeviewOpen>>
+            self.blocks_tree.insert(parent, "end", text="...")
+        return parent
+    
+    def palette_category_filled(self, item):
+        """Check whether a category node holds its blocks rather than the "..." placeholder"""
+        children = self.blocks_tree.get_children(item)
+        return not children or self.block_loader.get_template(children[0]) is not None
+    
+    def open_blocks_category(self, event=None):
+        """Fill a palette category with its blocks the first time it is opened"""
+        item = self.blocks_tree.focus()
+        if not item or self.blocks_tree.parent(item):
+            return
+        if self.palette_category_filled(item):
+            return
+        
+        category = self.blocks_tree.item(item, "text")
+        self.blocks_tree.delete(*self.blocks_tree.get_children(item))
+        self.insert_palette_blocks(item, category)
+    
+    def insert_palette_blocks(self, parent, category, start=0):
+        """Insert a category's blocks, using each template's index key as the item ID.
+
+        Large categories are inserted PALETTE_CHUNK blocks at a time from
+        after() callbacks so the UI stays responsive.
+        """
+        blocks = self.block_loader.get_blocks(category)
+        for block in blocks[start:start + PALETTE_CHUNK]:
+            item_id = self.block_loader.item_id(category, block)
+            if not self.blocks_tree.exists(item_id):  # Duplicate templates share one item
+                self.blocks_tree.insert(parent, "end", iid=item_id,
+                                        text=block["text"], values=(block["type"],))
+        if start + PALETTE_CHUNK < len(blocks):
+            # Stop if the list was rebuilt in the meantime
+            self.root.after(1, lambda: self.blocks_tree.exists(parent) and
+                            self.insert_palette_blocks(parent, category, start + PALETTE_CHUNK))
     
     def select_block_from_list(self, event):
         """When a block is selected from the list"""
@@ -498,17 +598,45 @@ class ScratchPythonBuilder:
             
         selection = self.blocks_tree.selection()
         if selection:
-            item = self.blocks_tree.item(selection[0])
-            # Check if it's a block (not a category)
-            if item["values"]:  # Has type value
-                self.current_block_type = item["values"][0]
-                self.current_block_text = item["text"]
-                # Find the block data
-                for category, blocks in self.block_loader.available_blocks.items():
-                    for block in blocks:
-                        if block["text"] == self.current_block_text and block["type"] == self.current_block_type:
-                            self.current_block_data = block
-                            break
+            # Category nodes have no template in the index
+            block = self.block_loader.get_template(selection[0])
+            if block is not None:
+                self.current_block_type = block["type"]
+                self.current_block_text = block["text"]
+                self.current_block_data = block
+    
+    def add_block_from_template(self, item_id, x, y):
+        """Create a canvas block from a palette template at a grid-snapped position"""
+        block = self.block_loader.get_template(item_id)
+        
+        # Snap to grid
+        x = (x // 20) * 20
+        y = (y // 20) * 20
+        
+        # Create block ID
+        block_id = f"block_{self.block_counter}"
+        
+        # Create block
+        new_block = CodeBlock(
+            block_id,
+            block["type"],
+            x, y,
+            text=block["text"],
+            content=block["content"]
+        )
+        # Placeholders were compiled when the package was loaded
+        new_block.use_template(self.block_loader.get_descriptor(item_id).compiled)
+        
+        # Add to blocks dictionary
+        self.blocks[block_id] = new_block
+        self.block_counter += 1
+        
+        # Draw block on canvas
+        self.draw_block(new_block)
+        
+        # Select the new block
+        self.select_block(block_id)
+        return new_block
     
     def add_block_from_list(self, event):
         """Add a block from the list to the canvas on double-click"""
@@ -519,56 +647,34 @@ class ScratchPythonBuilder:
         if not selection:
             return
         
-        item = self.blocks_tree.item(selection[0])
         # Check if it's a block (not a category)
-        if not item["values"]:
+        if self.block_loader.get_template(selection[0]) is None:
             return
         
-        # Find the block data
-        block_text = item["text"]
-        block_type = item["values"][0]
+        # Place at center of visible canvas
+        x, y = self.canvas_center()
+        self.add_block_from_template(selection[0], x, y)
+    
+    def canvas_center(self):
+        """Return the canvas coordinates of the center of the visible area"""
+        canvas_width = self.canvas.winfo_width()
+        canvas_height = self.canvas.winfo_height()
         
-        for category, blocks in self.block_loader.available_blocks.items():
-            for block in blocks:
-                if block["text"] == block_text and block["type"] == block_type:
-                    # Place at center of visible canvas
-                    canvas_width = self.canvas.winfo_width()
-                    canvas_height = self.canvas.winfo_height()
-                    
-                    if canvas_width > 1 and canvas_height > 1:
-                        # Get center of visible area
-                        x = self.canvas.canvasx(canvas_width // 2)
-                        y = self.canvas.canvasy(canvas_height // 2)
-                    else:
-                        # Default position
-                        x, y = 100, 100
-                    
-                    # Snap to grid
-                    x = (x // 20) * 20
-                    y = (y // 20) * 20
-                    
-                    # Create block ID
-                    block_id = f"block_{self.block_counter}"
-                    
-                    # Create block
-                    new_block = CodeBlock(
-                        block_id,
-                        block["type"],
-                        x, y,
-                        text=block["text"],
-                        content=block["content"]
-                    )
-                    
-                    # Add to blocks dictionary
-                    self.blocks[block_id] = new_block
-                    self.block_counter += 1
-                    
-                    # Draw block on canvas
-                    self.draw_block(new_block)
-                    
-                    # Select the new block
-                    self.select_block(block_id)
-                    return
+        if canvas_width > 1 and canvas_height > 1:
+            # Get center of visible area
+            x = self.canvas.canvasx(canvas_width // 2)
+            y = self.canvas.canvasy(canvas_height // 2)
+        else:
+            # Default position
+            x, y = 100, 100
+        return x, y
+    
+    def show_quick_add(self):
+        """Open the quick-add palette to search for a block and drop it on the canvas"""
+        if not hasattr(self, 'canvas'):
+            return
+        from ui.quick_add import show_quick_add
+        show_quick_add(self)
     
     def start_drag_from_list(self, event):
         """Start dragging from the blocks list"""
@@ -579,12 +685,13 @@ class ScratchPythonBuilder:
         if not selection:
             return
         
-        item = self.blocks_tree.item(selection[0])
         # Check if it's a block (not a category)
-        if item["values"]:  # Has type value
+        block = self.block_loader.get_template(selection[0])
+        if block is not None:
             self.dragging_from_list = True
-            self.drag_block_type = item["values"][0]
-            self.drag_block_text = item["text"]
+            self.drag_block_key = selection[0]
+            self.drag_block_type = block["type"]
+            self.drag_block_text = block["text"]
             self.drag_start_x = event.x
             self.drag_start_y = event.y
     
@@ -630,38 +737,8 @@ class ScratchPythonBuilder:
             x = self.canvas.canvasx(mouse_x - canvas_x)
             y = self.canvas.canvasy(mouse_y - canvas_y)
             
-            # Snap to grid
-            x = (x // 20) * 20
-            y = (y // 20) * 20
-            
-            # Find the block data
-            for category, blocks in self.block_loader.available_blocks.items():
-                for block in blocks:
-                    if (block["text"] == self.drag_block_text and 
-                        block["type"] == self.drag_block_type):
-                        
-                        # Create block ID
-                        block_id = f"block_{self.block_counter}"
-                        
-                        # Create block
-                        new_block = CodeBlock(
-                            block_id,
-                            block["type"],
-                            x, y,
-                            text=block["text"],
-                            content=block["content"]
-                        )
-                        
-                        # Add to blocks dictionary
-                        self.blocks[block_id] = new_block
-                        self.block_counter += 1
-                        
-                        # Draw block on canvas
-                        self.draw_block(new_block)
-                        
-                        # Select the new block
-                        self.select_block(block_id)
-                        break
+            if self.block_loader.get_template(self.drag_block_key) is not None:
+                self.add_block_from_template(self.drag_block_key, x, y)
     
     # ===== Block Editor Methods =====
     
@@ -700,18 +777,53 @@ class ScratchPythonBuilder:
         # Block content editor
         tk.Label(editor_content, text=self.lang.get("content")).grid(row=1, column=0, sticky="w", pady=5)
         
-        content_text = tk.Text(editor_content, height=8, width=45)
+        content_frame = tk.Frame(editor_content)
+        content_frame.grid(row=2, column=0, columnspan=2, pady=5, sticky="ew")
+        
+        content_text = tk.Text(content_frame, height=8, width=45)
         content_text.insert("1.0", block.content)
-        content_text.grid(row=2, column=0, columnspan=2, pady=5, sticky="ew")
+        content_text.pack(fill="x")
+        
+        # One field per placeholder of the compiled template
+        field_entries = {}
+        if block.template is not None and block.template.fields:
+            fields_frame = tk.LabelFrame(content_frame, text=self.lang.get("placeholders"))
+            fields_frame.pack(fill="x", pady=(5, 0))
+            fields_frame.grid_columnconfigure(1, weight=1)
+            for row, (name, kind) in enumerate(block.template.fields):
+                tk.Label(fields_frame, text=f"{name} ({kind})").grid(row=row, column=0, sticky="w", padx=2, pady=2)
+                entry = tk.Entry(fields_frame)
+                entry.insert(0, block.values.get(name, ""))
+                entry.grid(row=row, column=1, sticky="ew", padx=2, pady=2)
+                field_entries[name] = (kind, entry)
         
         def update_content():
-            block.content = content_text.get("1.0", tk.END).strip()
+            errors = []
+            for name, (kind, entry) in field_entries.items():
+                value = entry.get().strip()
+                error = validate_field(kind, value) if value else None
+                if error:
+                    errors.append(f"{name}: {error}")
+                elif value:
+                    block.values[name] = value
+                else:
+                    block.values.pop(name, None)
+            if errors:
+                messagebox.showerror("Invalid Value", "\n".join(errors))
+                return
+            
+            old_template = block.template
+            block.set_content(content_text.get("1.0", tk.END).strip())
             # Update block text if it's a simple statement
-            if "{" not in block.content and len(block.content) < 30:
-                block.text = block.content
+            code = block.get_code()
+            if not block.missing_values() and len(code) < 30:
+                block.text = code
             # Redraw block
             self.draw_all_blocks()
             self.highlight_selected_block()
+            if block.template is not old_template:
+                # Placeholders changed, rebuild the field form
+                self.show_block_properties()
         
         tk.Button(editor_content, text=self.lang.get("update"), command=update_content).grid(row=3, column=0, columnspan=2, pady=10, sticky="ew")
         
@@ -1167,6 +1279,8 @@ class ScratchPythonBuilder:
             original.text, original.content
         )
         new_block.color = original.color
+        new_block.template = original.template
+        new_block.values = dict(original.values)
         
         # Add to blocks
         self.blocks[new_id] = new_block
@@ -1238,6 +1352,22 @@ class ScratchPythonBuilder:
             messagebox.showwarning("No Blocks", "There are no blocks to export.")
             return
         
+        # Flag blocks whose placeholders were never filled in
+        unfilled = [block for block in self.blocks.values() if block.missing_values()]
+        if unfilled:
+            details = "\n".join(
+                f"• {block.text}: " + ", ".join(f"{{{name}}}" for name in block.missing_values())
+                for block in unfilled[:10]
+            )
+            if len(unfilled) > 10:
+                details += f"\n... and {len(unfilled) - 10} more"
+            if not messagebox.askyesno(
+                "Unfilled Placeholders",
+                f"{len(unfilled)} block(s) still have unfilled placeholders:\n{details}\n\nExport anyway?"
+            ):
+                self.select_block(unfilled[0].id)
+                return
+        
         # Generate Python code with proper indentation
         python_code = self.generate_python_code_with_indentation()
         
@@ -1275,7 +1405,7 @@ class ScratchPythonBuilder:
         
         try:
             # Parse the Python file
-            result = self.parser.parse_gui_python_file(filename)
+            result = self.parser.parse_gui_python_file(filename, cache=self.parse_cache)
             
             if 'error' in result:
                 messagebox.showerror("Parse Error", f"Could not parse Python file: {result['error']}")
@@ -1290,25 +1420,9 @@ class ScratchPythonBuilder:
             if hasattr(self, 'project_name_label'):
                 self.project_name_label.config(text=self.project_name)
             
-            # Get metadata
-            metadata = result.get('metadata', {})
-            imports = result.get('imports', [])
-            class_info = result.get('class_info', {})
-            
-            # Create blocks for imports
-            x, y = 100, 100
-            for imp in imports:
-                block_id = f"block_{self.block_counter}"
-                block = CodeBlock(
-                    block_id,
-                    "import",
-                    x, y,
-                    text="Import",
-                    content=imp
-                )
-                self.blocks[block_id] = block
-                self.block_counter += 1
-                y += 80
+            # Create blocks for every statement in the file
+            self.add_block_graph(result['graph'])
+            self.auto_arrange()
             
             # Show success message
             messagebox.showinfo("Load Successful", 
@@ -1317,6 +1431,167 @@ class ScratchPythonBuilder:
         except Exception as e:
             messagebox.showerror("Load Error", f"Could not load Python file: {e}")
     
+    def load_python_gui(self):
+        """Rebuild the widgets of a Tkinter file as gui blocks"""
+        filename = filedialog.askopenfilename(
+            defaultextension=".py",
+            filetypes=[("Python Files", "*.py"), ("All Files", "*.*")]
+        )
+        
+        if not filename:
+            return
+        
+        result = self.parser.parse_gui_layout_file(filename)
+        if 'error' in result:
+            messagebox.showerror("Parse Error", f"Could not parse Python file: {result['error']}")
+            return
+        if not result['widgets']:
+            messagebox.showinfo("No Widgets", "No Tkinter widgets were found in this file.")
+            return
+        
+        # Clear current project
+        self.new_project()
+        self.project_name = os.path.splitext(os.path.basename(filename))[0]
+        if hasattr(self, 'project_name_label'):
+            self.project_name_label.config(text=self.project_name)
+        
+        self.add_block_graph(build_gui_graph(result['widgets'], result['layouts'], result['setup']))
+        if hasattr(self, 'canvas'):
+            self.update_scrollregion()
+            self.draw_grid()
+            self.draw_all_blocks()
+        
+        messagebox.showinfo("Load Successful", 
+                          f"Rebuilt {len(result['widgets'])} widget(s) as GUI blocks.")
+    
+    def load_python_folder(self):
+        """Load every Python file in a folder, parsing them on all cores"""
+        folder = filedialog.askdirectory(title="Select Python Folder")
+        if not folder:
+            return
+        
+        importer = FolderImporter(folder, cache=self.parse_cache)
+        if not importer.paths:
+            messagebox.showinfo("No Python Files", f"No .py files were found in {folder}")
+            return
+        
+        # Clear current project
+        self.new_project()
+        self.project_name = os.path.basename(os.path.normpath(folder))
+        if hasattr(self, 'project_name_label'):
+            self.project_name_label.config(text=self.project_name)
+        
+        # Progress window with cancel
+        progress_window = tk.Toplevel(self.root)
+        progress_window.title(self.lang.get("load_python_folder"))
+        progress_window.geometry("400x120")
+        progress_window.transient(self.root)
+        
+        status_label = tk.Label(progress_window, text=f"0 / {len(importer.paths)}")
+        status_label.pack(pady=(15, 5))
+        progress_bar = ttk.Progressbar(progress_window, maximum=len(importer.paths), length=360)
+        progress_bar.pack(padx=20)
+        tk.Button(progress_window, text="Cancel", width=12,
+                  command=importer.cancel).pack(pady=10)
+        progress_window.protocol("WM_DELETE_WINDOW", importer.cancel)
+        
+        state = {"done": 0, "errors": [], "next_x": 100}
+        importer.start()
+        
+        def poll():
+            # Handle a bounded number of modules per tick to keep the UI responsive
+            for _ in range(20):
+                try:
+                    path, result = importer.results.get_nowait()
+                except queue.Empty:
+                    break
+                
+                if path is None:
+                    progress_window.destroy()
+                    self.update_scrollregion()
+                    self.draw_grid()
+                    message = f"Loaded {state['done'] - len(state['errors'])} of {len(importer.paths)} Python file(s)."
+                    if importer.cancelled:
+                        message += "\nImport was cancelled."
+                    if state["errors"]:
+                        message += "\n\nCould not parse:\n" + "\n".join(state["errors"][:10])
+                    messagebox.showinfo("Load Finished", message)
+                    return
+                
+                state["done"] += 1
+                if 'error' in result:
+                    state["errors"].append(f"{os.path.relpath(path, folder)}: {result['error']}")
+                else:
+                    state["next_x"] = self.add_module_group(
+                        os.path.relpath(path, folder), result['graph'], state["next_x"]
+                    )
+            
+            progress_bar["value"] = state["done"]
+            status_label.config(text=f"{state['done']} / {len(importer.paths)}")
+            self.root.after(50, poll)
+        
+        self.root.after(50, poll)
+    
+    def add_module_group(self, module_name, graph, origin_x):
+        """Add one module's graph under a label block, lay it out and draw it.
+
+        Returns the x coordinate where the next group can start.
+        """
+        label_id = f"block_{self.block_counter}"
+        self.block_counter += 1
+        label_text = module_name if len(module_name) < 30 else os.path.basename(module_name)
+        self.blocks[label_id] = CodeBlock(label_id, "statement", origin_x, 100,
+                                          text=label_text, content=f"# {module_name}")
+        
+        block_ids = [label_id] + self.add_block_graph(graph)
+        if len(block_ids) > 1:
+            self.blocks[label_id].connections.append(block_ids[1])
+            self.blocks[block_ids[1]].prev_connections.append(label_id)
+            self.sequence_lines.append((label_id, block_ids[1]))
+        
+        # Connections of this group only, so the cost does not grow with the project
+        group = {bid: self.blocks[bid] for bid in block_ids}
+        sequence = [(bid, conn) for bid, block in group.items() for conn in block.connections]
+        end = [(bid, block.end_connection) for bid, block in group.items() if block.end_connection]
+        continued = [(bid, block.continue_connection) for bid, block in group.items()
+                     if block.continue_connection]
+        
+        positions, (max_x, _) = compute_layout(group, sequence, end, continued, origin_x=origin_x)
+        for block_id, (x, y) in positions.items():
+            group[block_id].x, group[block_id].y = x, y
+        
+        if hasattr(self, 'canvas'):
+            for block in group.values():
+                self.draw_block(block)
+            for lines, color in ((sequence, "black"), (end, "red"), (continued, "blue")):
+                for start_id, end_id in lines:
+                    self.draw_connection(start_id, end_id, color)
+        
+        return (max_x + GROUP_GAP) // 20 * 20
+    
+    def add_block_graph(self, graph):
+        """Add an imported block graph to the project, renumbering its block IDs"""
+        id_map = {}
+        for block_data in graph["blocks"]:
+            id_map[block_data["id"]] = f"block_{self.block_counter}"
+            self.block_counter += 1
+        
+        for block_data in graph["blocks"]:
+            block = CodeBlock.from_dict(block_data)
+            block.id = id_map[block.id]
+            block.connections = [id_map[bid] for bid in block.connections]
+            block.prev_connections = [id_map[bid] for bid in block.prev_connections]
+            if block.end_connection:
+                block.end_connection = id_map[block.end_connection]
+            if block.continue_connection:
+                block.continue_connection = id_map[block.continue_connection]
+            self.blocks[block.id] = block
+        
+        self.sequence_lines.extend((id_map[s], id_map[e]) for s, e in graph["sequence_lines"])
+        self.end_lines.extend((id_map[c], id_map[e]) for c, e in graph["end_lines"])
+        self.continue_lines.extend((id_map[s], id_map[e]) for s, e in graph["continue_lines"])
+        return [id_map[block_data["id"]] for block_data in graph["blocks"]]
+    
     def generate_python_code_with_indentation(self):
         """Generate Python code with proper indentation"""
         # Build connection maps
@@ -1396,7 +1671,7 @@ class ScratchPythonBuilder:
                     break
             
             # Get the block's content with current indentation
-            content_lines = block.content.split('\n')
+            content_lines = block.get_code().split('\n')
             
             if is_continue:
                 # For continue blocks, add to the last line
@@ -1467,7 +1742,7 @@ class ScratchPythonBuilder:
         # Add any unvisited blocks
         for block_id, block in self.blocks.items():
             if block_id not in visited:
-                code_lines.append(block.content)
+                code_lines.append(block.get_code())
         
         return "\n".join(code_lines)
     
@@ -1538,12 +1813,13 @@ class ScratchPythonBuilder:
         scrollbar.config(command=text_widget.yview)
 
     def import_package(self):
-        """Import a package JSON file and add its blocks"""
-        # Ask for JSON file
+        """Import a package JSON (or JSON Lines) file and add its blocks"""
+        # Ask for package file
         filename = filedialog.askopenfilename(
             defaultextension=".json",
-            filetypes=[("JSON Files", "*.json"), ("All Files", "*.*")],
-            title="Select Package JSON File"
+            filetypes=[("Package Files", "*.json *.jsonl"), ("JSON Files", "*.json"),
+                       ("JSON Lines Files", "*.jsonl"), ("All Files", "*.*")],
+            title="Select Package File"
         )
 
         if not filename:
@@ -1551,7 +1827,7 @@ class ScratchPythonBuilder:
 
         try:
             # Ask user for category name (default is filename without extension)
-            default_category = os.path.basename(filename).replace('.json', '')
+            default_category = os.path.splitext(os.path.basename(filename))[0]
             category_name = simpledialog.askstring(
                 "Package Category",
                 f"Enter category name for this package:",
@@ -1562,31 +1838,32 @@ class ScratchPythonBuilder:
                 return
 
             # 改进2: 使用BlockLoader的新方法导入包
-            added_count, actual_category = self.block_loader.add_custom_package(filename, category_name)
-
-            if added_count > 0:
-                # Update blocks list
-                self.update_blocks_list()
-
-                # Update category dropdown if it exists
-                if hasattr(self, 'category_dropdown'):
-                    # Refresh category list
-                    categories = [self.lang.get("blocks_all")]
-                    for category in self.block_loader.available_blocks.keys():
-                        categories.append(category)
-                    self.category_dropdown['values'] = categories
-
-                    # Show success message
-                    messagebox.showinfo(
-                        "Package Imported",
-                        f"Successfully imported {added_count} block(s).\n"
-                        f"Added to category: '{actual_category}'"
-                    )
-                else:
-                    messagebox.showinfo(
-                        "No New Blocks",
-                        "No new blocks were added. All blocks already exist."
-                    )
+            report, actual_category = self.block_loader.add_custom_package(filename, category_name)
+
+            details = ""
+            if report.skipped:
+                details += f"\nSkipped {len(report.skipped)} duplicate block(s)."
+            if report.conflicts:
+                names = ", ".join(str(block.get("text")) for block, _ in report.conflicts[:5])
+                if len(report.conflicts) > 5:
+                    names += ", ..."
+                details += (f"\n{len(report.conflicts)} block(s) kept their existing definition: {names}")
+
+            if report.added:
+                # Insert the new blocks into the lists without rebuilding them
+                self.apply_catalog_diffs(report.diffs)
+
+                # Show success message
+                messagebox.showinfo(
+                    "Package Imported",
+                    f"Successfully imported {len(report.added)} block(s).\n"
+                    f"Added to category: '{actual_category}'" + details
+                )
+            else:
+                messagebox.showinfo(
+                    "No New Blocks",
+                    "No new blocks were added. All blocks already exist." + details
+                )
 
         except Exception as e:
             messagebox.showerror(
@@ -1594,6 +1871,116 @@ class ScratchPythonBuilder:
                 f"Could not import package:\n{str(e)}"
             )
     
+    def watch_packages(self):
+        """Reload package files that changed on disk and patch the blocks list in place"""
+        changed = self.package_watcher.poll()
+        if changed:
+            diffs, errors = self.block_loader.reload_packages(changed)
+            for path, error in errors.items():
+                print(f"Error reloading package {path}: {error}")
+            if diffs:
+                self.apply_catalog_diffs(diffs)
+        self.root.after(PACKAGE_POLL_MS, self.watch_packages)
+
+    def apply_catalog_diffs(self, diffs):
+        """Apply per-category insert/update/delete operations to the blocks list.
+
+        Categories that are collapsed and not filled yet are left alone; they
+        show the current blocks once they are opened.
+        """
+        for listener in list(self.catalog_listeners):
+            listener(diffs)
+        if not hasattr(self, 'blocks_tree'):
+            return
+
+        self.update_category_dropdown()
+        show_all = self.category_var.get() in (self.lang.get("blocks_all"), "All")
+        for category, diff in diffs.items():
+            parent = self.palette_categories.get(category)
+            if diff.removed:
+                if parent is not None:
+                    self.blocks_tree.delete(parent)
+                    del self.palette_categories[category]
+                if self.category_var.get() == category:
+                    self.category_var.set(self.lang.get("blocks_all"))
+                    self.update_blocks_list()
+                continue
+            if parent is None:
+                if diff.added and show_all:
+                    self.insert_palette_category(category)
+                continue
+            if not self.palette_category_filled(parent):
+                # Blocks are listed when the category is first opened
+                continue
+
+            for item_id in diff.deleted:
+                if self.blocks_tree.exists(item_id):
+                    self.blocks_tree.delete(item_id)
+            for item_id in diff.updated:
+                block = self.block_loader.get_template(item_id)
+                if self.blocks_tree.exists(item_id):
+                    self.blocks_tree.item(item_id, text=block["text"], values=(block["type"],))
+            for index, item_id in diff.inserted:
+                block = self.block_loader.get_template(item_id)
+                if self.blocks_tree.exists(item_id):
+                    self.blocks_tree.move(item_id, parent, index)
+                else:
+                    self.blocks_tree.insert(parent, index, iid=item_id,
+                                            text=block["text"], values=(block["type"],))
+
+    def generate_package(self):
+        """Generate a package from an installed module's public callables"""
+        module_name = simpledialog.askstring(
+            self.lang.get("generate_package"),
+            "Enter the name of an installed module (e.g. os, math):"
+        )
+        if not module_name or not module_name.strip():
+            return
+        module_name = module_name.strip()
+
+        # Looking up the installed version and importing the module can be
+        # slow, so both run off the UI thread (a cached package is reused)
+        results = queue.Queue()
+
+        def work():
+            try:
+                results.put((self.module_introspector.generate(module_name), None))
+            except Exception as e:
+                results.put((None, e))
+
+        def poll():
+            try:
+                path, error = results.get_nowait()
+            except queue.Empty:
+                self.root.after(100, poll)
+                return
+            self.root.config(cursor="")
+            if error is not None:
+                messagebox.showerror(
+                    "Generate Error",
+                    f"Could not generate a package for '{module_name}':\n{error}"
+                )
+            else:
+                self.add_generated_package(module_name, path)
+
+        self.root.config(cursor="watch")
+        threading.Thread(target=work, daemon=True).start()
+        self.root.after(100, poll)
+
+    def add_generated_package(self, module_name, path):
+        """Register a generated package as a custom package"""
+        try:
+            report, category = self.block_loader.add_custom_package(path, module_name)
+        except Exception as e:
+            messagebox.showerror("Generate Error", str(e))
+            return
+        self.apply_catalog_diffs(report.diffs)
+        messagebox.showinfo(
+            "Package Generated",
+            f"Added {len(report.added)} block(s) for '{module_name}' "
+            f"to category: '{category}'"
+        )
+    
     # ===== Help Methods =====
     
     def show_help(self):
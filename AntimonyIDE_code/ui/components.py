@@ -26,42 +26,42 @@ def create_top_section(app):
     buttons_frame.grid(row=0, column=2, padx=10, pady=10, sticky="e")
     
     # Create buttons
-    tk.Button(buttons_frame, text=app.lang.get("new_project"), 
-              command=app.new_project, width=12).grid(row=0, column=0, padx=2)
-    tk.Button(buttons_frame, text=app.lang.get("import"), 
-              command=app.import_project, width=12).grid(row=0, column=1, padx=2)
-    tk.Button(buttons_frame, text=app.lang.get("save"), 
-              command=app.save_project, width=12).grid(row=0, column=2, padx=2)
-    tk.Button(buttons_frame, text=app.lang.get("export"), 
-              command=app.export_python, width=12).grid(row=0, column=3, padx=2)
+    bind = app.translations.bind
+    bind(tk.Button(buttons_frame, command=app.new_project, width=12),
+         "new_project").grid(row=0, column=0, padx=2)
+    bind(tk.Button(buttons_frame, command=app.import_project, width=12),
+         "import").grid(row=0, column=1, padx=2)
+    bind(tk.Button(buttons_frame, command=app.save_project, width=12),
+         "save").grid(row=0, column=2, padx=2)
+    bind(tk.Button(buttons_frame, command=app.export_python, width=12),
+         "export").grid(row=0, column=3, padx=2)
     
     # New button: Load Python File
-    tk.Button(buttons_frame, text=app.lang.get("load_python"), 
-              command=app.load_python_file, width=12, 
-              bg="#FF5722", fg="white").grid(row=0, column=4, padx=2)
+    bind(tk.Button(buttons_frame, command=app.load_python_file, width=12, 
+                   bg="#FF5722", fg="white"), "load_python").grid(row=0, column=4, padx=2)
     
     # Help button
-    tk.Button(buttons_frame, text=app.lang.get("help"), 
-              command=app.show_help, width=12, 
-              bg="#4CAF50", fg="white").grid(row=0, column=5, padx=2)
+    bind(tk.Button(buttons_frame, command=app.show_help, width=12, 
+                   bg="#4CAF50", fg="white"), "help").grid(row=0, column=5, padx=2)
 
 
 def create_left_section(app):
     """Create the left section with blocks list"""
-    left_frame = tk.LabelFrame(app.root, text=app.lang.get("code_blocks"), padx=10, pady=10)
+    bind = app.translations.bind
+    left_frame = bind(tk.LabelFrame(app.root, padx=10, pady=10), "code_blocks")
     left_frame.grid(row=1, column=0, sticky="nsew", padx=5, pady=5)
 
     # Category selection
     category_frame = tk.Frame(left_frame)
     category_frame.pack(fill="x", pady=(0, 5))
 
-    tk.Label(category_frame, text=app.lang.get("category")).pack(side="left", padx=(0, 5))
+    bind(tk.Label(category_frame), "category").pack(side="left", padx=(0, 5))
 
     app.category_var = tk.StringVar(value=app.lang.get("blocks_all"))
 
     # Get categories from available blocks
     categories = [app.lang.get("blocks_all")]
-    for category in app.block_loader.available_blocks.keys():
+    for category in app.block_loader.categories():
         # Use the category name directly for now
         categories.append(category)
 
@@ -71,8 +71,12 @@ def create_left_section(app):
     app.category_dropdown.bind("<<ComboboxSelected>>", lambda e: app.update_blocks_list())
 
     # Import package button
-    tk.Button(category_frame, text=app.lang.get("import_package"),
-              command=app.import_package, width=12).pack(side="right", padx=(5, 0))
+    bind(tk.Button(category_frame, command=app.import_package, width=12),
+         "import_package").pack(side="right", padx=(5, 0))
+
+    # Generate package button
+    bind(tk.Button(category_frame, command=app.generate_package, width=12),
+         "generate_package").pack(side="right", padx=(5, 0))
 
     # ... rest of the code remains the same ...
     
@@ -100,6 +104,7 @@ def create_left_section(app):
     # Bind selection event
     app.blocks_tree.bind("<<TreeviewSelect>>", app.select_block_from_list)
     app.blocks_tree.bind("<Double-1>", app.add_block_from_list)
+    app.blocks_tree.bind("<<TreeviewOpen>>", app.open_blocks_category)
 
     # Bind drag events for treeview
     app.blocks_tree.bind("<ButtonPress-1>", app.start_drag_from_list)
@@ -110,12 +115,12 @@ def create_left_section(app):
     app.update_blocks_list()
 
     # Instructions
-    tk.Label(left_frame, text=app.lang.get("drag_to_canvas"),
-             fg="gray", justify="center").pack(pady=5)
+    bind(tk.Label(left_frame, fg="gray", justify="center"),
+         "drag_to_canvas").pack(pady=5)
 
 def create_middle_section(app):
     """Create the middle section with design canvas"""
-    middle_frame = tk.LabelFrame(app.root, text=app.lang.get("workspace"), padx=10, pady=10)
+    middle_frame = app.translations.bind(tk.LabelFrame(app.root, padx=10, pady=10), "workspace")
     middle_frame.grid(row=1, column=1, sticky="nsew", padx=5, pady=5)
     
     # Canvas with scrollbars
@@ -157,12 +162,12 @@ def create_middle_section(app):
 
 def create_right_section(app):
     """Create the right section with block editor"""
-    app.right_frame = tk.LabelFrame(app.root, text=app.lang.get("block_editor"), padx=10, pady=10)
+    app.right_frame = app.translations.bind(tk.LabelFrame(app.root, padx=10, pady=10), "block_editor")
     app.right_frame.grid(row=1, column=2, sticky="nsew", padx=5, pady=5)
     
     # Initially empty - will be populated when block is selected
     app.editor_frame = tk.Frame(app.right_frame)
     app.editor_frame.pack(fill="both", expand=True)
     
-    tk.Label(app.editor_frame, text=app.lang.get("select_block"), 
-            fg="gray").pack(expand=True)
\ No newline at end of file
+    app.translations.bind(tk.Label(app.editor_frame, fg="gray"),
+                          "select_block").pack(expand=True)
\ No newline at end of file
@@ -1,12 +1,77 @@
 import tkinter as tk
 from tkinter import ttk
+import bisect
 import json
 import os
-import glob
+
+from utils.search_worker import SearchWorker
+
+# Milliseconds to wait after the last keystroke before searching
+SEARCH_DEBOUNCE_MS = 150
+# How often to check for finished searches
+SEARCH_POLL_MS = 20
+# Result rows inserted per Tk idle tick
+ROWS_PER_TICK = 200
+
+
+def row_key(descriptor):
+    """Sort key of a listed block: category, then name"""
+    return (descriptor.category, descriptor.text)
+
+
+def listed_item_ids(block_loader, selected_category, categories=None):
+    """Item IDs a listing of selected_category shows for categories (default: all), unsorted.
+
+    Categories still pending are loaded.
+    """
+    if categories is None:
+        categories = block_loader.categories()
+    return [block_loader.item_id(category, block)
+            for category in categories if selected_category in ("All", category)
+            for block in block_loader.get_blocks(category)]
+
+
+def diff_rows(diffs, selected_category):
+    """Split reload diffs into (item IDs to delete, item IDs to insert or replace) for a listing"""
+    deleted, changed = [], []
+    for category, diff in diffs.items():
+        deleted.extend(diff.deleted)
+        if diff.removed or selected_category not in ("All", category):
+            continue
+        changed.extend(diff.updated)
+        changed.extend(item_id for _, item_id in diff.inserted)
+    return deleted, changed
+
+
+def plan_sorted_inserts(keys, rows):
+    """Return (index, item ID) inserts that keep a sorted listing sorted.
+
+    keys are the sort keys of the listed rows, in order, and rows are
+    (key, item ID) pairs; each index applies after the inserts before it.
+    keys is updated in place.
+    """
+    inserts = []
+    for key, item_id in rows:
+        index = bisect.bisect(keys, key)
+        keys.insert(index, key)
+        inserts.append((index, item_id))
+    return inserts
 
 def show_help_window(app):
-    """Show improved help window with block information"""
+    """Show the help window, building it the first time.
+
+    Closing only hides the window; when it is shown again its lists are
+    brought up to date if the block catalog changed in the meantime.
+    """
+    if app.help_window is None or not app.help_window.winfo_exists():
+        app.help_window = build_help_window(app)
+    app.help_window.show()
+
+
+def build_help_window(app):
+    """Build the (hidden) help window with block information"""
     help_window = tk.Toplevel(app.root)
+    help_window.withdraw()
     help_window.title("Antimony IDE - Code Blocks Help")
     help_window.geometry("1100x750")
     help_window.configure(bg="#f5f5f5")
@@ -50,6 +115,8 @@ def show_help_window(app):
     1. ADDING BLOCKS:
        • Double-click a block in the left panel to add it to canvas
        • Drag blocks from the left panel to the canvas
+       • Ctrl+K: type part of a block name (typos are fine) and press
+         Enter to drop the best match in the middle of the canvas
        • Right-click on canvas to access context menu
     
     2. CONNECTING BLOCKS:
@@ -61,6 +128,8 @@ def show_help_window(app):
     3. EDITING BLOCKS:
        • Click a block to select it
        • Edit content in the right panel
+       • Fill in {placeholders} in the Placeholders form; blocks with
+         empty placeholders have a dashed outline and are flagged on export
        • Change colors with "Choose" button
        • Delete with Ctrl+Q (without confirmation)
     
@@ -71,6 +140,8 @@ def show_help_window(app):
        • Ctrl+O: Import project
        • Ctrl+L: Load Python file
        • Ctrl+H: Show this help
+       • Ctrl+R: Auto-arrange blocks
+       • Ctrl+K: Quick add block
        • Ctrl+Q: Delete selected block (without confirmation)
        • Ctrl+A: Toggle sequence connection
        • Ctrl+X: Toggle end connection
@@ -116,7 +187,7 @@ def show_help_window(app):
             font=("Arial", 10)).pack(side=tk.LEFT, padx=(20, 10))
     
     category_var = tk.StringVar(value="All")
-    categories = ["All"] + sorted(list(app.block_loader.available_blocks.keys()))
+    categories = ["All"] + sorted(app.block_loader.categories())
     category_menu = ttk.Combobox(search_frame, textvariable=category_var, 
                                  values=categories, state="readonly", width=15)
     category_menu.pack(side=tk.LEFT, padx=(0, 10))
@@ -158,107 +229,156 @@ def show_help_window(app):
     tree_frame.grid_rowconfigure(0, weight=1)
     tree_frame.grid_columnconfigure(0, weight=1)
     
+    # Searches run on a worker thread; state of the pending Tk callbacks
+    searcher = SearchWorker(app.block_loader.search_index)
+    pending = {"debounce": None, "poll": None, "fill": None}
+    
+    def cancel_pending(name):
+        if pending[name] is not None:
+            help_window.after_cancel(pending[name])
+            pending[name] = None
+    
+    def insert_row(index, item_id, descriptor):
+        tree.insert("", index, iid=item_id,
+                    text=descriptor.text,
+                    values=(
+                        descriptor.category,
+                        descriptor.type,
+                        descriptor.display,
+                        descriptor.description,
+                        descriptor.usage
+                    ))
+    
+    def show_rows(item_ids, start=0):
+        """Replace the listed blocks, inserting ROWS_PER_TICK rows per after() tick"""
+        if start == 0:
+            cancel_pending("fill")
+            tree.delete(*tree.get_children())
+        for item_id in item_ids[start:start + ROWS_PER_TICK]:
+            descriptor = app.block_loader.get_descriptor(item_id)
+            if descriptor is not None and not tree.exists(item_id):  # Skip blocks removed by a reload
+                insert_row("end", item_id, descriptor)
+        if start + ROWS_PER_TICK < len(item_ids):
+            pending["fill"] = help_window.after(1, show_rows, item_ids, start + ROWS_PER_TICK)
+        else:
+            pending["fill"] = None
+    
     # Load blocks into treeview
     def load_blocks():
-        """Load all blocks into the treeview"""
-        # Clear existing items
-        for item in tree.get_children():
-            tree.delete(item)
-        
-        # Get selected category
-        selected_category = category_var.get()
-        
-        # Get all blocks
-        all_blocks = []
-        for category, blocks in app.block_loader.available_blocks.items():
-            if selected_category == "All" or category == selected_category:
-                for block in blocks:
-                    block["category"] = category
-                    # Add usage notes if available (from template or content)
-                    if "template" in block and block["template"] != block.get("content", ""):
-                        block["usage"] = f"Template: {block['template']}"
-                    else:
-                        block["usage"] = "Double-click to use"
-                    all_blocks.append(block)
+        """Load all blocks of the selected category, sorted by category and name"""
+        searcher.cancel()
+        cancel_pending("debounce")
+        item_ids = listed_item_ids(app.block_loader, category_var.get())
         
         # Sort blocks by category and name
-        all_blocks.sort(key=lambda x: (x["category"], x.get("text", "")))
-        
-        # Add to treeview
-        for block in all_blocks:
-            tree.insert("", "end", 
-                      text=block.get("text", "Unknown"),
-                      values=(
-                          block.get("category", ""),
-                          block.get("type", ""),
-                          block.get("template", block.get("content", "")),
-                          block.get("description", ""),
-                          block.get("usage", "")
-                      ))
+        item_ids.sort(key=lambda item_id: row_key(app.block_loader.get_descriptor(item_id)))
+        show_rows(item_ids)
     
     def search_blocks():
-        """Search blocks based on search term"""
-        search_term = search_var.get().lower()
+        """Start an indexed search on the worker thread; results replace the list when ready"""
+        cancel_pending("debounce")
+        search_term = search_var.get().strip()
+        if not search_term:
+            load_blocks()
+            return
         selected_category = category_var.get()
+        category_filter = None if selected_category == "All" else selected_category
         
-        # Clear existing items
-        for item in tree.get_children():
-            tree.delete(item)
-        
-        # Get all blocks
-        all_blocks = []
-        for category, blocks in app.block_loader.available_blocks.items():
-            if selected_category == "All" or category == selected_category:
-                for block in blocks:
-                    block["category"] = category
-                    all_blocks.append(block)
-        
-        # Filter blocks if search term exists
-        if search_term:
-            filtered_blocks = []
-            for block in all_blocks:
-                text = block.get("text", "").lower()
-                description = block.get("description", "").lower()
-                template = block.get("template", "").lower()
-                content = block.get("content", "").lower()
-                block_type = block.get("type", "").lower()
-                category_name = block.get("category", "").lower()
-                
-                if (search_term in text or 
-                    search_term in description or 
-                    search_term in template or
-                    search_term in content or
-                    search_term in block_type or
-                    search_term in category_name):
-                    filtered_blocks.append(block)
-            all_blocks = filtered_blocks
-        
-        # Sort blocks
-        all_blocks.sort(key=lambda x: (x["category"], x.get("text", "")))
-        
-        # Add to treeview
-        for block in all_blocks:
-            # Add usage notes if available
-            if "template" in block and block["template"] != block.get("content", ""):
-                usage = f"Template: {block['template']}"
+        # Pending packages are parsed here, the worker only reads the index
+        if category_filter is None:
+            app.block_loader.load_all_categories()
+        else:
+            app.block_loader.get_blocks(category_filter)
+        searcher.submit(search_term, category_filter)
+        if pending["poll"] is None:
+            poll_search()
+    
+    def poll_search():
+        """Apply the newest search result once the worker delivers it"""
+        pending["poll"] = None
+        result = searcher.latest()
+        if result is not None:
+            show_rows(result[1])
+        elif searcher.busy:
+            pending["poll"] = help_window.after(SEARCH_POLL_MS, poll_search)
+    
+    def schedule_search(event=None):
+        """Debounce keystrokes: search once typing pauses"""
+        cancel_pending("debounce")
+        pending["debounce"] = help_window.after(SEARCH_DEBOUNCE_MS, search_blocks)
+    
+    def apply_catalog_diffs(diffs):
+        """Patch the listed blocks after package files were reloaded"""
+        category_menu['values'] = ["All"] + sorted(app.block_loader.categories())
+        if search_var.get().strip():
+            # Ranked results: just run the (indexed) query again
+            search_blocks()
+            return
+        deleted, changed = diff_rows(diffs, category_var.get())
+        for item_id in deleted:
+            if tree.exists(item_id):
+                tree.delete(item_id)
+        insert_sorted(changed)
+    
+    def add_loaded_categories(categories):
+        """List the blocks of categories that were merged on first access elsewhere"""
+        category_menu['values'] = ["All"] + sorted(app.block_loader.categories())
+        if search_var.get().strip():
+            search_blocks()  # Ranked results: run the (indexed) query again
+            return
+        insert_sorted(listed_item_ids(app.block_loader, category_var.get(), categories))
+    
+    def insert_sorted(item_ids):
+        """Insert or replace rows, keeping the list sorted by category and name.
+
+        The sort keys of the listed rows are built once, from the loader's
+        descriptors rather than the tree, so each row costs one bisect.
+        """
+        if not item_ids:
+            return
+        for item_id in item_ids:
+            if tree.exists(item_id):
+                tree.delete(item_id)
+        keys = []
+        for child in tree.get_children():
+            descriptor = app.block_loader.get_descriptor(child)
+            if descriptor is None:  # Listed before its block went away; rare, ask the tree
+                keys.append((tree.set(child, "category"), tree.item(child, "text")))
             else:
-                usage = "Double-click to use"
-                
-            tree.insert("", "end", 
-                      text=block.get("text", "Unknown"),
-                      values=(
-                          block.get("category", ""),
-                          block.get("type", ""),
-                          block.get("template", block.get("content", "")),
-                          block.get("description", ""),
-                          usage
-                      ))
-    
-    # Load blocks initially
-    load_blocks()
+                keys.append(row_key(descriptor))
+        descriptors = {item_id: app.block_loader.get_descriptor(item_id) for item_id in item_ids}
+        rows = [(row_key(descriptor), item_id) for item_id, descriptor in descriptors.items()
+                if descriptor is not None]
+        for index, item_id in plan_sorted_inserts(keys, rows):
+            insert_row(index, item_id, descriptors[item_id])
+    
+    # Catalog version the lists reflect, and reloads that arrived while hidden
+    catalog_state = {"version": None, "diffs": [], "loads": 0}
+    
+    def on_catalog_diffs(diffs):
+        """Follow package reloads while shown; queue them while hidden"""
+        if help_window.state() == "withdrawn":
+            catalog_state["diffs"].append(diffs)
+            return
+        apply_catalog_diffs(diffs)
+        sync_package_sections(diffs)
+        if catalog_state["version"] is not None:
+            catalog_state["version"] = app.block_loader.catalog_version
+            catalog_state["loads"] = len(app.block_loader.category_loads)
+    
+    app.catalog_listeners.append(on_catalog_diffs)
+    
+    def on_destroy(event):
+        if event.widget is help_window:
+            app.catalog_listeners.remove(on_catalog_diffs)
+            for name in pending:
+                cancel_pending(name)
+            searcher.close()
+    
+    help_window.bind("<Destroy>", on_destroy)
     
     # Bind search
-    search_entry.bind("<KeyRelease>", lambda e: search_blocks())
+    search_entry.bind("<KeyRelease>", schedule_search)
     category_menu.bind("<<ComboboxSelected>>", lambda e: search_blocks())
     
     # Search button
@@ -313,6 +433,10 @@ Package JSON Structure:
 }
 
 The package name (e.g., "Json", "Math") becomes a category in the blocks list.
+
+Large packages can use JSON Lines (.jsonl) instead: a header line such as
+{"format": "antimony-blocks", "version": 1, "category": "PackageName"}
+followed by one block object per line.
 """
     
     info_label = tk.Label(packages_content, text=info_text, 
@@ -320,167 +444,181 @@ The package name (e.g., "Json", "Math") becomes a category in the blocks list.
                          wraplength=1000)
     info_label.pack(padx=20, pady=(0, 20))
     
-    # Load and display package information
-    def load_package_info():
-        """Load and display package information"""
-        packages_dir = "packages"
-        if not os.path.exists(packages_dir):
-            tk.Label(packages_content, 
-                    text="No packages directory found. Create a 'packages' folder and add JSON files.",
-                    bg="#f5f5f5", fg="gray", font=("Arial", 10)).pack(pady=20)
-            return
+    # Package sections live in their own frame so they can be updated one by one
+    package_list = tk.Frame(packages_content, bg="#f5f5f5")
+    package_list.pack(fill=tk.X)
+    
+    def show_package_error(file_path, message, details=None, place=None):
+        error_frame = tk.Frame(package_list, bg="#ffeeee", relief=tk.RIDGE, bd=1)
+        error_frame.pack(fill=tk.X, padx=20, pady=10, **(place or {}))
         
-        # Find all JSON files in packages directory
-        json_files = glob.glob(os.path.join(packages_dir, "*.json"))
+        error_label = tk.Label(error_frame, 
+                              text=f"Error loading {os.path.basename(file_path)}: {message}",
+                              font=("Arial", 10), bg="#ffeeee", fg="red")
+        error_label.pack(padx=10, pady=10)
         
-        if not json_files:
-            tk.Label(packages_content, 
-                    text="No package JSON files found in packages directory.",
-                    bg="#f5f5f5", fg="gray", font=("Arial", 10)).pack(pady=20)
+        if details:
+            error_details = tk.Label(error_frame, 
+                                    text=f"Error: {details}",
+                                    font=("Arial", 8), bg="#ffeeee", fg="darkred")
+            error_details.pack(padx=10, pady=(0, 10))
+        return error_frame
+    
+    def build_package_content(file_path, content_frame):
+        """Build the block listing of a package; called on first expand"""
+        try:
+            package_categories = app.block_loader.package_contents(file_path)
+        except Exception as e:
+            tk.Label(content_frame, text=f"Error loading {os.path.basename(file_path)}: {e}",
+                     font=("Arial", 9), bg="white", fg="red").pack(anchor="w", padx=10, pady=5)
             return
         
-        # Sort files alphabetically
-        json_files.sort()
-        
-        # Display information for each package
-        for json_file in json_files:
-            try:
-                with open(json_file, 'r') as f:
-                    package_data = json.load(f)
+        # Display blocks for each category in the package
+        for category_name, blocks in package_categories:
+            category_frame = tk.Frame(content_frame, bg="white")
+            category_frame.pack(fill=tk.X, padx=10, pady=5)
+            
+            # Category label
+            cat_label = tk.Label(category_frame, text=f"Category: {category_name}", 
+                                font=("Arial", 10, "bold"), bg="white")
+            cat_label.pack(anchor="w", pady=(5, 5))
+            
+            # Create a table-like display for blocks
+            for i, block in enumerate(blocks):
+                row_bg = "#f9f9f9" if i % 2 == 0 else "#f0f0f0"
+                block_frame = tk.Frame(category_frame, bg=row_bg)
+                block_frame.pack(fill=tk.X, padx=5, pady=2)
                 
-                # Get package name from filename
-                package_name = os.path.basename(json_file).replace('.json', '')
+                # Block name and type
+                name_type_frame = tk.Frame(block_frame, bg=row_bg)
+                name_type_frame.pack(fill=tk.X, padx=5, pady=3)
                 
-                # Create frame for this package
-                package_frame = tk.Frame(packages_content, bg="white", relief=tk.RIDGE, bd=2)
-                package_frame.pack(fill=tk.X, padx=20, pady=10, ipadx=10, ipady=10)
+                block_name = tk.Label(name_type_frame, text=f"• {block.get('text', 'Unknown')}", 
+                                     font=("Arial", 9, "bold"), bg=row_bg)
+                block_name.pack(side=tk.LEFT)
                 
-                # Package header with expand/collapse
-                header_frame = tk.Frame(package_frame, bg="white")
-                header_frame.pack(fill=tk.X, padx=10, pady=5)
+                block_type = tk.Label(name_type_frame, text=f"[{block.get('type', 'unknown')}]", 
+                                     font=("Arial", 8), bg=row_bg, fg="blue")
+                block_type.pack(side=tk.LEFT, padx=(5, 10))
                 
-                # Package name and toggle button
-                name_label = tk.Label(header_frame, text=f"📦 {package_name}", 
-                                     font=("Arial", 12, "bold"), bg="white", cursor="hand2")
-                name_label.pack(side=tk.LEFT)
+                # Template/Content
+                template_frame = tk.Frame(block_frame, bg=row_bg)
+                template_frame.pack(fill=tk.X, padx=10, pady=2)
                 
-                # File info
-                file_info = tk.Label(header_frame, 
-                                    text=f"File: {os.path.basename(json_file)} | Blocks: {sum(len(blocks) for blocks in package_data.values())}",
-                                    font=("Arial", 9), bg="white", fg="gray")
-                file_info.pack(side=tk.RIGHT)
+                template_label = tk.Label(template_frame, text="Template:", 
+                                         font=("Arial", 8, "bold"), bg=row_bg)
+                template_label.pack(side=tk.LEFT, anchor="n")
                 
-                # Content frame (initially hidden)
-                content_frame = tk.Frame(package_frame, bg="white")
+                template_text = tk.Text(template_frame, height=2, width=60,
+                                       font=("Courier", 8), bg="#f5f5f5",
+                                       relief=tk.FLAT, wrap=tk.WORD)
+                template_text.insert("1.0", block.get('template', block.get('content', 'No template')))
+                template_text.config(state=tk.DISABLED)
+                template_text.pack(side=tk.LEFT, padx=(5, 0), pady=2)
                 
-                # Display blocks for each category in the package
-                for category_name, blocks in package_data.items():
-                    if not isinstance(blocks, list):
-                        continue
+                # Description
+                if block.get('description'):
+                    desc_frame = tk.Frame(block_frame, bg=row_bg)
+                    desc_frame.pack(fill=tk.X, padx=10, pady=(0, 3))
                     
-                    category_frame = tk.Frame(content_frame, bg="white")
-                    category_frame.pack(fill=tk.X, padx=10, pady=5)
+                    desc_label = tk.Label(desc_frame, text="Description:", 
+                                         font=("Arial", 8, "bold"), bg=row_bg)
+                    desc_label.pack(side=tk.LEFT, anchor="n")
                     
-                    # Category label
-                    cat_label = tk.Label(category_frame, text=f"Category: {category_name}", 
-                                        font=("Arial", 10, "bold"), bg="white")
-                    cat_label.pack(anchor="w", pady=(5, 5))
-                    
-                    # Create a table-like display for blocks
-                    for i, block in enumerate(blocks):
-                        block_frame = tk.Frame(category_frame, bg="#f9f9f9" if i % 2 == 0 else "#f0f0f0")
-                        block_frame.pack(fill=tk.X, padx=5, pady=2)
-                        
-                        # Block name and type
-                        name_type_frame = tk.Frame(block_frame, bg="transparent")
-                        name_type_frame.pack(fill=tk.X, padx=5, pady=3)
-                        
-                        block_name = tk.Label(name_type_frame, text=f"• {block.get('text', 'Unknown')}", 
-                                             font=("Arial", 9, "bold"), bg="transparent")
-                        block_name.pack(side=tk.LEFT)
-                        
-                        block_type = tk.Label(name_type_frame, text=f"[{block.get('type', 'unknown')}]", 
-                                             font=("Arial", 8), bg="transparent", fg="blue")
-                        block_type.pack(side=tk.LEFT, padx=(5, 10))
-                        
-                        # Template/Content
-                        template_frame = tk.Frame(block_frame, bg="transparent")
-                        template_frame.pack(fill=tk.X, padx=10, pady=2)
-                        
-                        template_label = tk.Label(template_frame, text="Template:", 
-                                                 font=("Arial", 8, "bold"), bg="transparent")
-                        template_label.pack(side=tk.LEFT, anchor="n")
-                        
-                        template_text = tk.Text(template_frame, height=2, width=60,
-                                               font=("Courier", 8), bg="#f5f5f5",
-                                               relief=tk.FLAT, wrap=tk.WORD)
-                        template_text.insert("1.0", block.get('template', block.get('content', 'No template')))
-                        template_text.config(state=tk.DISABLED)
-                        template_text.pack(side=tk.LEFT, padx=(5, 0), pady=2)
-                        
-                        # Description
-                        if block.get('description'):
-                            desc_frame = tk.Frame(block_frame, bg="transparent")
-                            desc_frame.pack(fill=tk.X, padx=10, pady=(0, 3))
-                            
-                            desc_label = tk.Label(desc_frame, text="Description:", 
-                                                 font=("Arial", 8, "bold"), bg="transparent")
-                            desc_label.pack(side=tk.LEFT, anchor="n")
-                            
-                            desc_text = tk.Label(desc_frame, text=block['description'],
-                                                font=("Arial", 8), bg="transparent",
-                                                wraplength=800, justify=tk.LEFT)
-                            desc_text.pack(side=tk.LEFT, padx=(5, 0), fill=tk.X, expand=True)
-                
-                # Toggle visibility function
-                def toggle_content(content=content_frame, header=header_frame):
-                    if content.winfo_ismapped():
-                        content.pack_forget()
-                        header.config(bg="white")
-                    else:
-                        content.pack(fill=tk.X, padx=10, pady=(0, 10))
-                        header.config(bg="#f0f0f0")
-                
-                # Bind click to toggle
-                name_label.bind("<Button-1>", lambda e, t=toggle_content: t())
-                header_frame.bind("<Button-1>", lambda e, t=toggle_content: t())
-                
-                # Initially hide content
+                    desc_text = tk.Label(desc_frame, text=block['description'],
+                                        font=("Arial", 8), bg=row_bg,
+                                        wraplength=800, justify=tk.LEFT)
+                    desc_text.pack(side=tk.LEFT, padx=(5, 0), fill=tk.X, expand=True)
+    
+    # One section per package file; a package's blocks are only rendered when it is expanded
+    package_sections = {}  # File path -> widgets of its section, in pack order
+    no_packages_label = tk.Label(package_list,
+                                 text="No package files found. Add JSON or JSON Lines files to the 'packages' folder.",
+                                 bg="#f5f5f5", fg="gray", font=("Arial", 10))
+    
+    def build_package_section(file_path, before=None):
+        """Build the header of one package file and return its widgets"""
+        place = {} if before is None else {"before": before}
+        try:
+            package_summary = app.block_loader.package_summary(file_path)
+        except json.JSONDecodeError as e:
+            return [show_package_error(file_path, "Invalid JSON format", str(e), place)]
+        except Exception as e:
+            return [show_package_error(file_path, str(e), place=place)]
+        package_name = app.block_loader.package_sources[file_path][0]
+        block_count = sum(count for _, count in package_summary if count is not None)
+        
+        # Create frame for this package
+        package_frame = tk.Frame(package_list, bg="white", relief=tk.RIDGE, bd=2)
+        package_frame.pack(fill=tk.X, padx=20, pady=10, ipadx=10, ipady=10, **place)
+        
+        # Package header with expand/collapse
+        header_frame = tk.Frame(package_frame, bg="white")
+        header_frame.pack(fill=tk.X, padx=10, pady=5)
+        
+        # Package name and toggle button
+        name_label = tk.Label(header_frame, text=f"📦 {package_name}", 
+                             font=("Arial", 12, "bold"), bg="white", cursor="hand2")
+        name_label.pack(side=tk.LEFT)
+        
+        # File info
+        file_info = tk.Label(header_frame, 
+                            text=f"File: {os.path.basename(file_path)} | Blocks: {block_count}",
+                            font=("Arial", 9), bg="white", fg="gray")
+        file_info.pack(side=tk.RIGHT)
+        
+        # Content frame (initially hidden and empty)
+        content_frame = tk.Frame(package_frame, bg="white")
+        
+        # Toggle visibility function
+        def toggle_content():
+            if content_frame.winfo_ismapped():
                 content_frame.pack_forget()
-                
-                # Separator
-                separator = tk.Frame(packages_content, height=2, bg="#e0e0e0")
-                separator.pack(fill=tk.X, padx=20, pady=5)
-                
-            except json.JSONDecodeError as e:
-                error_frame = tk.Frame(packages_content, bg="#ffeeee", relief=tk.RIDGE, bd=1)
-                error_frame.pack(fill=tk.X, padx=20, pady=10)
-                
-                error_label = tk.Label(error_frame, 
-                                      text=f"Error loading {os.path.basename(json_file)}: Invalid JSON format",
-                                      font=("Arial", 10), bg="#ffeeee", fg="red")
-                error_label.pack(padx=10, pady=10)
-                
-                error_details = tk.Label(error_frame, 
-                                        text=f"Error: {str(e)}",
-                                        font=("Arial", 8), bg="#ffeeee", fg="darkred")
-                error_details.pack(padx=10, pady=(0, 10))
-                
-            except Exception as e:
-                error_frame = tk.Frame(packages_content, bg="#ffeeee", relief=tk.RIDGE, bd=1)
-                error_frame.pack(fill=tk.X, padx=20, pady=10)
-                
-                error_label = tk.Label(error_frame, 
-                                      text=f"Error loading {os.path.basename(json_file)}: {str(e)}",
-                                      font=("Arial", 10), bg="#ffeeee", fg="red")
-                error_label.pack(padx=10, pady=10)
+                header_frame.config(bg="white")
+            else:
+                if not content_frame.winfo_children():
+                    build_package_content(file_path, content_frame)
+                content_frame.pack(fill=tk.X, padx=10, pady=(0, 10))
+                header_frame.config(bg="#f0f0f0")
+        
+        # Bind click to toggle
+        name_label.bind("<Button-1>", lambda e: toggle_content())
+        header_frame.bind("<Button-1>", lambda e: toggle_content())
+        
+        # Separator
+        separator = tk.Frame(package_list, height=2, bg="#e0e0e0")
+        separator.pack(fill=tk.X, padx=20, pady=5, **place)
+        return [package_frame, separator]
     
-    # Load package information
-    load_package_info()
+    def sync_package_sections(changed_categories=()):
+        """Match the package sections to the loader's package files.
+
+        Sections of files that are gone are removed and new files get a
+        section; of the rest, only files filling one of changed_categories
+        (from reload or import diffs) are rebuilt, in place.
+        """
+        package_sources = app.block_loader.package_sources
+        for file_path in [path for path in package_sections if path not in package_sources]:
+            for widget in package_sections.pop(file_path):
+                widget.destroy()
+        for file_path, (_, categories) in package_sources.items():
+            widgets = package_sections.get(file_path)
+            if widgets is None:
+                package_sections[file_path] = build_package_section(file_path)
+            elif any(category in changed_categories for category in categories):
+                package_sections[file_path] = build_package_section(file_path, before=widgets[0])
+                for widget in widgets:
+                    widget.destroy()
+        
+        if package_sections:
+            no_packages_label.pack_forget()
+        elif not no_packages_label.winfo_ismapped():
+            no_packages_label.pack(pady=20)
+        app.block_loader.manifest.save()
     
     # Instructions for adding packages
     instructions = tk.Label(packages_content, 
-                          text="To add a new package:\n1. Create a JSON file in the 'packages' folder\n2. Use the structure shown above\n3. Restart Antimony IDE or use 'Import Package' button",
+                          text="To add a new package:\n1. Create a JSON file in the 'packages' folder\n2. Use the structure shown above\n3. It is picked up automatically; edits to package files reload too",
                           font=("Arial", 9), bg="#f5f5f5", fg="green", justify=tk.LEFT)
     instructions.pack(pady=20)
     
@@ -488,12 +626,42 @@ The package name (e.g., "Json", "Math") becomes a category in the blocks list.
     close_frame = tk.Frame(help_window, bg="#f5f5f5")
     close_frame.pack(fill=tk.X, pady=(0, 10))
     
+    def hide():
+        help_window.grab_release()
+        help_window.withdraw()
+    
     close_btn = tk.Button(close_frame, text="Close", width=20,
-                         command=help_window.destroy, bg="#4CAF50", fg="white",
+                         command=hide, bg="#4CAF50", fg="white",
                          font=("Arial", 10, "bold"))
     close_btn.pack()
-    
-    # Make window modal
+    help_window.protocol("WM_DELETE_WINDOW", hide)
     help_window.transient(app.root)
-    help_window.grab_set()
-    help_window.focus_set()
+    
+    def refresh():
+        """Bring the lists up to date with the block catalog"""
+        queued, catalog_state["diffs"] = catalog_state["diffs"], []
+        category_loads = app.block_loader.category_loads
+        loaded = category_loads[catalog_state["loads"]:]
+        if catalog_state["version"] is None:
+            search_blocks()  # First show
+        else:
+            for diffs in queued:
+                apply_catalog_diffs(diffs)
+            if loaded:
+                add_loaded_categories(set(loaded))
+        catalog_state["loads"] = len(category_loads)
+        # Lazy category loads change no package file: only touch the sections reloads affected
+        sync_package_sections({category for diffs in queued for category in diffs})
+        catalog_state["version"] = app.block_loader.catalog_version
+    
+    def show():
+        """Show the window (modal), refreshing it only if the catalog changed"""
+        if catalog_state["version"] != app.block_loader.catalog_version:
+            refresh()
+        help_window.deiconify()
+        help_window.lift()
+        help_window.grab_set()
+        help_window.focus_set()
+    
+    help_window.show = show
+    return help_window
@@ -0,0 +1,118 @@
+import tkinter as tk
+
+from ui.help_window import SEARCH_DEBOUNCE_MS, SEARCH_POLL_MS
+from utils.search_worker import SearchWorker
+
+# Number of ranked matches listed under the query
+QUICK_ADD_RESULTS = 10
+
+
+def show_quick_add(app):
+    """Show the quick-add palette: type to search blocks, Enter drops the top match on the canvas"""
+    palette = tk.Toplevel(app.root)
+    palette.title(app.lang.get("quick_add"))
+    palette.geometry("420x260")
+    palette.transient(app.root)
+    
+    query_var = tk.StringVar()
+    query_entry = tk.Entry(palette, textvariable=query_var, font=("Arial", 12))
+    query_entry.pack(fill=tk.X, padx=10, pady=(10, 5))
+    
+    results_list = tk.Listbox(palette, font=("Arial", 10), activestyle="none")
+    results_list.pack(fill=tk.BOTH, expand=True, padx=10, pady=(0, 10))
+    
+    matches = []  # Item IDs shown in results_list
+    
+    # Searches run on a worker thread, as in the help window; pending Tk callbacks
+    searcher = SearchWorker(app.block_loader.search_index)
+    pending = {"debounce": None, "poll": None, "load": None}
+    
+    def cancel_pending(name):
+        if pending[name] is not None:
+            palette.after_cancel(pending[name])
+            pending[name] = None
+    
+    def load_pending_categories():
+        """Merge pending packages one category per tick, so typing stays responsive"""
+        pending["load"] = None
+        if app.block_loader.load_next_category():
+            pending["load"] = palette.after(1, load_pending_categories)
+        elif query_var.get().strip():
+            search()  # Everything is merged now: search again to include the late blocks
+    
+    def search():
+        cancel_pending("debounce")
+        query = query_var.get().strip()
+        if not query:
+            searcher.cancel()
+            show_results([])
+            return
+        searcher.submit(query, limit=QUICK_ADD_RESULTS)
+        if pending["poll"] is None:
+            poll_search()
+    
+    def poll_search():
+        """Apply the newest search result once the worker delivers it"""
+        pending["poll"] = None
+        result = searcher.latest()
+        if result is not None:
+            show_results(result[1])
+        elif searcher.busy:
+            pending["poll"] = palette.after(SEARCH_POLL_MS, poll_search)
+    
+    def schedule_search(event=None):
+        """Debounce keystrokes: search once typing pauses"""
+        if event is not None and event.keysym in ("Up", "Down", "Return", "Escape"):
+            return
+        cancel_pending("debounce")
+        pending["debounce"] = palette.after(SEARCH_DEBOUNCE_MS, search)
+    
+    def show_results(item_ids):
+        query = query_var.get().strip()
+        matches[:] = [item_id for item_id in item_ids
+                      if app.block_loader.get_descriptor(item_id) is not None]
+        results_list.delete(0, tk.END)
+        for item_id in matches:
+            descriptor = app.block_loader.get_descriptor(item_id)
+            results_list.insert(tk.END, f"{descriptor.text}  —  {descriptor.category}")
+        if matches:
+            results_list.selection_set(0)
+        elif query:
+            results_list.insert(tk.END, app.lang.get("quick_add_no_match"))
+    
+    def move_selection(step):
+        if not matches:
+            return "break"
+        selection = results_list.curselection()
+        index = (selection[0] if selection else 0) + step
+        index = max(0, min(index, len(matches) - 1))
+        results_list.selection_clear(0, tk.END)
+        results_list.selection_set(index)
+        results_list.see(index)
+        return "break"
+    
+    def add_selected(event=None):
+        if not matches:
+            return
+        selection = results_list.curselection()
+        item_id = matches[selection[0] if selection else 0]
+        palette.destroy()
+        x, y = app.canvas_center()
+        app.add_block_from_template(item_id, x, y)
+    
+    def on_destroy(event):
+        if event.widget is palette:
+            for name in pending:
+                cancel_pending(name)
+            searcher.close()
+    
+    palette.bind("<Destroy>", on_destroy)
+    query_entry.bind("<KeyRelease>", schedule_search)
+    query_entry.bind("<Down>", lambda e: move_selection(1))
+    query_entry.bind("<Up>", lambda e: move_selection(-1))
+    query_entry.bind("<Return>", add_selected)
+    results_list.bind("<Double-Button-1>", add_selected)
+    palette.bind("<Escape>", lambda e: palette.destroy())
+    
+    query_entry.focus_set()
+    load_pending_categories()
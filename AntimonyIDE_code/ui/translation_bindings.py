@@ -0,0 +1,45 @@
+class TranslationBindings:
+    """Registry of widgets that display a translation key.
+
+    Widgets register the key they show when they are created; after a
+    language switch ``apply`` rewrites just those text/label options, so
+    the rest of the window (canvas, selection, scroll position) is left
+    untouched. Bindings of destroyed widgets are dropped as they are found.
+    """
+
+    def __init__(self, lang):
+        self.lang = lang
+        self.bindings = []  # (widget, key, update), update(text) sets the option
+        self._prune_at = 100
+
+    def _add(self, widget, key, update):
+        update(self.lang.get(key))
+        self.bindings.append((widget, key, update))
+        if len(self.bindings) > self._prune_at:
+            self.prune()
+
+    def bind(self, widget, key, option="text"):
+        """Show the translation of key in a widget option; returns the widget"""
+        self._add(widget, key, lambda text: widget.config(**{option: text}))
+        return widget
+
+    def bind_title(self, window, key):
+        """Show the translation of key as a window title"""
+        self._add(window, key, window.title)
+
+    def add_menu_entry(self, menu, kind, key, **options):
+        """Add a menu command or cascade labelled with the translation of key"""
+        menu.add(kind, label=self.lang.get(key), **options)
+        index = menu.index("end")
+        self._add(menu, key, lambda text: menu.entryconfig(index, label=text))
+
+    def prune(self):
+        """Forget bindings of destroyed widgets"""
+        self.bindings = [binding for binding in self.bindings if binding[0].winfo_exists()]
+        self._prune_at = 2 * len(self.bindings) + 100
+
+    def apply(self):
+        """Update every bound widget to the current language"""
+        self.prune()
+        for widget, key, update in self.bindings:
+            update(self.lang.get(key))
@@ -3,6 +3,9 @@ Utilities module for Antimony IDE containing helper classes and functions.
 """
 
 from .block_loader import BlockLoader
+from .block_descriptor import BlockDescriptor
 from .file_handler import FileHandler
+from .parse_cache import ParseCache
+from .package_manifest import PackageManifest
 
-__all__ = ['BlockLoader', 'FileHandler']
\ No newline at end of file
+__all__ = ['BlockLoader', 'BlockDescriptor', 'FileHandler', 'ParseCache', 'PackageManifest']
\ No newline at end of file
@@ -0,0 +1,33 @@
+from collections import namedtuple
+
+from core.template import compile_template
+
+
+class BlockDescriptor(namedtuple("BlockDescriptor", (
+        "category", "text", "type", "content", "template", "description", "usage", "compiled"))):
+    """Read-only view of a block template with its derived fields.
+
+    Built once when a block is merged into the catalog, so views and search
+    read these attributes instead of writing derived keys into the shared
+    template dicts. ``template`` is the block's display template (empty if
+    it has none), ``compiled`` the CompiledTemplate of its content.
+    """
+
+    __slots__ = ()
+
+    @property
+    def display(self):
+        """Text shown for the block: its display template, else its content"""
+        return self.template or self.content
+
+
+def describe_block(category, block):
+    """Return the BlockDescriptor of a block template in a category"""
+    content = block.get("content", "")
+    template = block.get("template", "")
+    if template and template != content:
+        usage = f"Template: {template}"
+    else:
+        usage = "Double-click to use"
+    return BlockDescriptor(category, block.get("text", "Unknown"), block.get("type", ""), content,
+                           template, block.get("description", ""), usage, compile_template(content))
@@ -1,15 +1,453 @@
+import hashlib
 import json
 import os
 import glob
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
+from .block_descriptor import describe_block
+from .catalog_cache import CatalogCache
+from .jsonl_package import JsonlPackage
+from .package_manifest import PackageManifest
+from .search_index import BlockSearchIndex
+
+# Package files are opened and parsed on at most this many threads
+PACKAGE_READ_WORKERS = 8
+
+
+def find_package_files(packages_dir):
+    """Return the JSON and JSON Lines package files in a directory, sorted"""
+    return sorted(glob.glob(os.path.join(packages_dir, "*.json")) +
+                  glob.glob(os.path.join(packages_dir, "*.jsonl")))
+
+
+def package_name(file_path):
+    """Default category name of a package file: its name without extension"""
+    return os.path.splitext(os.path.basename(file_path))[0]
+
+
+def parse_package_file(file_path):
+    """Parse a package in JSON or JSON Lines format.
+
+    A JSON Lines package becomes a one-category dict whose block list is the
+    streaming JsonlPackage itself.
+    """
+    if file_path.endswith(".jsonl"):
+        package = JsonlPackage(file_path)
+        return {package.category or package_name(file_path): package}
+    with open(file_path, 'r') as f:
+        return json.load(f)
+
+
+class MergeReport:
+    """Outcome of merging a batch of blocks into the catalog.
+
+    ``skipped`` holds exact duplicates of blocks already present, while
+    ``conflicts`` holds (incoming, existing) pairs that share a text but
+    differ otherwise; neither is added. ``diffs`` describes the added blocks
+    per category, so views can insert them without rebuilding.
+    """
 
-class BlockLoader:
     def __init__(self):
+        self.added = []
+        self.skipped = []
+        self.conflicts = []
+        self.diffs = {}  # Category -> CategoryDiff
+
+    def extend(self, other):
+        self.added.extend(other.added)
+        self.skipped.extend(other.skipped)
+        self.conflicts.extend(other.conflicts)
+        for category, diff in other.diffs.items():
+            if category in self.diffs:
+                self.diffs[category].inserted.extend(diff.inserted)
+            else:
+                self.diffs[category] = diff
+
+
+class CategoryDiff:
+    """Changes to one category after packages were merged or reloaded, as palette item IDs.
+
+    ``inserted`` holds (position, item ID) pairs in the category's new order.
+    """
+
+    def __init__(self, category):
+        self.category = category
+        self.added = False  # Category did not exist before
+        self.removed = False  # Category no longer exists
+        self.inserted = []
+        self.updated = []
+        self.deleted = []
+
+
+class BlockLoader:
+    def __init__(self, lazy=True, packages_dir="packages", use_catalog_cache=True):
         self.available_blocks = self.load_default_blocks()
+        self.descriptors = {category: [describe_block(category, block) for block in blocks]
+                            for category, blocks in self.available_blocks.items()}
         self.custom_blocks_file = "custom_blocks.json"
         self.custom_package_paths = []  # 存储包路径
+        self.catalog_version = 0  # Bumped whenever blocks or package files change
+        self.category_loads = []  # Categories merged on first access, in order; views keep a position in it
+        
+        # Hash index from palette item ID to template, keyed on (category, text, type)
+        self.block_index = {}  # Item ID -> (category, template, descriptor)
+        self._item_ids = {}  # (category, text, type) -> item ID
+        self._blocks_by_text = {}  # Category -> {text: template}, built on first merge
+        self.search_index = BlockSearchIndex()  # Kept in step with block_index
+        for category, blocks in self.available_blocks.items():
+            self._index_blocks(category, blocks, self.descriptors[category])
+        
+        # In lazy mode packages are only listed at startup (from the manifest)
+        # and a category's JSON is parsed the first time it is accessed
+        self.lazy = lazy
+        self.manifest = PackageManifest()
+        self.package_data = {}  # Parsed package JSON by file path
+        self._pending = {}  # Category -> [(file path, key in file)] not merged yet
+        self._pending_counts = {}  # Category -> block count announced by the manifest
+        self.package_sources = {}  # Package file -> (category name, categories it fills), in load order
+        self._catalog_signature = None  # Signature to save the compiled catalog under once all is merged
+        
+        # A compiled catalog from an earlier run replaces all package parsing
+        self.catalog_cache = CatalogCache() if use_catalog_cache else None
+        signature = None
+        if self.catalog_cache is not None:
+            self.custom_package_paths = self.read_custom_package_paths()
+            signature = self.catalog_signature(packages_dir)
+            catalog = self.catalog_cache.load(signature)
+            if catalog is not None:
+                self.available_blocks = catalog["categories"]
+                self.descriptors = catalog["descriptors"]
+                self.package_sources = catalog["sources"]
+                self.block_index, self._item_ids = {}, {}
+                self.search_index = BlockSearchIndex()
+                for category, blocks in self.available_blocks.items():
+                    self._index_blocks(category, blocks, self.descriptors[category])
+                return
+        
+        # Package files in packages_dir fill palette categories from startup, next to
+        # the custom packages saved by Import Package; lazy mode only lists them
+        self.load_all_packages(packages_dir)
         self.load_custom_blocks()
+        self.manifest.save()
+        
+        if self.catalog_cache is not None:
+            self._catalog_signature = signature
+            self.save_catalog_when_loaded()
+    
+    # ===== Compiled Catalog =====
+    
+    def catalog_signature(self, packages_dir):
+        """Signature of the default blocks and every package file, in load order"""
+        defaults = json.dumps(self.load_default_blocks(), sort_keys=True).encode()
+        file_paths = find_package_files(packages_dir)
+        file_paths.extend(path for path in self.custom_package_paths if os.path.exists(path))
+        return CatalogCache.make_signature(hashlib.sha256(defaults).hexdigest(), file_paths)
+    
+    def save_catalog_when_loaded(self):
+        """Save the compiled catalog for the next start once every package is merged.
 
+        The catalog is written from the blocks this loader already parsed; in
+        lazy mode that is when the last pending category is loaded. Copies of
+        the lists are pickled on a background thread.
+        """
+        if self._catalog_signature is None or self._pending:
+            return
+        signature, self._catalog_signature = self._catalog_signature, None
+        categories = {category: list(blocks) for category, blocks in self.available_blocks.items()}
+        descriptors = {category: list(items) for category, items in self.descriptors.items()}
+        threading.Thread(target=self.catalog_cache.save,
+                         args=(signature, categories, descriptors, dict(self.package_sources)),
+                         daemon=True).start()
+    
+    def discard_catalog_signature(self):
+        """The catalog no longer matches the startup signature; don't save it"""
+        self._catalog_signature = None
+    
+    # ===== Catalog Access =====
+    
+    def categories(self):
+        """Return all category names, including ones whose packages are not parsed yet"""
+        return list(self.available_blocks.keys())
+    
+    def is_loaded(self, category):
+        """Check whether all packages contributing to a category have been merged"""
+        return category not in self._pending
+    
+    def block_count(self, category):
+        """Number of blocks in a category, without loading it"""
+        return len(self.available_blocks.get(category, [])) + self._pending_counts.get(category, 0)
+    
+    def get_blocks(self, category):
+        """Return the blocks of a category, parsing its packages on first access"""
+        if category in self._pending:
+            self._load_pending(category)
+        return self.available_blocks.get(category, [])
+    
+    def item_id(self, category, block):
+        """Return the palette item ID of a template, as stored on its Treeview item"""
+        return self._item_ids[(category, block.get("text"), block.get("type"))]
+    
+    def get_template(self, item_id):
+        """Return the template for a palette item ID, or None for non-block items"""
+        entry = self.block_index.get(item_id)
+        return entry[1] if entry else None
+    
+    def get_descriptor(self, item_id):
+        """Return the BlockDescriptor for a palette item ID, or None for non-block items"""
+        entry = self.block_index.get(item_id)
+        return entry[2] if entry else None
+    
+    def _index_blocks(self, category, blocks, descriptors):
+        for block, descriptor in zip(blocks, descriptors):
+            key = (category, block.get("text"), block.get("type"))
+            item_id = self._item_ids.get(key)
+            if item_id is None:
+                # IDs are never reused, so a template keeps its ID across reloads
+                item_id = self._item_ids[key] = f"block:{len(self._item_ids)}"
+            self.block_index[item_id] = (category, block, descriptor)
+            self.search_index.add(item_id, descriptor)
+    
+    def load_all_categories(self):
+        """Parse every pending package"""
+        for category in list(self._pending):
+            self._load_pending(category)
+    
+    def load_next_category(self):
+        """Parse the packages of one pending category; returns True while more are pending"""
+        if self._pending:
+            self._load_pending(next(iter(self._pending)))
+        return bool(self._pending)
+    
+    def _load_pending(self, category):
+        """Merge the packages registered for a category, in registration order"""
+        self._pending_counts.pop(category, None)
+        self.category_loads.append(category)
+        for file_path, key in self._pending.pop(category, []):
+            try:
+                package_data = self.read_package(file_path)
+                blocks = package_data if key is None else package_data.get(key, [])
+                self.merge_blocks(category, blocks)
+            except Exception as e:
+                print(f"Error loading package {file_path}: {e}")
+        self.save_catalog_when_loaded()
+    
+    def merge_blocks(self, category, blocks):
+        """Append blocks whose text is not in the category yet and report what happened"""
+        report = MergeReport()
+        diff = CategoryDiff(category)
+        if category not in self.available_blocks:
+            self.available_blocks[category] = []
+            diff.added = True
+        
+        category_blocks = self.available_blocks[category]
+        descriptors = self.descriptors.setdefault(category, [])
+        by_text = self._blocks_by_text.get(category)
+        if by_text is None:
+            by_text = self._blocks_by_text[category] = {}
+            for block in category_blocks:
+                by_text.setdefault(block.get("text"), block)
+        
+        for block in blocks:
+            existing = by_text.get(block.get("text"))
+            if existing is None:
+                by_text[block.get("text")] = block
+                category_blocks.append(block)
+                descriptor = describe_block(category, block)
+                descriptors.append(descriptor)
+                self._index_blocks(category, (block,), (descriptor,))
+                report.added.append(block)
+                diff.inserted.append((len(category_blocks) - 1, self.item_id(category, block)))
+            elif existing == block:
+                report.skipped.append(block)
+            else:
+                report.conflicts.append((block, existing))
+        if diff.added or diff.inserted:
+            report.diffs[category] = diff
+            self.catalog_version += 1
+        return report
+    
+    @staticmethod
+    def package_categories(package_data, category_name):
+        """Return (category, blocks) pairs for parsed package data"""
+        # Package JSON can have different structures:
+        # Option 1: Direct list of blocks
+        # Option 2: Dictionary with category as key
+        if isinstance(package_data, dict):
+            # If it's a dict, each key is a category; the first one takes category_name
+            return [(category_name if index == 0 else category, blocks)
+                    for index, (category, blocks) in enumerate(package_data.items())
+                    if isinstance(blocks, (list, JsonlPackage))]
+        elif isinstance(package_data, list):
+            # If it's a list, use the provided category name
+            return [(category_name, package_data)]
+        return []
+    
+    def merge_package(self, package_data, category_name, file_path=None):
+        """Merge parsed package data; the first category takes category_name"""
+        report = MergeReport()
+        categories = self.package_categories(package_data, category_name)
+        for use_category, blocks in categories:
+            # Merge after any packages still pending for this category
+            self.get_blocks(use_category)
+            report.extend(self.merge_blocks(use_category, blocks))
+        if file_path is not None:
+            self.package_sources[file_path] = (category_name, [category for category, _ in categories])
+        return report
+    
+    # ===== Reloading =====
+    
+    def reload_packages(self, file_paths):
+        """Re-read new, edited or deleted package files and rebuild the categories they fill.
+
+        Returns ({category: CategoryDiff}, {path: error}). A file that fails to
+        parse keeps its previous contribution to the catalog: its parsed data
+        is only replaced once the new contents have been read.
+        """
+        self.discard_catalog_signature()
+        affected = {}
+        errors = {}
+        for file_path in file_paths:
+            category_name, old_categories = self.package_sources.get(
+                file_path, (package_name(file_path), []))
+            try:
+                if os.path.exists(file_path):
+                    package_data = parse_package_file(file_path)
+                    self.package_data[file_path] = package_data
+                    new_categories = [category for category, _ in
+                                      self.package_categories(package_data, category_name)]
+                    self.package_sources[file_path] = (category_name, new_categories)
+                    self.manifest.update(file_path, PackageManifest.file_signature(file_path),
+                                         PackageManifest.summarize(package_data))
+                else:
+                    new_categories = []
+                    self.package_sources.pop(file_path, None)
+                    self.package_data.pop(file_path, None)
+            except Exception as e:
+                errors[file_path] = e
+                continue
+            for category in old_categories + new_categories:
+                affected[category] = True
+        self.manifest.save()
+        
+        diffs = {category: self._rebuild_category(category) for category in affected}
+        return diffs, errors
+    
+    def _rebuild_category(self, category):
+        """Rebuild a category from the default blocks and its package files and diff it"""
+        diff = CategoryDiff(category)
+        diff.added = category not in self.available_blocks
+        old_blocks = {self.item_id(category, block): block for block in self.get_blocks(category)}
+        
+        self.available_blocks[category] = []
+        self.descriptors[category] = []
+        self._blocks_by_text.pop(category, None)
+        defaults = self.load_default_blocks().get(category, [])
+        self.merge_blocks(category, defaults)
+        has_sources = False
+        for file_path, (category_name, categories) in self.package_sources.items():
+            if category not in categories:
+                continue
+            has_sources = True
+            try:
+                package_data = self.read_package(file_path)
+            except Exception as e:
+                print(f"Error loading package {file_path}: {e}")
+                continue
+            for use_category, blocks in self.package_categories(package_data, category_name):
+                if use_category == category:
+                    self.merge_blocks(category, blocks)
+        
+        for index, block in enumerate(self.available_blocks[category]):
+            item_id = self.item_id(category, block)
+            old_block = old_blocks.pop(item_id, None)
+            if old_block is None:
+                diff.inserted.append((index, item_id))
+            elif old_block != block:
+                diff.updated.append(item_id)
+        for item_id in old_blocks:
+            diff.deleted.append(item_id)
+            self.block_index.pop(item_id, None)
+            self.search_index.remove(item_id)
+        
+        if not defaults and not has_sources:
+            del self.available_blocks[category]
+            del self.descriptors[category]
+            diff.removed = True
+        self.catalog_version += 1
+        return diff
+    
+    def read_package(self, file_path):
+        """Parse a package file, reusing the result of an earlier read"""
+        if file_path not in self.package_data:
+            self.package_data[file_path] = parse_package_file(file_path)
+        return self.package_data[file_path]
+    
+    def prefetch_packages(self, file_paths):
+        """Stat and parse package files concurrently on a bounded thread pool.
+
+        Parsed data lands in package_data, so the files can then be merged in
+        order without further I/O. In lazy mode files with a current manifest
+        entry are not parsed. Returns ({path: signature}, {path: error}).
+        """
+        def fetch(file_path):
+            signature = PackageManifest.file_signature(file_path)
+            if self.lazy and self.manifest.lookup(file_path, signature) is not None:
+                return signature, None
+            return signature, parse_package_file(file_path)
+        
+        signatures, errors = {}, {}
+        if not file_paths:
+            return signatures, errors
+        with ThreadPoolExecutor(max_workers=min(PACKAGE_READ_WORKERS, len(file_paths))) as executor:
+            futures = [(path, executor.submit(fetch, path)) for path in file_paths]
+            for file_path, future in futures:
+                try:
+                    signatures[file_path], package_data = future.result()
+                    if package_data is not None:
+                        self.package_data[file_path] = package_data
+                except Exception as e:
+                    errors[file_path] = e
+        return signatures, errors
+    
+    def register_package(self, file_path, category_name=None, signature=None):
+        """Register a package's categories without merging its blocks.
+
+        The file is only parsed if the manifest has no current entry for it.
+        """
+        if not category_name:
+            category_name = package_name(file_path)
+        
+        categories = self.package_summary(file_path, signature)
+        filled = []
+        for index, (key, count) in enumerate(categories):
+            if count is None:
+                continue
+            # The first category of a package takes the package's category name
+            use_category = category_name if index == 0 else key
+            if use_category not in self.available_blocks:
+                self.available_blocks[use_category] = []
+            self._pending.setdefault(use_category, []).append((file_path, key))
+            self._pending_counts[use_category] = self._pending_counts.get(use_category, 0) + count
+            filled.append(use_category)
+        self.package_sources[file_path] = (category_name, filled)
+        self.catalog_version += 1
+
+    def package_summary(self, file_path, signature=None):
+        """Return a package file's [key, block count] pairs, from the manifest when current"""
+        if signature is None:
+            signature = PackageManifest.file_signature(file_path)
+        categories = self.manifest.lookup(file_path, signature)
+        if categories is None:
+            categories = PackageManifest.summarize(self.read_package(file_path))
+            self.manifest.update(file_path, signature, categories)
+        return categories
+    
+    def package_contents(self, file_path):
+        """Return (category, blocks) pairs of a registered package file"""
+        category_name = self.package_sources.get(file_path, (package_name(file_path), []))[0]
+        return self.package_categories(self.read_package(file_path), category_name)
+    
     def load_default_blocks(self):
         """Load default code blocks with corrected types"""
         blocks = {
@@ -109,52 +547,19 @@ class BlockLoader:
         }
         return blocks
 
-    def load_package_file(self, file_path, category_name=None):
-        """Load a single package JSON file"""
+    def load_package_file(self, file_path, category_name=None, reload=True):
+        """Load a single package file; returns (MergeReport, category name)"""
         try:
-            with open(file_path, 'r') as f:
-                package_data = json.load(f)
+            # Read the current file unless it was just prefetched, it may have been edited since startup
+            if reload:
+                self.package_data.pop(file_path, None)
+            package_data = self.read_package(file_path)
 
             # If category_name not provided, use filename
             if not category_name:
-                category_name = os.path.basename(file_path).replace('.json', '')
-
-            # Process the package data
-            added_count = 0
-
-            # Package JSON can have different structures:
-            # Option 1: Direct list of blocks
-            # Option 2: Dictionary with category as key
-            if isinstance(package_data, dict):
-                # If it's a dict, each key is a category
-                for category, blocks in package_data.items():
-                    if isinstance(blocks, list):
-                        # Use the provided category name or the dict key
-                        use_category = category_name if category == list(package_data.keys())[0] else category
-
-                        # Add to available blocks
-                        if use_category not in self.available_blocks:
-                            self.available_blocks[use_category] = []
-
-                        # Check for duplicates
-                        existing_block_texts = [b["text"] for b in self.available_blocks[use_category]]
-                        for block in blocks:
-                            if block.get("text") not in existing_block_texts:
-                                self.available_blocks[use_category].append(block)
-                                added_count += 1
-            elif isinstance(package_data, list):
-                # If it's a list, use the provided category name
-                if category_name not in self.available_blocks:
-                    self.available_blocks[category_name] = []
-
-                # Check for duplicates
-                existing_block_texts = [b["text"] for b in self.available_blocks[category_name]]
-                for block in package_data:
-                    if block.get("text") not in existing_block_texts:
-                        self.available_blocks[category_name].append(block)
-                        added_count += 1
-
-            return added_count, category_name
+                category_name = package_name(file_path)
+
+            return self.merge_package(package_data, category_name, file_path), category_name
 
         except json.JSONDecodeError as e:
             raise Exception(f"Invalid JSON format: {str(e)}")
@@ -162,48 +567,65 @@ class BlockLoader:
             raise Exception(f"Error loading package: {str(e)}")
 
     def load_all_packages(self, packages_dir="packages"):
-        """Load all package files from a directory (for backward compatibility)"""
+        """Load (or, in lazy mode, register) all package files from a directory"""
         total_added = 0
         if os.path.exists(packages_dir):
-            for package_file in glob.glob(os.path.join(packages_dir, "*.json")):
+            package_files = find_package_files(packages_dir)
+            signatures, errors = self.prefetch_packages(package_files)
+            # Merge in file order so the catalog does not depend on read timing
+            for package_file in package_files:
                 try:
-                    added, _ = self.load_package_file(package_file)
-                    total_added += added
-                    print(f"Loaded package: {os.path.basename(package_file)}")
+                    if package_file in errors:
+                        raise errors[package_file]
+                    if self.lazy:
+                        self.register_package(package_file, signature=signatures[package_file])
+                    else:
+                        report, _ = self.load_package_file(package_file, reload=False)
+                        total_added += len(report.added)
                 except Exception as e:
                     print(f"Error loading package {package_file}: {e}")
         return total_added
 
+    def read_custom_package_paths(self):
+        """Read the custom package paths saved in custom_blocks_file - 改进2: 只保存包路径"""
+        if not os.path.exists(self.custom_blocks_file):
+            return []
+        try:
+            with open(self.custom_blocks_file, 'r') as f:
+                saved_data = json.load(f)
+            
+            # 检查是新格式(只包含路径)还是旧格式(包含完整块数据)
+            if isinstance(saved_data, dict) and "package_paths" in saved_data:
+                # 新格式: 只包含包路径
+                return saved_data.get("package_paths", [])
+            
+            # 旧格式: 包含完整块数据，转换为新格式
+            print("Converting old custom blocks format to new format...")
+            # 这里可以添加转换逻辑，但为了简单起见，我们只清空旧数据
+            return []
+        except Exception as e:
+            print(f"Error loading custom blocks: {e}")
+            return []
+
     def load_custom_blocks(self):
         """Load custom blocks from file - 改进2: 只保存包路径"""
-        if os.path.exists(self.custom_blocks_file):
+        self.custom_package_paths = self.read_custom_package_paths()
+        
+        # 加载每个包 (read concurrently, merged in the saved order)
+        signatures, errors = self.prefetch_packages(self.custom_package_paths)
+        for package_path in self.custom_package_paths:
+            if isinstance(errors.get(package_path), FileNotFoundError):
+                print(f"Custom package not found: {package_path}")
+                continue
             try:
-                with open(self.custom_blocks_file, 'r') as f:
-                    saved_data = json.load(f)
-                
-                # 检查是新格式(只包含路径)还是旧格式(包含完整块数据)
-                if isinstance(saved_data, dict) and "package_paths" in saved_data:
-                    # 新格式: 只包含包路径
-                    self.custom_package_paths = saved_data.get("package_paths", [])
-                    
-                    # 加载每个包
-                    for package_path in self.custom_package_paths:
-                        if os.path.exists(package_path):
-                            try:
-                                self.load_package_file(package_path)
-                            except Exception as e:
-                                print(f"Error loading custom package {package_path}: {e}")
-                        else:
-                            print(f"Custom package not found: {package_path}")
+                if package_path in errors:
+                    raise errors[package_path]
+                if self.lazy:
+                    self.register_package(package_path, signature=signatures[package_path])
                 else:
-                    # 旧格式: 包含完整块数据，转换为新格式
-                    print("Converting old custom blocks format to new format...")
-                    # 这里可以添加转换逻辑，但为了简单起见，我们只清空旧数据
-                    self.custom_package_paths = []
-                    
+                    self.load_package_file(package_path, reload=False)
             except Exception as e:
-                print(f"Error loading custom blocks: {e}")
-                self.custom_package_paths = []
+                print(f"Error loading custom package {package_path}: {e}")
 
     def save_custom_blocks(self):
         """Save custom blocks to file - 改进2: 只保存包路径"""
@@ -220,21 +642,23 @@ class BlockLoader:
             print(f"Error saving custom blocks: {e}")
 
     def add_custom_package(self, file_path, category_name=None):
-        """添加自定义包并保存路径"""
+        """添加自定义包并保存路径; returns (MergeReport, category name)"""
+        self.discard_catalog_signature()
         # 检查路径是否已存在
-        if file_path in self.custom_package_paths:
+        registered = file_path in self.custom_package_paths
+        if registered:
             # 包已存在，重新加载
             print(f"Package already exists: {file_path}, reloading...")
             # 可以先移除旧的，然后重新加载
             self.custom_package_paths.remove(file_path)
         
         # 加载包
-        added_count, actual_category = self.load_package_file(file_path, category_name)
+        report, actual_category = self.load_package_file(file_path, category_name)
         
-        if added_count > 0:
-            # 添加路径到列表
+        if report.added or registered:
+            # 添加路径到列表 (a reloaded package stays registered even if nothing was new)
             self.custom_package_paths.append(file_path)
             # 保存更新后的路径列表
             self.save_custom_blocks()
         
-        return added_count, actual_category
+        return report, actual_category
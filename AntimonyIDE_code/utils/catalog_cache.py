@@ -0,0 +1,70 @@
+import os
+import pickle
+import tempfile
+
+
+class CatalogCache:
+    """Compiled block catalog stored as a single pickle file.
+
+    The file holds the fully merged catalog plus the per-block descriptors
+    and the categories each package file fills. It is only used when its
+    signature - the default blocks digest and the path, mtime and size of
+    every package file in load order - matches the current one. Category
+    names are not part of it: at startup they all follow from the file names.
+    """
+
+    VERSION = 5
+
+    def __init__(self, cache_file=os.path.join("cache", "block_catalog.pickle")):
+        self.cache_file = cache_file
+
+    @staticmethod
+    def make_signature(defaults_digest, file_paths):
+        """Build a signature from package file paths in load order.
+
+        Returns None if a package file cannot be read, so the cache is skipped.
+        """
+        entries = [defaults_digest]
+        try:
+            for file_path in file_paths:
+                stat = os.stat(file_path)
+                entries.append((os.path.abspath(file_path), stat.st_mtime, stat.st_size))
+        except OSError:
+            return None
+        return tuple(entries)
+
+    def load(self, signature):
+        """Return the cached catalog dict for a signature, or None when stale"""
+        if signature is None:
+            return None
+        try:
+            with open(self.cache_file, 'rb') as f:
+                data = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"Ignoring unreadable block catalog cache: {e}")
+            return None
+        if data.get("version") != self.VERSION or data.get("signature") != signature:
+            return None
+        return data
+
+    def save(self, signature, categories, descriptors, sources):
+        """Write the compiled catalog atomically"""
+        if signature is None:
+            return
+        try:
+            directory = os.path.dirname(self.cache_file) or "."
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp_file = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump({
+                    "version": self.VERSION,
+                    "signature": signature,
+                    "categories": categories,
+                    "descriptors": descriptors,
+                    "sources": sources,
+                }, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_file, self.cache_file)
+        except Exception as e:
+            print(f"Error saving block catalog cache: {e}")
@@ -1,25 +1,81 @@
 import json
 import os
+import stat
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from tkinter import filedialog, messagebox
 from core.code_block import CodeBlock
 
+
+def read_umask():
+    """Return the process umask; setting it is the only portable way to read it"""
+    umask = os.umask(0o22)
+    os.umask(umask)
+    return umask
+
+
+# Read once at import, on the main thread: saves run on a worker, and the
+# umask is process-wide, so reading it there could race with other threads
+UMASK = read_umask()
+
+
+def write_project_file(filename, save_data):
+    """Write project JSON atomically: temp file beside the target, fsync, then rename.
+
+    A crash mid-write leaves the previous file intact.
+    """
+    directory = os.path.dirname(os.path.abspath(filename))
+    try:
+        mode = stat.S_IMODE(os.stat(filename).st_mode)
+    except FileNotFoundError:
+        mode = 0o666 & ~UMASK  # What open() would have created
+    fd, tmp_file = tempfile.mkstemp(dir=directory, prefix=".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump(save_data, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp_file, mode)
+        os.replace(tmp_file, filename)
+    except BaseException:
+        try:
+            os.unlink(tmp_file)
+        except OSError:
+            pass
+        raise
+    if hasattr(os, "O_DIRECTORY"):
+        # Make the rename itself durable
+        dir_fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+
 class FileHandler:
     def __init__(self, app):
         self.app = app
+        # One writer thread, so saves land in the order they were made
+        self.save_executor = ThreadPoolExecutor(max_workers=1)
     
     def save_project(self):
-        """Save the project to a file"""
+        """Save the project to a file.
+
+        The model is snapshotted here on the Tk thread; serializing and
+        writing happen on the save thread, which reports back via root.after.
+        """
         project_dir = "projects"
         if not os.path.exists(project_dir):
             os.makedirs(project_dir)
         
+        # to_dict copies the block's lists, so later edits don't reach the snapshot
         save_data = {
             "project_name": self.app.project_name,
             "blocks": {bid: block.to_dict() for bid, block in self.app.blocks.items()},
             "block_counter": self.app.block_counter,
-            "sequence_lines": self.app.sequence_lines,
-            "end_lines": self.app.end_lines,
-            "continue_lines": self.app.continue_lines
+            "sequence_lines": list(self.app.sequence_lines),
+            "end_lines": list(self.app.end_lines),
+            "continue_lines": list(self.app.continue_lines)
         }
         
         filename = filedialog.asksaveasfilename(
@@ -30,12 +86,15 @@ class FileHandler:
         )
         
         if filename:
-            try:
-                with open(filename, 'w') as f:
-                    json.dump(save_data, f, indent=2)
-                messagebox.showinfo("Save Successful", f"Project saved to {filename}")
-            except Exception as e:
-                messagebox.showerror("Save Error", f"Could not save project: {e}")
+            self.save_executor.submit(self.write_project, filename, save_data)
+    
+    def write_project(self, filename, save_data):
+        """Write a project snapshot (runs on the save thread)"""
+        try:
+            write_project_file(filename, save_data)
+            self.app.root.after(0, messagebox.showinfo, "Save Successful", f"Project saved to {filename}")
+        except Exception as e:
+            self.app.root.after(0, messagebox.showerror, "Save Error", f"Could not save project: {e}")
     
     def import_project(self):
         """Import a saved project"""
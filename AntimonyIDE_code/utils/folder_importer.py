@@ -0,0 +1,76 @@
+import os
+import queue
+import threading
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from core.parser import PythonFileParser
+
+# Directories that never contain project sources worth importing
+SKIPPED_DIRS = {"__pycache__", "venv", "env", "node_modules", "build", "dist"}
+
+
+def find_python_files(folder):
+    """Return every .py file under folder, sorted, skipping hidden and tool directories"""
+    paths = []
+    for dirpath, dirnames, filenames in os.walk(folder):
+        dirnames[:] = sorted(d for d in dirnames
+                             if not d.startswith(".") and d not in SKIPPED_DIRS)
+        for filename in sorted(filenames):
+            if filename.endswith(".py"):
+                paths.append(os.path.join(dirpath, filename))
+    return paths
+
+
+def parse_module(path, cache=None):
+    """Parse one module in a worker process; the source itself is not sent back"""
+    result = PythonFileParser.parse_gui_python_file(path, cache=cache)
+    result.pop('raw_content', None)
+    return result
+
+
+class FolderImporter:
+    """Parse every Python file in a folder on a process pool.
+
+    Parsed modules are pushed onto ``results`` as ``(path, result)`` tuples
+    in completion order, followed by ``(None, None)`` once all work is done
+    or cancelled, so the Tk thread can drain the queue from ``after`` calls.
+    """
+
+    def __init__(self, folder, cache=None, max_workers=None):
+        self.folder = folder
+        self.cache = cache
+        self.max_workers = max_workers  # None uses every core
+        self.paths = find_python_files(folder)
+        self.results = queue.Queue()
+        self._cancelled = threading.Event()
+
+    def start(self):
+        """Start parsing in the background"""
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def cancel(self):
+        """Stop handing out files; modules already being parsed are dropped"""
+        self._cancelled.set()
+
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    def _run(self):
+        try:
+            with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+                futures = {executor.submit(parse_module, path, self.cache): path
+                           for path in self.paths}
+                for future in as_completed(futures):
+                    if self.cancelled:
+                        executor.shutdown(wait=False, cancel_futures=True)
+                        break
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        result = {'error': str(e)}
+                    self.results.put((futures[future], result))
+        except Exception as e:
+            self.results.put((self.folder, {'error': str(e)}))
+        finally:
+            self.results.put((None, None))
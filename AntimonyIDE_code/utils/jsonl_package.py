@@ -0,0 +1,51 @@
+import json
+
+
+class JsonlPackage:
+    """Block package stored as JSON Lines: a header object, then one block per line.
+
+    The header looks like ``{"format": "antimony-blocks", "version": 1,
+    "category": "Name"}``. Opening a package only decodes the header and
+    counts the block lines, so the manifest can summarize it cheaply;
+    iterating streams the file and decodes one block per line.
+    """
+
+    FORMAT = "antimony-blocks"
+    VERSION = 1
+
+    def __init__(self, file_path):
+        self.file_path = file_path
+        with open(file_path, 'rb') as f:
+            self.header = self._read_header(f)
+            self.count = sum(1 for line in f if line.strip())
+
+    @property
+    def category(self):
+        return self.header.get("category")
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        with open(self.file_path, 'rb') as f:
+            self._read_header(f)
+            for line_number, line in enumerate(f, start=2):
+                if line.strip():
+                    yield self._decode(line, line_number)
+
+    def _read_header(self, f):
+        try:
+            header = json.loads(f.readline())
+        except ValueError as e:
+            raise ValueError(f"Invalid package header: {e}")
+        if not isinstance(header, dict) or header.get("format") != self.FORMAT:
+            raise ValueError(f"Not a JSON Lines block package (expected format '{self.FORMAT}')")
+        if header.get("version", self.VERSION) > self.VERSION:
+            raise ValueError(f"Unsupported package version: {header['version']}")
+        return header
+
+    def _decode(self, line, line_number):
+        try:
+            return json.loads(line)
+        except ValueError as e:
+            raise ValueError(f"Invalid block on line {line_number} of {self.file_path}: {e}")
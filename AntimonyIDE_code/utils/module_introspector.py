@@ -0,0 +1,219 @@
+import importlib
+import importlib.metadata
+import importlib.util
+import inspect
+import json
+import multiprocessing
+import os
+import platform
+import sys
+import tempfile
+
+# Seconds allowed for importing and introspecting a module
+INTROSPECT_TIMEOUT = 60
+
+# Only constants of these types become variable blocks
+CONSTANT_TYPES = (bool, int, float, str)
+
+
+def first_line(doc):
+    """Return the first non-empty line of a docstring"""
+    for line in (doc or "").splitlines():
+        if line.strip():
+            return line.strip()
+    return ""
+
+
+def call_template(qualname, obj):
+    """Build a call template with a placeholder per required parameter"""
+    try:
+        signature = inspect.signature(obj)
+    except (TypeError, ValueError):
+        return f"{qualname}({{args}})"
+    params = []
+    for param in signature.parameters.values():
+        if param.default is not param.empty:
+            continue
+        if param.kind in (param.POSITIONAL_ONLY, param.POSITIONAL_OR_KEYWORD):
+            params.append(f"{{{param.name}}}")
+        elif param.kind == param.KEYWORD_ONLY:
+            params.append(f"{param.name}={{{param.name}}}")
+    return f"{qualname}({', '.join(params)})"
+
+
+def describe_module(module_name):
+    """Import a module and describe its public names in the package JSON schema.
+
+    This imports arbitrary code, so it is meant to run in a child process.
+    """
+    module = importlib.import_module(module_name)
+    public = getattr(module, "__all__", None)
+    exported = public is not None
+    if not exported:
+        public = [name for name in dir(module) if not name.startswith("_")]
+
+    blocks = [{
+        "type": "import",
+        "text": f"Import {module_name}",
+        "content": f"import {module_name}",
+        "template": f"import {module_name}",
+        "description": first_line(module.__doc__) or f"Import the {module_name} module",
+    }]
+    for name in sorted(set(public)):
+        obj = getattr(module, name, None)
+        qualname = f"{module_name}.{name}"
+        if inspect.ismodule(obj):
+            continue
+        if callable(obj):
+            # Without __all__, skip names that are merely imported from another package
+            owner = getattr(obj, "__module__", None) or module_name
+            if not exported and owner.split(".")[0] != module_name.split(".")[0] \
+                    and not owner.startswith("_") and owner not in sys.builtin_module_names:
+                continue
+            template = call_template(qualname, obj)
+            kind = "Create" if inspect.isclass(obj) else "Call"
+            blocks.append({
+                "type": "function",
+                "text": qualname,
+                "content": template,
+                "template": template,
+                "description": first_line(inspect.getdoc(obj)) or f"{kind} {qualname}",
+            })
+        elif isinstance(obj, CONSTANT_TYPES):
+            blocks.append({
+                "type": "variable",
+                "text": qualname,
+                "content": qualname,
+                "template": qualname,
+                "description": f"Constant {qualname} = {obj!r}"[:120],
+            })
+    return {module_name: blocks}
+
+
+def module_version(module_name):
+    """Return a version string for a module without importing it, or None if it is not installed"""
+    top_level = module_name.split(".")[0]
+    if top_level in sys.stdlib_module_names:
+        return f"python-{platform.python_version()}"
+    distributions = importlib.metadata.packages_distributions().get(top_level)
+    if distributions:
+        try:
+            return f"{distributions[0]}-{importlib.metadata.version(distributions[0])}"
+        except importlib.metadata.PackageNotFoundError:
+            pass
+    # Modules outside any distribution are versioned by their file's mtime
+    try:
+        spec = importlib.util.find_spec(top_level)
+    except (ImportError, ValueError):
+        spec = None
+    if spec is None:
+        return None
+    if spec.origin and os.path.exists(spec.origin):
+        return f"mtime-{os.path.getmtime(spec.origin)}"
+    return "unversioned"
+
+
+def introspect_in_child(module_name, connection):
+    """Child process entry point: describe a module and send back (package, error)"""
+    # Resolve modules as a plain interpreter would, not from the IDE's directory
+    ide_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    sys.path[:] = [path for path in sys.path if os.path.abspath(path or ".") != ide_dir]
+    # Anything the module prints while importing goes to stderr
+    sys.stdout = sys.stderr
+    try:
+        connection.send((describe_module(module_name), None))
+    except BaseException as e:
+        connection.send((None, f"{type(e).__name__}: {e}"))
+    finally:
+        connection.close()
+
+
+class ModuleIntrospector:
+    """Generate block packages from installed modules.
+
+    The module is imported in a spawned child process (which also works
+    in the frozen build, through main.py's freeze_support) so a crashing or
+    slow import cannot take the IDE down with it. Each result is written to
+    ``cache_dir/<module>.json`` as a regular package file, with a trailing
+    ``_source`` entry recording the module version it was generated from,
+    so it can be registered like any custom package and reused until the
+    module is upgraded.
+    """
+
+    VERSION = 1
+
+    def __init__(self, cache_dir=os.path.join("cache", "modules")):
+        self.cache_dir = cache_dir
+
+    def package_path(self, module_name):
+        return os.path.abspath(os.path.join(self.cache_dir, f"{module_name}.json"))
+
+    def _source(self, module_name, version):
+        return {"module": module_name, "version": version, "generator": self.VERSION}
+
+    def cached_package(self, module_name, version=None):
+        """Return the cached package path if it matches the installed module version"""
+        if version is None:
+            version = module_version(module_name)
+        path = self.package_path(module_name)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                source = json.load(f).get("_source")
+        except (OSError, ValueError, AttributeError):
+            return None
+        if version is None or source != self._source(module_name, version):
+            return None
+        return path
+
+    def generate(self, module_name):
+        """Return the path of a package for module_name, introspecting it on a cache miss.
+
+        Looking up the module version scans the installed distributions, so
+        call this off the Tk thread.
+        """
+        version = module_version(module_name)
+        if version is None:
+            raise Exception(f"Module not found: {module_name}")
+        path = self.cached_package(module_name, version)
+        if path:
+            return path
+
+        package_data = self.introspect(module_name)
+        package_data["_source"] = self._source(module_name, version)
+
+        path = self.package_path(module_name)
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        # A temp file of its own, so two generations of a module don't share one
+        fd, tmp_file = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(package_data, f, indent=2)
+            os.replace(tmp_file, path)
+        except BaseException:
+            os.unlink(tmp_file)
+            raise
+        return path
+
+    def introspect(self, module_name):
+        """Describe a module in a spawned child process and return its package data"""
+        context = multiprocessing.get_context("spawn")
+        receiver, sender = context.Pipe(duplex=False)
+        process = context.Process(target=introspect_in_child, args=(module_name, sender), daemon=True)
+        process.start()
+        sender.close()
+        try:
+            if not receiver.poll(INTROSPECT_TIMEOUT):
+                raise Exception(f"Introspecting {module_name} timed out")
+            try:
+                package_data, error = receiver.recv()
+            except EOFError:
+                raise Exception(f"Could not introspect {module_name}: the import crashed")
+        finally:
+            receiver.close()
+            if process.is_alive():
+                process.terminate()
+            process.join()
+        if error is not None:
+            raise Exception(error)
+        return package_data
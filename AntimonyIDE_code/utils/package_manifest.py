@@ -0,0 +1,85 @@
+import json
+import os
+import tempfile
+
+from .jsonl_package import JsonlPackage
+
+
+class PackageManifest:
+    """Small on-disk summary of package files.
+
+    For every package path it remembers the file's mtime and size and the
+    categories it defines with their block counts, so the block catalog can
+    be listed at startup without parsing any package JSON.
+    """
+
+    VERSION = 1
+
+    def __init__(self, manifest_file=os.path.join("cache", "package_manifest.json")):
+        self.manifest_file = manifest_file
+        self.packages = {}
+        self.dirty = False
+        self.load()
+
+    def load(self):
+        """Read the manifest, ignoring it if it is missing or from another version"""
+        try:
+            with open(self.manifest_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get("version") == self.VERSION:
+                self.packages = data.get("packages", {})
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"Ignoring unreadable package manifest: {e}")
+
+    def save(self):
+        """Write the manifest if it changed"""
+        if not self.dirty:
+            return
+        try:
+            directory = os.path.dirname(self.manifest_file) or "."
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp_file = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump({"version": self.VERSION, "packages": self.packages}, f)
+            os.replace(tmp_file, self.manifest_file)
+            self.dirty = False
+        except Exception as e:
+            print(f"Error saving package manifest: {e}")
+
+    @staticmethod
+    def file_signature(file_path):
+        """Return (mtime, size) of a package file"""
+        stat = os.stat(file_path)
+        return stat.st_mtime, stat.st_size
+
+    def lookup(self, file_path, signature):
+        """Return the category list for a file if its entry is still current"""
+        entry = self.packages.get(os.path.abspath(file_path))
+        if entry and (entry["mtime"], entry["size"]) == tuple(signature):
+            return entry["categories"]
+        return None
+
+    def update(self, file_path, signature, categories):
+        """Record the categories of a freshly parsed file as [key, block count] pairs"""
+        self.packages[os.path.abspath(file_path)] = {
+            "mtime": signature[0],
+            "size": signature[1],
+            "categories": categories,
+        }
+        self.dirty = True
+
+    @staticmethod
+    def summarize(package_data):
+        """Return [key, block count] pairs for parsed package data.
+
+        Keys keep the file's order; the count is None for entries that are
+        not block lists, and a bare list of blocks is reported under key None.
+        """
+        if isinstance(package_data, dict):
+            return [[key, len(blocks) if isinstance(blocks, (list, JsonlPackage)) else None]
+                    for key, blocks in package_data.items()]
+        if isinstance(package_data, list):
+            return [[None, len(package_data)]]
+        return []
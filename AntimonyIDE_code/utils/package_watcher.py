@@ -0,0 +1,40 @@
+from .block_loader import find_package_files
+from .package_manifest import PackageManifest
+
+
+class PackageWatcher:
+    """Detect added, edited and deleted package files by polling their mtimes.
+
+    Watches every package file in ``packages_dir`` plus the loader's custom
+    package paths. Polling keeps it portable; ``poll`` is cheap enough to
+    run from a Tk ``after`` timer.
+    """
+
+    def __init__(self, block_loader, packages_dir="packages"):
+        self.block_loader = block_loader
+        self.packages_dir = packages_dir
+        self.signatures = self.scan()
+
+    def watched_paths(self):
+        paths = find_package_files(self.packages_dir)
+        paths.extend(path for path in self.block_loader.custom_package_paths if path not in paths)
+        return paths
+
+    def scan(self):
+        """Return {path: (mtime, size)} for every watched file that exists"""
+        signatures = {}
+        for path in self.watched_paths():
+            try:
+                signatures[path] = PackageManifest.file_signature(path)
+            except OSError:
+                pass
+        return signatures
+
+    def poll(self):
+        """Return the paths that were added, changed or deleted since the last poll"""
+        current = self.scan()
+        changed = [path for path, signature in current.items()
+                   if self.signatures.get(path) != signature]
+        changed.extend(path for path in self.signatures if path not in current)
+        self.signatures = current
+        return changed
@@ -0,0 +1,122 @@
+import hashlib
+import os
+import pickle
+import tempfile
+
+# Eviction trims the cache to this share of max_bytes, so the next writes
+# do not push it straight back over budget
+EVICT_TO = 0.8
+
+
+class ParseCache:
+    """On-disk cache of PythonFileParser results.
+
+    Entries are keyed on the SHA-256 of the file content plus the parser
+    version, so edited files and parser upgrades simply miss. The cache is
+    trimmed least-recently-used first once it grows past ``max_bytes``.
+
+    The cache size is scanned from disk on the first write and then kept as
+    a running total; the directory is only scanned again to evict. Folder
+    imports hand a copy of the cache to each worker process, and each copy
+    keeps its own total.
+    """
+
+    def __init__(self, cache_dir=os.path.join("cache", "parsed"), max_bytes=64 * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.total_bytes = None  # Size of the cached entries, None until scanned
+        self.entry_count = 0
+
+    @staticmethod
+    def make_key(data, parser_version):
+        """Build the cache key for raw file bytes"""
+        digest = hashlib.sha256(data)
+        digest.update(f"\0parser-{parser_version}".encode())
+        return digest.hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, key + ".pickle")
+
+    def get(self, key):
+        """Return the cached result for key, or None"""
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                result = pickle.load(f)
+            # Touch the entry so eviction sees it as recently used
+            os.utime(path)
+            return result
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"Discarding unreadable parse cache entry {path}: {e}")
+            self._remove(path)
+            self.total_bytes = None  # Rescan on the next write
+            return None
+
+    def put(self, key, result):
+        """Store a result and evict old entries if the cache is too large"""
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            if self.total_bytes is None:
+                self._scan()
+            path = self._path(key)
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+                size = f.tell()
+            try:
+                replaced = os.path.getsize(path)
+            except OSError:
+                replaced = None
+            os.replace(tmp_path, path)
+            if replaced is None:
+                self.entry_count += 1
+                self.total_bytes += size
+            else:
+                self.total_bytes += size - replaced
+            if self.total_bytes > self.max_bytes:
+                self.evict()
+        except Exception as e:
+            print(f"Could not write parse cache entry: {e}")
+
+    def _scan(self):
+        """Stat every entry; returns [(mtime, size, path)] and resets the running total"""
+        entries = []
+        with os.scandir(self.cache_dir) as it:
+            for entry in it:
+                if entry.name.endswith(".pickle"):
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+        self.total_bytes = sum(size for _, size, _ in entries)
+        self.entry_count = len(entries)
+        return entries
+
+    def evict(self):
+        """Remove least recently used entries until the cache is back under budget"""
+        entries = self._scan()
+        if self.total_bytes <= self.max_bytes:
+            return
+        entries.sort()
+        target = self.max_bytes * EVICT_TO
+        for _, size, path in entries:
+            if self.total_bytes <= target:
+                break
+            self._remove(path)
+            self.total_bytes -= size
+            self.entry_count -= 1
+
+    def clear(self):
+        """Remove every cached entry"""
+        if os.path.isdir(self.cache_dir):
+            for name in os.listdir(self.cache_dir):
+                self._remove(os.path.join(self.cache_dir, name))
+        self.total_bytes = None
+        self.entry_count = 0
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
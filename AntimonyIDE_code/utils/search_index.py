@@ -0,0 +1,214 @@
+import heapq
+import math
+import threading
+from collections import Counter
+
+SEARCH_FIELDS = ("text", "template", "content", "description", "type", "category")
+
+# Blocks whose postings are merged per lock acquisition, so adds on the Tk
+# thread never wait long for a search that is indexing a large batch
+POSTING_BATCH = 500
+
+# Score for a query found in each field; matches in the block name rank first
+FIELD_WEIGHTS = (8, 3, 2, 2, 1, 1)
+
+# Share of a query's trigrams a field must contain to count as a fuzzy match.
+# A short query has few trigrams and one typo breaks most of them, so it gets
+# the lower threshold; a longer one needs more, or a shared prefix such as
+# "func_ab" would match most generated blocks
+FUZZY_THRESHOLD = 0.6
+SHORT_QUERY_FUZZY_THRESHOLD = 0.4
+SHORT_QUERY_TRIGRAMS = 5
+
+
+def trigrams(value):
+    return {value[i:i + 3] for i in range(len(value) - 2)}
+
+
+def signature(value):
+    """Trigrams of a value padded with spaces, so word starts and ends count"""
+    return frozenset(trigrams(f" {value} "))
+
+
+def fuzzy_threshold(query_signature):
+    """Share of a query's trigrams a field must contain, by query length"""
+    if len(query_signature) <= SHORT_QUERY_TRIGRAMS:
+        return SHORT_QUERY_FUZZY_THRESHOLD
+    return FUZZY_THRESHOLD
+
+
+def is_subsequence(query, value):
+    """True if the characters of query appear in value in order, e.g. jsdump in json.dumps"""
+    characters = iter(value)
+    return all(character in characters for character in query)
+
+
+class BlockSearchIndex:
+    """Trigram index for case-insensitive, typo-tolerant search over block templates.
+
+    Blocks are registered cheaply with ``add``; their trigram signatures and
+    postings are only built on the first search after they were added, so
+    loading packages does not pay for indexing. Queries of three or more
+    characters intersect the postings of their trigrams and then confirm the
+    substring match; shorter queries scan the indexed (already lowercased)
+    fields. Substring matches rank first. They are followed by fuzzy
+    matches, blocks sharing enough of the query's trigrams (``sqrtt`` finds
+    ``math.sqrt``) or whose name contains the query as a subsequence
+    (``jsdump`` finds ``json.dumps``). With a ``limit`` only the best matches
+    are ranked, and fuzzy matching is skipped once enough blocks matched
+    exactly.
+
+    The index may be searched from a worker thread while the Tk thread
+    adds or removes blocks; a lock serializes the two. Postings are built
+    outside the lock, see ``_post_pending``.
+    """
+
+    def __init__(self):
+        self.documents = {}  # Item ID -> (category, lowercased fields)
+        self.postings = {}  # Trigram -> set of item IDs
+        self.signatures = {}  # Item ID -> trigram signature of each field
+        self._unposted = set()  # Item IDs added since the last search
+        self._lock = threading.Lock()
+
+    def add(self, item_id, descriptor):
+        """Index a block's BlockDescriptor, replacing an earlier version with the same item ID"""
+        fields = tuple(str(getattr(descriptor, key)).lower() for key in SEARCH_FIELDS)
+        with self._lock:
+            self._remove(item_id)
+            self.documents[item_id] = (descriptor.category, fields)
+            self._unposted.add(item_id)
+
+    def remove(self, item_id):
+        with self._lock:
+            self._remove(item_id)
+
+    def _remove(self, item_id):
+        document = self.documents.pop(item_id, None)
+        if document is None:
+            return
+        if item_id in self._unposted:
+            self._unposted.discard(item_id)
+            return
+        for gram in frozenset().union(*self.signatures.pop(item_id)):
+            postings = self.postings.get(gram)
+            if postings is not None:
+                postings.discard(item_id)
+                if not postings:
+                    del self.postings[gram]
+
+    def _post_pending(self):
+        """Build postings for blocks added since the last search.
+
+        Signatures are computed without holding the lock, and merged in
+        batches of POSTING_BATCH, so the Tk thread can keep adding blocks.
+        Blocks removed or replaced meanwhile are left for the next pass.
+        """
+        with self._lock:
+            pending = [(item_id, self.documents[item_id]) for item_id in self._unposted]
+        for start in range(0, len(pending), POSTING_BATCH):
+            batch = [(item_id, document, tuple(signature(field) for field in document[1]))
+                     for item_id, document in pending[start:start + POSTING_BATCH]]
+            with self._lock:
+                for item_id, document, signatures in batch:
+                    if item_id in self._unposted and self.documents.get(item_id) is document:
+                        self._post(item_id, signatures)
+
+    def _post(self, item_id, signatures):
+        self._unposted.discard(item_id)
+        self.signatures[item_id] = signatures
+        for gram in frozenset().union(*signatures):
+            self.postings.setdefault(gram, set()).add(item_id)
+
+    def score(self, item_id, query):
+        """Return the rank score of a block for a lowercased query, 0 if it does not match"""
+        fields = self.documents[item_id][1]
+        score = 0
+        for field, weight in zip(fields, FIELD_WEIGHTS):
+            if query in field:
+                score += weight
+        if score and fields[0].startswith(query):
+            score += 8 if fields[0] == query else 4
+        return score
+
+    def fuzzy_score(self, item_id, query, query_signature):
+        """Return the fuzzy rank score of a block, 0 if it is not similar enough.
+
+        Each field contributes its weight times the share of the query's
+        trigrams it contains, so near matches in the name outrank near
+        matches in the description.
+        """
+        score = 0
+        threshold = fuzzy_threshold(query_signature)
+        for grams, weight in zip(self.signatures[item_id], FIELD_WEIGHTS):
+            similarity = len(query_signature & grams) / len(query_signature)
+            if similarity >= threshold:
+                score += weight * similarity
+        if is_subsequence(query, self.documents[item_id][1][0]):
+            score += FIELD_WEIGHTS[0] / 2
+        return score
+
+    def search(self, query, category=None, cancelled=None, limit=None):
+        """Return the item IDs matching query, best matches first.
+
+        limit caps the number of results. cancelled is polled while scoring;
+        if it returns True the search stops and returns None.
+        """
+        self._post_pending()
+        with self._lock:
+            return self._search(query.lower(), category, cancelled, limit)
+
+    @staticmethod
+    def _ranked(scored, limit):
+        """Sort (-score, category, name, item ID) tuples, keeping the first limit"""
+        if limit is None:
+            return sorted(scored)
+        return heapq.nsmallest(limit, scored)
+
+    def _search(self, query, category, cancelled, limit):
+        # Blocks added while postings were being built
+        for item_id in list(self._unposted):
+            self._post(item_id, tuple(signature(field) for field in self.documents[item_id][1]))
+        if len(query) >= 3:
+            grams = sorted((self.postings.get(gram, ()) for gram in trigrams(query)), key=len)
+            candidates = set(grams[0]).intersection(*grams[1:]) if grams[0] else set()
+        else:
+            candidates = self.documents.keys()
+
+        results = []
+        for count, item_id in enumerate(candidates):
+            if cancelled is not None and count % 1000 == 0 and cancelled():
+                return None
+            block_category, fields = self.documents[item_id]
+            if category is not None and block_category != category:
+                continue
+            score = self.score(item_id, query)
+            if score:
+                results.append((-score, block_category, fields[0], item_id))
+        exact = {item_id for _, _, _, item_id in results}
+        results = self._ranked(results, limit)
+        if len(query) < 3 or (limit is not None and len(results) >= limit):
+            return [item_id for _, _, _, item_id in results]
+
+        # Fuzzy matches: blocks sharing enough trigrams with the query, or
+        # sharing any and holding the query as a subsequence of their name
+        query_signature = signature(query)
+        shared = Counter()
+        for gram in query_signature:
+            shared.update(self.postings.get(gram, ()))
+        needed = max(2, math.ceil(fuzzy_threshold(query_signature) * len(query_signature)))
+        fuzzy = []
+        for count, (item_id, hits) in enumerate(shared.items()):
+            if cancelled is not None and count % 1000 == 0 and cancelled():
+                return None
+            if item_id in exact:
+                continue
+            block_category, fields = self.documents[item_id]
+            if category is not None and block_category != category:
+                continue
+            if hits < needed and not is_subsequence(query, fields[0]):
+                continue
+            score = self.fuzzy_score(item_id, query, query_signature)
+            if score:
+                fuzzy.append((-score, block_category, fields[0], item_id))
+        fuzzy = self._ranked(fuzzy, None if limit is None else limit - len(results))
+        return [item_id for _, _, _, item_id in results + fuzzy]
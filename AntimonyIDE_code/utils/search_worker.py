@@ -0,0 +1,72 @@
+import queue
+import threading
+
+
+class SearchWorker:
+    """Run index searches on a background thread, keeping only the newest.
+
+    Every ``submit`` starts a new generation. A search still running for an
+    older generation stops early, and results that arrive for stale
+    generations are dropped by ``latest``, so the Tk thread only ever
+    applies the result of the last query typed.
+    """
+
+    def __init__(self, search_index):
+        self.search_index = search_index
+        self.generation = 0
+        self._finished = 0  # Newest generation whose results were handed out
+        self._requests = queue.Queue()
+        self._results = queue.Queue()
+        self._thread = None
+
+    @property
+    def busy(self):
+        """True while the newest submitted search has not been delivered"""
+        return self._finished != self.generation
+
+    def submit(self, query, category=None, limit=None):
+        """Start a search, superseding any earlier one; limit caps the results"""
+        self.generation += 1
+        self._requests.put((self.generation, query, category, limit))
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+
+    def cancel(self):
+        """Drop the running search, if any"""
+        self.generation += 1
+        self._finished = self.generation
+
+    def close(self):
+        """Stop the worker thread"""
+        self.cancel()
+        self._requests.put(None)
+
+    def latest(self):
+        """Return the newest search's (query, item IDs) once it is done, else None"""
+        latest = None
+        while True:
+            try:
+                generation, query, results = self._results.get_nowait()
+            except queue.Empty:
+                return latest
+            if generation == self.generation:
+                self._finished = generation
+                latest = (query, results)
+
+    def _run(self):
+        while True:
+            request = self._requests.get()
+            if request is None:
+                return
+            generation, query, category, limit = request
+            if generation != self.generation:
+                continue  # A newer query is already queued
+            try:
+                results = self.search_index.search(
+                    query, category, cancelled=lambda: generation != self.generation, limit=limit)
+            except Exception as e:
+                print(f"Error searching blocks: {e}")
+                results = []
+            if results is not None:
+                self._results.put((generation, query, results))